@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""Offline stand-in for the Revit API, so pyVolve's lib logic runs on plain Python.
+
+    from revitstub import install
+    install()                        # registers Autodesk.Revit.DB, System, ...
+    from revitstub.model import build_model
+    doc = build_model(10000)
+    from Snippets._hangers import collect_hangers, audit_hosts
+    audit_hosts(doc, collect_hangers(doc))
+
+install() also puts the extension's lib folder on sys.path, the way pyRevit
+does, so the Snippets modules import unchanged.
+"""
+#IMPORTS
+#==================================================
+import os
+import sys
+import types
+
+from revitstub import api, dotnet
+
+#VARIABLES
+#==================================================
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+LIB_PATH  = os.path.join(REPO_ROOT, "pyVolve Mechanical.extension", "lib")
+
+#FUNCTIONS
+#==================================================
+def _module(name, source=None, names=None):
+    module = sys.modules.get(name)
+    if module is None:
+        module = types.ModuleType(name)
+        sys.modules[name] = module
+    if source is not None:
+        for attr in names or [n for n in dir(source) if not n.startswith("_")]:
+            setattr(module, attr, getattr(source, attr))
+    return module
+
+
+def install(lib_path=LIB_PATH):
+    """Registers the stand-in modules in sys.modules and adds lib_path to sys.path."""
+    _module("Autodesk")
+    _module("Autodesk.Revit")
+    db = _module("Autodesk.Revit.DB", api)
+    _module("Autodesk.Revit.DB.Fabrication")
+    _module("Autodesk.Revit.Exceptions", api, ["InvalidOperationException", "ArgumentException"])
+    sys.modules["Autodesk.Revit.Exceptions"].OperationCanceledException = type(
+        "OperationCanceledException", (Exception,), {})
+    sys.modules["Autodesk"].Revit = sys.modules["Autodesk.Revit"]
+    sys.modules["Autodesk.Revit"].DB = db
+
+    system = _module("System", dotnet, ["Guid"])
+    _module("System.Collections")
+    _module("System.Collections.Generic", dotnet, ["List"])
+    system.Collections = sys.modules["System.Collections"]
+    system.Collections.Generic = sys.modules["System.Collections.Generic"]
+
+    if lib_path not in sys.path:
+        sys.path.insert(0, lib_path)
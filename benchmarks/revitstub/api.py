@@ -0,0 +1,1142 @@
+# -*- coding: utf-8 -*-
+"""Pure-Python stand-in for the part of Autodesk.Revit.DB the extension uses.
+
+Only the members pyVolve touches are modelled, with just enough behaviour for
+the tool logic to run and produce the same results it would in Revit:
+fabrication pipes move with their location curve or elevation parameters,
+hosted hangers follow their host on Regenerate(), attached rods re-measure
+to the structure above and model changes outside an open Transaction raise.
+Every call that costs real time in Revit is counted in CALLS.
+"""
+#IMPORTS
+#==================================================
+import math
+from collections import Counter
+
+#VARIABLES
+#==================================================
+# API call name -> count, read and reset by the benchmark runner
+CALLS = Counter()
+
+STRUCTURE_CELL = 50.0   # ft - plan grid the stand-in document buckets structure by
+
+#FUNCTIONS
+#==================================================
+def reset_calls():
+    CALLS.clear()
+
+
+def _require_transaction(doc):
+    if not doc.transaction_open:
+        raise InvalidOperationException("Attempt to modify the model outside of a transaction.")
+
+#CLASSES
+#==================================================
+class InvalidOperationException(Exception):
+    pass
+
+
+class ArgumentException(Exception):
+    pass
+
+
+# Geometry
+#--------------------------------------------------
+class XYZ(object):
+    __slots__ = ("X", "Y", "Z")
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.X = float(x)
+        self.Y = float(y)
+        self.Z = float(z)
+
+    def __add__(self, other):
+        return XYZ(self.X + other.X, self.Y + other.Y, self.Z + other.Z)
+
+    def __sub__(self, other):
+        return XYZ(self.X - other.X, self.Y - other.Y, self.Z - other.Z)
+
+    def __mul__(self, k):
+        return XYZ(self.X * k, self.Y * k, self.Z * k)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, k):
+        return XYZ(self.X / k, self.Y / k, self.Z / k)
+
+    __div__ = __truediv__
+
+    def __neg__(self):
+        return XYZ(-self.X, -self.Y, -self.Z)
+
+    def __repr__(self):
+        return "XYZ({0:.4f}, {1:.4f}, {2:.4f})".format(self.X, self.Y, self.Z)
+
+    def GetLength(self):
+        return math.sqrt(self.X * self.X + self.Y * self.Y + self.Z * self.Z)
+
+    def Normalize(self):
+        return self / self.GetLength()
+
+    def DotProduct(self, other):
+        return self.X * other.X + self.Y * other.Y + self.Z * other.Z
+
+    def CrossProduct(self, other):
+        return XYZ(self.Y * other.Z - self.Z * other.Y,
+                   self.Z * other.X - self.X * other.Z,
+                   self.X * other.Y - self.Y * other.X)
+
+    def DistanceTo(self, other):
+        return (self - other).GetLength()
+
+    def IsAlmostEqualTo(self, other, tolerance=1e-9):
+        return self.DistanceTo(other) <= tolerance
+
+XYZ.Zero   = XYZ(0, 0, 0)
+XYZ.BasisX = XYZ(1, 0, 0)
+XYZ.BasisY = XYZ(0, 1, 0)
+XYZ.BasisZ = XYZ(0, 0, 1)
+
+
+class Curve(object):
+    pass
+
+
+class Line(Curve):
+    __slots__ = ("_start", "_end")
+
+    def __init__(self, start, end):
+        self._start = start
+        self._end   = end
+
+    @staticmethod
+    def CreateBound(start, end):
+        return Line(start, end)
+
+    def GetEndPoint(self, index):
+        return self._start if index == 0 else self._end
+
+    @property
+    def Length(self):
+        return self._start.DistanceTo(self._end)
+
+    @property
+    def Direction(self):
+        return (self._end - self._start).Normalize()
+
+    def Evaluate(self, parameter, normalized):
+        if not normalized:
+            parameter = parameter / self.Length
+        return self._start + (self._end - self._start) * parameter
+
+
+class BoundingBoxXYZ(object):
+    __slots__ = ("Min", "Max")
+
+    def __init__(self, minimum=None, maximum=None):
+        self.Min = minimum
+        self.Max = maximum
+
+
+class Outline(object):
+    __slots__ = ("MinimumPoint", "MaximumPoint")
+
+    def __init__(self, minimum, maximum):
+        self.MinimumPoint = minimum
+        self.MaximumPoint = maximum
+
+
+class Transform(object):
+    def __init__(self, origin=None):
+        self.Origin = origin or XYZ.Zero
+
+    @staticmethod
+    def CreateTranslation(vector):
+        return Transform(vector)
+
+    def OfPoint(self, point):
+        return point + self.Origin
+
+Transform.Identity = Transform()
+
+
+class UV(object):
+    __slots__ = ("U", "V")
+
+    def __init__(self, u=0.0, v=0.0):
+        self.U = u
+        self.V = v
+
+
+class IntersectionResult(object):
+    def __init__(self, uv, point, distance):
+        self.UVPoint  = uv
+        self.XYZPoint = point
+        self.Distance = distance
+
+
+class PlanarFace(object):
+    """A horizontal face; with a footprint (min x, min y, max x, max y) it is bounded, else infinite."""
+
+    def __init__(self, origin, normal, footprint=None):
+        self.Origin     = origin
+        self.FaceNormal = normal
+        self.footprint  = footprint
+
+    def Project(self, point):
+        """Nearest point of the face (U, V = plan x, y)."""
+        x, y = point.X, point.Y
+        if self.footprint is not None:
+            x0, y0, x1, y1 = self.footprint
+            x, y = min(max(x, x0), x1), min(max(y, y0), y1)
+        on_face = XYZ(x, y, self.Origin.Z)
+        return IntersectionResult(UV(x, y), on_face, on_face.DistanceTo(point))
+
+    def IsInside(self, uv):
+        if self.footprint is None:
+            return True
+        x0, y0, x1, y1 = self.footprint
+        return x0 <= uv.U <= x1 and y0 <= uv.V <= y1
+
+
+# Ids, enums, categories
+#--------------------------------------------------
+class ElementId(object):
+    __slots__ = ("IntegerValue",)
+
+    def __init__(self, value):
+        self.IntegerValue = int(value.IntegerValue if isinstance(value, ElementId) else value)
+
+    @property
+    def Value(self):
+        return self.IntegerValue
+
+    def __eq__(self, other):
+        return isinstance(other, ElementId) and other.IntegerValue == self.IntegerValue
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self.IntegerValue)
+
+    def __repr__(self):
+        return "ElementId({0})".format(self.IntegerValue)
+
+ElementId.InvalidElementId = ElementId(-1)
+
+
+class BuiltInCategory(object):
+    OST_FabricationPipework = -2008208
+    OST_FabricationHangers  = -2008203
+    OST_FabricationDuctwork = -2008193
+    OST_StructuralFraming   = -2001320
+    OST_Floors              = -2000032
+    OST_Levels              = -2000240
+    OST_Views               = -2000279
+    OST_RvtLinks            = -2001352
+
+
+class BuiltInParameter(object):
+    FABRICATION_BOTTOM_OF_PART = -1140170
+    ALL_MODEL_INSTANCE_COMMENTS = -1010106
+
+
+class StorageType(object):
+    None_     = 0
+    Integer   = 1
+    Double    = 2
+    String    = 3
+    ElementId = 4
+
+
+class CheckoutStatus(object):
+    OwnedByCurrentUser = 0
+    OwnedByOtherUser   = 1
+    NotOwned           = 2
+
+
+class FindReferenceTarget(object):
+    Element = 0
+    Mesh    = 1
+    Edge    = 2
+    Curve   = 3
+    Face    = 4
+    All     = 5
+
+
+class FabricationAncillaryType(object):
+    SupportRod = 0
+    Fixing     = 1
+    Seam       = 2
+
+
+class Category(object):
+    def __init__(self, bic, name):
+        self.Id   = ElementId(bic)
+        self.Name = name
+
+
+_CATEGORY_NAMES = {
+    BuiltInCategory.OST_FabricationPipework: "MEP Fabrication Pipework",
+    BuiltInCategory.OST_FabricationHangers:  "MEP Fabrication Hangers",
+    BuiltInCategory.OST_StructuralFraming:   "Structural Framing",
+    BuiltInCategory.OST_Floors:              "Floors",
+    BuiltInCategory.OST_Levels:              "Levels",
+    BuiltInCategory.OST_Views:               "Views",
+}
+_CATEGORIES = dict((bic, Category(bic, name)) for bic, name in _CATEGORY_NAMES.items())
+
+
+# Parameters
+#--------------------------------------------------
+class Parameter(object):
+    """A parameter whose value is read from and written to its element through callables."""
+    __slots__ = ("_element", "_getter", "_setter", "StorageType")
+
+    def __init__(self, element, storage_type, getter, setter=None):
+        self._element = element
+        self._getter = getter
+        self._setter = setter
+        self.StorageType = storage_type
+
+    @property
+    def IsReadOnly(self):
+        return self._setter is None
+
+    @property
+    def HasValue(self):
+        return self._getter(self._element) is not None
+
+    def AsDouble(self):
+        return float(self._getter(self._element) or 0.0)
+
+    def AsString(self):
+        return self._getter(self._element)
+
+    def AsInteger(self):
+        return int(self._getter(self._element) or 0)
+
+    def AsValueString(self):
+        return str(self._getter(self._element))
+
+    def Set(self, value):
+        CALLS["Parameter.Set"] += 1
+        if self._setter is None:
+            raise InvalidOperationException("The parameter is read-only.")
+        _require_transaction(self._element.Document)
+        self._setter(self._element, value)
+        return True
+
+
+# Elements
+#--------------------------------------------------
+class Element(object):
+    __slots__ = ("Document", "Id", "_category", "LevelId", "Name", "comments", "__weakref__")
+    # name -> (storage type, getter, setter or None); subclasses extend it
+    PARAMETERS = {
+        "Comments": (StorageType.String, lambda e: e.comments, lambda e, v: setattr(e, "comments", v)),
+    }
+    BUILTIN_PARAMETERS = {
+        BuiltInParameter.ALL_MODEL_INSTANCE_COMMENTS: "Comments",
+    }
+
+    def __init__(self, category=None, name=""):
+        self.Document = None
+        self.Id = ElementId.InvalidElementId
+        self._category = category
+        self.LevelId = ElementId.InvalidElementId
+        self.Name = name
+        self.comments = None
+
+    @property
+    def Category(self):
+        return _CATEGORIES.get(self._category)
+
+    @property
+    def Location(self):
+        CALLS["Element.Location"] += 1
+        return self._location()
+
+    def _location(self):
+        return None
+
+    def get_BoundingBox(self, view):
+        CALLS["Element.get_BoundingBox"] += 1
+        return self._bounds()
+
+    def _bounds(self):
+        return None
+
+    def LookupParameter(self, name):
+        CALLS["Element.LookupParameter"] += 1
+        spec = self.PARAMETERS.get(name)
+        if spec is None:
+            return None
+        return Parameter(self, *spec)
+
+    def get_Parameter(self, builtin):
+        CALLS["Element.get_Parameter"] += 1
+        name = self.BUILTIN_PARAMETERS.get(builtin)
+        spec = self.PARAMETERS.get(name) if name else None
+        if spec is None:
+            return None
+        return Parameter(self, *spec)
+
+    def GetTypeId(self):
+        return ElementId.InvalidElementId
+
+    def GetGeometryObjectFromReference(self, reference):
+        return None
+
+
+class Level(Element):
+    __slots__ = ("Elevation",)
+
+    def __init__(self, name, elevation):
+        Element.__init__(self, BuiltInCategory.OST_Levels, name)
+        self.Elevation = elevation
+
+
+class View3D(Element):
+    __slots__ = ("IsTemplate",)
+
+    def __init__(self, name="{3D}"):
+        Element.__init__(self, BuiltInCategory.OST_Views, name)
+        self.IsTemplate = False
+
+
+class StructuralElement(Element):
+    """A floor slab or beam, described by its axis-aligned box."""
+    __slots__ = ("box_min", "box_max")
+
+    def __init__(self, category, name, box_min, box_max):
+        Element.__init__(self, category, name)
+        self.box_min = box_min
+        self.box_max = box_max
+
+    def _bounds(self):
+        return BoundingBoxXYZ(XYZ(*self.box_min), XYZ(*self.box_max))
+
+    def GetGeometryObjectFromReference(self, reference):
+        lo, hi = self.box_min, self.box_max
+        return PlanarFace(XYZ(lo[0], lo[1], lo[2]), XYZ(0, 0, -1), (lo[0], lo[1], hi[0], hi[1]))
+
+
+class RevitLinkInstance(Element):
+    __slots__ = ("_link_doc", "_transform")
+
+    def __init__(self, link_doc, transform=None):
+        Element.__init__(self, BuiltInCategory.OST_RvtLinks, "Link")
+        self._link_doc = link_doc
+        self._transform = transform or Transform.Identity
+
+    def GetLinkDocument(self):
+        return self._link_doc
+
+    def GetTotalTransform(self):
+        return self._transform
+
+
+class LocationCurve(object):
+    __slots__ = ("_part",)
+
+    def __init__(self, part):
+        self._part = part
+
+    @property
+    def Curve(self):
+        p = self._part
+        return Line(XYZ(p.x0, p.y0, p.z0), XYZ(p.x1, p.y1, p.z1))
+
+    def Move(self, translation):
+        CALLS["Location.Move"] += 1
+        _require_transaction(self._part.Document)
+        self._part.translate(translation.X, translation.Y, translation.Z)
+        return True
+
+
+class LocationPoint(object):
+    __slots__ = ("_part",)
+
+    def __init__(self, part):
+        self._part = part
+
+    @property
+    def Point(self):
+        p = self._part
+        return XYZ(p.x0, p.y0, p.z0)
+
+    def Move(self, translation):
+        CALLS["Location.Move"] += 1
+        _require_transaction(self._part.Document)
+        self._part.translate(translation.X, translation.Y, translation.Z)
+        return True
+
+
+class FabricationHostedInfo(object):
+    __slots__ = ("HostId",)
+
+    def __init__(self, host_id):
+        self.HostId = host_id
+
+
+class FabricationPartAncillaryUsage(object):
+    __slots__ = ("Type", "AncillaryWidthOrDiameter")
+
+    def __init__(self, ancillary_type, width):
+        self.Type = ancillary_type
+        self.AncillaryWidthOrDiameter = width
+
+
+class Connector(object):
+    __slots__ = ("Origin",)
+
+    def __init__(self, origin):
+        self.Origin = origin
+
+
+class ConnectorManager(object):
+    def __init__(self, connectors):
+        self.Connectors = connectors
+
+
+def _elevation_parameter(offset):
+    """Elevation parameter at part centre + offset(part); setting it moves the part vertically."""
+    def getter(part):
+        return (part.z0 + part.z1) / 2.0 + offset(part)
+
+    def setter(part, value):
+        part.translate(0.0, 0.0, value - getter(part))
+    return getter, setter
+
+
+class FabricationPart(Element):
+    """Fabrication pipe or hanger. Straight pipes are stored as two end points,
+    hangers as one point with their rods."""
+    __slots__ = ("x0", "y0", "z0", "x1", "y1", "z1", "Size", "Material", "ServiceId",
+                 "ServiceName", "outside_diameter", "_insulation_spec", "host_id",
+                 "rods", "ProductName", "Alias", "rod_diameter")
+
+    PARAMETERS = dict(Element.PARAMETERS)
+    BUILTIN_PARAMETERS = dict(Element.BUILTIN_PARAMETERS)
+
+    def __init__(self, category, size, material, service_id, service_name, outside_diameter,
+                 start, end=None):
+        Element.__init__(self, category, size)
+        self.x0, self.y0, self.z0 = start
+        self.x1, self.y1, self.z1 = end if end is not None else start
+        self.Size = size
+        self.Material = material
+        self.ServiceId = service_id
+        self.ServiceName = service_name
+        self.outside_diameter = outside_diameter
+        self._insulation_spec = 0
+        self.host_id = None
+        self.rods = None
+        self.ProductName = ""
+        self.Alias = ""
+        self.rod_diameter = None
+
+    # Geometry -------------------------------------------------------------
+    def _location(self):
+        if self.rods is not None or self.x0 == self.x1 and self.y0 == self.y1 and self.z0 == self.z1:
+            return LocationPoint(self)
+        return LocationCurve(self)
+
+    def _bounds(self):
+        r = self.outside_diameter / 2.0 + self.InsulationThickness
+        return BoundingBoxXYZ(XYZ(min(self.x0, self.x1) - r, min(self.y0, self.y1) - r, min(self.z0, self.z1) - r),
+                              XYZ(max(self.x0, self.x1) + r, max(self.y0, self.y1) + r, max(self.z0, self.z1) + r))
+
+    def translate(self, dx, dy, dz):
+        self.x0 += dx
+        self.y0 += dy
+        self.z0 += dz
+        self.x1 += dx
+        self.y1 += dy
+        self.z1 += dz
+        if self.Document is not None:
+            self.Document.moved(self, dx, dy, dz)
+
+    # Insulation -----------------------------------------------------------
+    @property
+    def InsulationSpecification(self):
+        return self._insulation_spec
+
+    @InsulationSpecification.setter
+    def InsulationSpecification(self, value):
+        CALLS["FabricationPart.InsulationSpecification.set"] += 1
+        _require_transaction(self.Document)
+        self._insulation_spec = int(value)
+
+    @property
+    def InsulationThickness(self):
+        if not self._insulation_spec or self.Document is None:
+            return 0.0
+        return self.Document.fabrication.insulation_thickness(self._insulation_spec, self.outside_diameter)
+
+    @property
+    def HasInsulation(self):
+        return self.InsulationThickness > 0.0
+
+    # Hangers --------------------------------------------------------------
+    def IsAHanger(self):
+        return self.rods is not None
+
+    def GetHostedInfo(self):
+        CALLS["FabricationPart.GetHostedInfo"] += 1
+        if self.host_id is None:
+            return None
+        return FabricationHostedInfo(self.host_id)
+
+    def GetRodInfo(self):
+        CALLS["FabricationPart.GetRodInfo"] += 1
+        if self.rods is None:
+            return None
+        return FabricationRodInfo(self)
+
+    def GetPartAncillaryUsage(self):
+        if self.rod_diameter is None:
+            return []
+        return [FabricationPartAncillaryUsage(FabricationAncillaryType.SupportRod, self.rod_diameter)]
+
+    @property
+    def ConnectorManager(self):
+        return ConnectorManager([Connector(XYZ(self.x0, self.y0, self.z0)),
+                                 Connector(XYZ(self.x1, self.y1, self.z1))])
+
+    @staticmethod
+    def CreateHanger(doc, button, host_id, connector, distance, attach_to_structure):
+        CALLS["FabricationPart.CreateHanger"] += 1
+        _require_transaction(doc)
+        host = doc.get(host_id.IntegerValue)
+        if host is None:
+            raise ArgumentException("The host is not a valid fabrication part.")
+        start = XYZ(host.x0, host.y0, host.z0)
+        end = XYZ(host.x1, host.y1, host.z1)
+        if connector.Origin.DistanceTo(start) > connector.Origin.DistanceTo(end):
+            start, end = end, start
+        point = start + (end - start).Normalize() * distance
+        hanger = doc.add_hanger(host, (point.X, point.Y, point.Z), button.Name, attach_to_structure)
+        return hanger
+
+
+# Computed fabrication parameters, all in feet
+_HALF = lambda part: part.outside_diameter / 2.0
+FabricationPart.PARAMETERS.update({
+    "Outside Diameter": (StorageType.Double, lambda p: p.outside_diameter, None),
+    "Fabrication Service Name": (StorageType.String, lambda p: p.ServiceName, None),
+    "Lower End Bottom of Insulation Elevation": (StorageType.Double,) + _elevation_parameter(lambda p: -_HALF(p) - p.InsulationThickness),
+    "Lower End Bottom Elevation": (StorageType.Double,) + _elevation_parameter(lambda p: -_HALF(p)),
+    "Middle Elevation": (StorageType.Double,) + _elevation_parameter(lambda p: 0.0),
+    "Upper End Top Elevation": (StorageType.Double,) + _elevation_parameter(_HALF),
+    "Upper End Top of Insulation Elevation": (StorageType.Double,) + _elevation_parameter(lambda p: _HALF(p) + p.InsulationThickness),
+    "FABRICATION_BOTTOM_OF_PART": (StorageType.Double,) + _elevation_parameter(lambda p: -_HALF(p)),
+})
+FabricationPart.BUILTIN_PARAMETERS[BuiltInParameter.FABRICATION_BOTTOM_OF_PART] = "FABRICATION_BOTTOM_OF_PART"
+
+
+class Rod(object):
+    """One hanger rod: bottom offset from the hanger point, length and attachment."""
+    __slots__ = ("dx", "dy", "dz", "length", "extension", "attached")
+
+    def __init__(self, dx, dy, dz, length, extension=0.0, attached=False):
+        self.dx, self.dy, self.dz = dx, dy, dz
+        self.length = length
+        self.extension = extension
+        self.attached = attached
+
+
+class FabricationRodInfo(object):
+    __slots__ = ("_hanger",)
+
+    def __init__(self, hanger):
+        self._hanger = hanger
+
+    def _bottom(self, rod):
+        h = self._hanger
+        return h.x0 + rod.dx, h.y0 + rod.dy, h.z0 + rod.dz
+
+    def _attached_length(self, rod):
+        x, y, z = self._bottom(rod)
+        underside = self._hanger.Document.underside_above(x, y, z)
+        if underside is None:
+            return rod.length
+        return max(underside - z + rod.extension, 0.0)
+
+    @property
+    def RodCount(self):
+        return len(self._hanger.rods)
+
+    @property
+    def IsAttachedToStructure(self):
+        return any(rod.attached for rod in self._hanger.rods)
+
+    @property
+    def CanRodsBeHosted(self):
+        h = self._hanger
+        return all(h.Document.underside_above(*self._bottom(rod)) is not None for rod in h.rods)
+
+    def AttachToStructure(self):
+        _require_transaction(self._hanger.Document)
+        if not self.CanRodsBeHosted:
+            raise InvalidOperationException("No structure found above the rods.")
+        for rod in self._hanger.rods:
+            rod.attached = True
+
+    def DetachRods(self):
+        _require_transaction(self._hanger.Document)
+        for rod in self._hanger.rods:
+            rod.length = self._attached_length(rod) if rod.attached else rod.length
+            rod.attached = False
+
+    def GetRodLength(self, index):
+        CALLS["FabricationRodInfo.GetRodLength"] += 1
+        rod = self._hanger.rods[index]
+        return self._attached_length(rod) if rod.attached else rod.length
+
+    def SetRodLength(self, index, length):
+        CALLS["FabricationRodInfo.SetRodLength"] += 1
+        _require_transaction(self._hanger.Document)
+        rod = self._hanger.rods[index]
+        if rod.attached:
+            raise InvalidOperationException("The rod is attached to structure.")
+        rod.length = length
+
+    def GetRodStructureExtension(self, index):
+        CALLS["FabricationRodInfo.GetRodStructureExtension"] += 1
+        return self._hanger.rods[index].extension
+
+    def SetRodStructureExtension(self, index, extension):
+        CALLS["FabricationRodInfo.SetRodStructureExtension"] += 1
+        _require_transaction(self._hanger.Document)
+        self._hanger.rods[index].extension = extension
+
+    def GetRodEndPosition(self, index):
+        CALLS["FabricationRodInfo.GetRodEndPosition"] += 1
+        rod = self._hanger.rods[index]
+        x, y, z = self._bottom(rod)
+        return XYZ(x, y, z + self.GetRodLength(index))
+
+
+# Fabrication configuration
+#--------------------------------------------------
+class FabricationServiceButton(object):
+    def __init__(self, name, is_hanger):
+        self.Name = name
+        self.IsAHanger = is_hanger
+
+
+class FabricationService(object):
+    def __init__(self, service_id, name, buttons):
+        self.ServiceId = service_id
+        self.Name = name
+        self.buttons = buttons
+
+    @property
+    def PaletteCount(self):
+        return 1
+
+    def GetButtonCount(self, palette):
+        return len(self.buttons)
+
+    def GetButton(self, palette, index):
+        return self.buttons[index]
+
+
+class FabricationConfiguration(object):
+    """Materials, services and insulation specifications of a stand-in document.
+
+    insulation: {spec id: (name, [(max outside diameter ft, thickness ft), ...])}
+    """
+
+    def __init__(self, materials, services, insulation):
+        self.materials = materials
+        self.services = services
+        self.insulation = insulation
+
+    @staticmethod
+    def GetFabricationConfiguration(doc):
+        return doc.fabrication
+
+    def GetMaterialName(self, material_id):
+        return self.materials.get(material_id, "")
+
+    def GetAllLoadedServices(self):
+        return list(self.services)
+
+    def GetInsulationSpecificationName(self, spec_id):
+        return self.insulation.get(spec_id, ("",))[0]
+
+    def insulation_thickness(self, spec_id, outside_diameter):
+        spec = self.insulation.get(spec_id)
+        if spec is None:
+            return 0.0
+        for max_od, thickness in spec[1]:
+            if outside_diameter <= max_od:
+                return thickness
+        return spec[1][-1][1]
+
+
+# Filters and collectors
+#--------------------------------------------------
+class ElementFilter(object):
+    def Passes(self, element):
+        return True
+
+
+class BoundingBoxIntersectsFilter(ElementFilter):
+    def __init__(self, outline, inverted=False):
+        lo, hi = outline.MinimumPoint, outline.MaximumPoint
+        self.bounds = (lo.X, lo.Y, lo.Z, hi.X, hi.Y, hi.Z)
+        self.inverted = inverted
+
+    def Passes(self, element):
+        box = element._bounds()
+        if box is None:
+            return self.inverted
+        x0, y0, z0, x1, y1, z1 = self.bounds
+        inside = (box.Min.X <= x1 and box.Max.X >= x0 and box.Min.Y <= y1 and box.Max.Y >= y0
+                  and box.Min.Z <= z1 and box.Max.Z >= z0)
+        return inside != self.inverted
+
+
+class LogicalOrFilter(ElementFilter):
+    """Like Revit's quick filters, an OR of bounding box filters first rejects
+    elements outside all of the boxes at once."""
+
+    def __init__(self, filters, other=None):
+        self.filters = list(filters) if other is None else [filters, other]
+        self.bounds = None
+        if self.filters and all(isinstance(f, BoundingBoxIntersectsFilter) and not f.inverted
+                                for f in self.filters):
+            boxes = [f.bounds for f in self.filters]
+            self.bounds = tuple([min(b[i] for b in boxes) for i in range(3)] +
+                                [max(b[i] for b in boxes) for i in range(3, 6)])
+
+    def Passes(self, element):
+        if self.bounds is not None:
+            box = element._bounds()
+            if box is None:
+                return False
+            x0, y0, z0, x1, y1, z1 = self.bounds
+            if not (box.Min.X <= x1 and box.Max.X >= x0 and box.Min.Y <= y1 and box.Max.Y >= y0
+                    and box.Min.Z <= z1 and box.Max.Z >= z0):
+                return False
+        return any(f.Passes(element) for f in self.filters)
+
+
+class LogicalAndFilter(ElementFilter):
+    def __init__(self, filters, other=None):
+        self.filters = list(filters) if other is None else [filters, other]
+
+    def Passes(self, element):
+        return all(f.Passes(element) for f in self.filters)
+
+
+class ElementMulticategoryFilter(ElementFilter):
+    def __init__(self, categories):
+        self.categories = set(int(c) for c in categories)
+
+    def Passes(self, element):
+        return element._category in self.categories
+
+
+class ElementCategoryFilter(ElementFilter):
+    def __init__(self, category):
+        self.category = int(category)
+
+    def Passes(self, element):
+        return element._category == self.category
+
+
+class ElementClassFilter(ElementFilter):
+    def __init__(self, cls):
+        self.cls = cls
+
+    def Passes(self, element):
+        return isinstance(element, self.cls)
+
+
+class FilteredElementCollector(object):
+    """Lazy collector over a stand-in Document; view scopes are treated as the whole model."""
+
+    def __init__(self, doc, view_id=None):
+        CALLS["FilteredElementCollector"] += 1
+        self._doc = doc
+        self._category = None
+        self._classes = None
+        self._filters = []
+
+    def OfCategory(self, category):
+        self._category = int(category)
+        return self
+
+    def OfClass(self, cls):
+        self._classes = cls
+        return self
+
+    def WhereElementIsNotElementType(self):
+        return self
+
+    def WhereElementIsElementType(self):
+        self._filters.append(ElementFilter())
+        return self
+
+    def WherePasses(self, element_filter):
+        self._filters.append(element_filter)
+        return self
+
+    def __iter__(self):
+        if self._category is not None:
+            source = self._doc.by_category.get(self._category, ())
+        else:
+            source = self._doc.elements.values()
+        for element in list(source):
+            if self._classes is not None and not isinstance(element, self._classes):
+                continue
+            if all(f.Passes(element) for f in self._filters):
+                yield element
+
+    def ToElements(self):
+        return list(self)
+
+    def ToElementIds(self):
+        return [e.Id for e in self]
+
+    def GetElementCount(self):
+        return sum(1 for _ in self)
+
+    def FirstElement(self):
+        for element in self:
+            return element
+        return None
+
+
+class ReferenceWithContext(object):
+    def __init__(self, reference, proximity):
+        self._reference = reference
+        self.Proximity = proximity
+
+    def GetReference(self):
+        return self._reference
+
+
+class Reference(object):
+    def __init__(self, element_id):
+        self.ElementId = element_id
+        self.LinkedElementId = ElementId.InvalidElementId
+
+
+class ReferenceIntersector(object):
+    """Vertical ray casts against the stand-in structure (only +Z rays are supported)."""
+
+    def __init__(self, element_filter, target, view3d):
+        self._doc = view3d.Document
+        self.FindReferencesInRevitLinks = False
+
+    def FindNearest(self, origin, direction):
+        CALLS["ReferenceIntersector.FindNearest"] += 1
+        hit = self._doc.structure_above(origin.X, origin.Y, origin.Z)
+        if hit is None:
+            return None
+        element, underside = hit
+        return ReferenceWithContext(Reference(element.Id), underside - origin.Z)
+
+
+# Transactions and worksharing
+#--------------------------------------------------
+class TransactionStatus(object):
+    Uninitialized = 0
+    Started       = 1
+    RolledBack    = 2
+    Committed     = 3
+
+
+class Transaction(object):
+    """Marks the document as open for changes. Changes are not undone on RollBack."""
+
+    def __init__(self, doc, name=""):
+        self._doc = doc
+        self.name = name
+        self._status = TransactionStatus.Uninitialized
+
+    def Start(self):
+        CALLS["Transaction.Start"] += 1
+        if self._doc.transaction_open:
+            raise InvalidOperationException("A transaction is already open.")
+        self._doc.transaction_open = True
+        self._status = TransactionStatus.Started
+        return self._status
+
+    def Commit(self):
+        CALLS["Transaction.Commit"] += 1
+        self._doc.Regenerate()
+        self._doc.transaction_open = False
+        self._status = TransactionStatus.Committed
+        return self._status
+
+    def RollBack(self):
+        self._doc.transaction_open = False
+        self._status = TransactionStatus.RolledBack
+        return self._status
+
+    def GetStatus(self):
+        return self._status
+
+    def HasStarted(self):
+        return self._status == TransactionStatus.Started
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._status == TransactionStatus.Started:
+            self.RollBack()
+        return False
+
+
+class TransactionGroup(object):
+    def __init__(self, doc, name=""):
+        self._doc = doc
+        self.name = name
+
+    def Start(self):
+        return TransactionStatus.Started
+
+    def Assimilate(self):
+        return TransactionStatus.Committed
+
+    def Commit(self):
+        return TransactionStatus.Committed
+
+    def RollBack(self):
+        return TransactionStatus.RolledBack
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class WorksharingUtils(object):
+    @staticmethod
+    def GetCheckoutStatus(doc, element_id):
+        return CheckoutStatus.OwnedByCurrentUser
+
+
+# Document
+#--------------------------------------------------
+class Document(object):
+    """Element store with per-category lists, a level-bucketed structure list
+    and the host -> hanger links Revit keeps for fabrication hangers."""
+
+    def __init__(self, title="Stand-in Model", fabrication=None, floor_height=14.0):
+        self.Title = title
+        self.PathName = ""
+        self.IsWorkshared = False
+        self.IsFamilyDocument = False
+        self.elements = {}
+        self.by_category = {}
+        self.fabrication = fabrication or FabricationConfiguration({}, [], {})
+        self.floor_height = floor_height
+        self.structure_cells = {}      # (floor, cell x, cell y) -> [StructuralElement]
+        self.hangers_by_host = {}      # host id (int) -> [hanger]
+        self.transaction_open = False
+        self._next_id = 1000
+        self._pending = {}             # host id -> accumulated (dx, dy, dz) for Regenerate
+
+    # Store ---------------------------------------------------------------
+    def add(self, element):
+        element.Document = self
+        element.Id = ElementId(self._next_id)
+        self._next_id += 1
+        self.elements[element.Id.IntegerValue] = element
+        self.by_category.setdefault(element._category, []).append(element)
+        if isinstance(element, StructuralElement):
+            floor = int(math.floor(element.box_min[2] / self.floor_height))
+            lo, hi = element.box_min, element.box_max
+            for cx in range(self._cell(lo[0]), self._cell(hi[0]) + 1):
+                for cy in range(self._cell(lo[1]), self._cell(hi[1]) + 1):
+                    self.structure_cells.setdefault((floor, cx, cy), []).append(element)
+        return element
+
+    @staticmethod
+    def _cell(value):
+        return int(math.floor(value / STRUCTURE_CELL))
+
+    def get(self, element_id):
+        return self.elements.get(element_id)
+
+    def GetElement(self, element_id):
+        CALLS["Document.GetElement"] += 1
+        if isinstance(element_id, ElementId):
+            element_id = element_id.IntegerValue
+        return self.elements.get(element_id)
+
+    def Delete(self, element_id):
+        _require_transaction(self)
+        element = self.elements.pop(element_id.IntegerValue, None)
+        if element is not None:
+            self.by_category[element._category].remove(element)
+        return [element_id] if element else []
+
+    def add_hanger(self, host, point, name, attached, rod_length=None):
+        hanger = FabricationPart(BuiltInCategory.OST_FabricationHangers, name, 0, host.ServiceId,
+                                 host.ServiceName, 0.0, point)
+        hanger.ProductName = name
+        hanger.LevelId = host.LevelId
+        hanger.rod_diameter = 3.0 / 96.0
+        self.add(hanger)
+        bottom = host.outside_diameter / 2.0 + host.InsulationThickness
+        hanger.rods = [Rod(0.0, 0.0, bottom, 0.0, 0.0, False)]
+        underside = self.underside_above(point[0], point[1], point[2] + bottom)
+        if rod_length is None:
+            rod_length = underside - point[2] - bottom if underside is not None else 2.0
+        hanger.rods[0].length = max(rod_length, 0.0)
+        hanger.rods[0].attached = attached and underside is not None
+        self.host(hanger, host)
+        return hanger
+
+    def host(self, hanger, host):
+        hanger.host_id = host.Id if host is not None else ElementId.InvalidElementId
+        if host is not None:
+            self.hangers_by_host.setdefault(host.Id.IntegerValue, []).append(hanger)
+
+    # Regeneration --------------------------------------------------------
+    def moved(self, part, dx, dy, dz):
+        if part.rods is None and part.Id.IntegerValue in self.hangers_by_host:
+            pending = self._pending.get(part.Id.IntegerValue, (0.0, 0.0, 0.0))
+            self._pending[part.Id.IntegerValue] = (pending[0] + dx, pending[1] + dy, pending[2] + dz)
+
+    def Regenerate(self):
+        CALLS["Document.Regenerate"] += 1
+        pending, self._pending = self._pending, {}
+        for host_id, (dx, dy, dz) in pending.items():
+            for hanger in self.hangers_by_host.get(host_id, ()):
+                hanger.x0 += dx
+                hanger.y0 += dy
+                hanger.z0 += dz
+                hanger.x1, hanger.y1, hanger.z1 = hanger.x0, hanger.y0, hanger.z0
+
+    # Structure -----------------------------------------------------------
+    def structure_above(self, x, y, z):
+        """(element, underside z) of the lowest structure whose underside is at or above z."""
+        floor = int(math.floor(z / self.floor_height))
+        cx, cy = self._cell(x), self._cell(y)
+        best = None
+        for f in (floor, floor + 1):
+            for element in self.structure_cells.get((f, cx, cy), ()):
+                lo, hi = element.box_min, element.box_max
+                if lo[0] <= x <= hi[0] and lo[1] <= y <= hi[1] and lo[2] >= z - 1e-9:
+                    if best is None or lo[2] < best[1]:
+                        best = (element, lo[2])
+            if best is not None:
+                return best
+        return best
+
+    def underside_above(self, x, y, z):
+        hit = self.structure_above(x, y, z)
+        return hit[1] if hit is not None else None
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""The few .NET types the extension's lib modules import (System, List[T])."""
+#CLASSES
+#==================================================
+class _GenericList(list):
+    """System.Collections.Generic.List[T]: a Python list with the .NET members used."""
+
+    def Add(self, item):
+        self.append(item)
+
+    def AddRange(self, items):
+        self.extend(items)
+
+    def Contains(self, item):
+        return item in self
+
+    def Clear(self):
+        del self[:]
+
+    @property
+    def Count(self):
+        return len(self)
+
+
+class _ListFactory(object):
+    """List[T] returns the list type whatever T is; List[T](items) fills it."""
+
+    def __getitem__(self, item_type):
+        return _GenericList
+
+
+List = _ListFactory()
+
+
+class Guid(object):
+    def __init__(self, text="00000000-0000-0000-0000-000000000000"):
+        self.text = text
+
+    def ToString(self):
+        return self.text
+
+    def __str__(self):
+        return self.text
+
+    @staticmethod
+    def NewGuid():
+        import uuid
+        return Guid(str(uuid.uuid4()))
+
+Guid.Empty = Guid()
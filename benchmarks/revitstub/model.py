@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""Synthetic fabrication models for the stand-in API: levels, structure, racks, hangers."""
+#IMPORTS
+#==================================================
+import math
+import random
+
+from revitstub.api import (Document, FabricationConfiguration, FabricationService,
+                           FabricationServiceButton, FabricationPart, StructuralElement,
+                           Level, View3D, ElementId, BuiltInCategory)
+
+#VARIABLES
+#==================================================
+MATERIALS = {1: "Copper", 2: "Carbon Steel", 3: "Stainless Steel"}
+
+# (size, outside diameter in inches)
+SIZES = [('3/4"', 0.875), ('1"', 1.125), ('1-1/2"', 1.625), ('2"', 2.375),
+         ('3"', 3.5), ('4"', 4.5), ('6"', 6.625)]
+
+# spec id -> (name, [(max OD ft, thickness ft)])
+INSULATION = {
+    1: ("Fiberglass 1\"",      [(10.0, 1.0 / 12.0)]),
+    2: ("Fiberglass 1-1/2\"",  [(2.5 / 12.0, 1.0 / 12.0), (10.0, 1.5 / 12.0)]),
+    3: ("Fiberglass 2\"",      [(4.0 / 12.0, 1.5 / 12.0), (10.0, 2.0 / 12.0)]),
+}
+
+# (service name, material id, insulation spec id)
+SERVICES = [
+    ("Heating Hot Water Supply",  2, 2),
+    ("Heating Hot Water Return",  2, 2),
+    ("Chilled Water Supply",      2, 3),
+    ("Chilled Water Return",      2, 3),
+    ("Domestic Cold Water",       1, 1),
+    ("Domestic Hot Water",        1, 1),
+    ("Sanitary Vent",             3, 0),
+]
+
+FLOOR_HEIGHT   = 14.0
+SLAB_THICKNESS = 8.0 / 12.0
+BEAM_DEPTH     = 1.5
+BEAM_SPACING   = 30.0
+RACK_ELEVATION = 10.0     # ft above the level, bottom of insulation
+RACK_GAP       = 1.0 / 12.0
+RACK_SPACING_Y = 15.0
+
+#FUNCTIONS
+#==================================================
+def build_model(parts=1000, seed=0, rack_width=6, segments_per_run=5, pipe_length=20.0,
+                hanger_spacing=10.0, unhosted_ratio=0.02, host_missing_ratio=0.01,
+                attached_ratio=0.5, insulated=True):
+    """Builds a Document with about `parts` fabrication parts (pipes + hangers).
+
+    Pipes come in racks of rack_width parallel services, BOI-aligned and
+    spaced RACK_GAP apart, each run made of segments_per_run collinear pipes.
+    Every pipe gets hangers at hanger_spacing; a share of them is left
+    unhosted or pointing at a deleted host, and a share is attached to the
+    slab or beam above. Racks alternate between X and Y runs. Same seed,
+    same model. doc.racks lists each rack's pipes as [lane][segment].
+    """
+    rng = random.Random(seed)
+    hangers_per_pipe = max(1, int(pipe_length // hanger_spacing))
+    parts_per_rack = rack_width * segments_per_run * (1 + hangers_per_pipe)
+    rack_count = max(1, int(round(float(parts) / parts_per_rack)))
+    level_count = max(1, min(12, rack_count // 20))
+    racks_per_level = int(math.ceil(float(rack_count) / level_count))
+    columns = max(1, int(math.ceil(math.sqrt(racks_per_level))))
+    run_length = segments_per_run * pipe_length
+    cell = run_length + 20.0
+    site = (columns * cell, columns * cell)
+
+    config = FabricationConfiguration(
+        dict(MATERIALS),
+        [FabricationService(i + 1, name, [FabricationServiceButton("Clevis Hanger", True),
+                                          FabricationServiceButton("Pipe", False)])
+         for i, (name, _, _) in enumerate(SERVICES)],
+        dict(INSULATION))
+    doc = Document("Synthetic {0} parts (seed {1})".format(parts, seed), config, FLOOR_HEIGHT)
+    doc.add(View3D())
+    doc.racks = []
+
+    levels = []
+    for f in range(level_count):
+        level = doc.add(Level("Level {0}".format(f + 1), f * FLOOR_HEIGHT))
+        levels.append(level)
+        _add_structure(doc, f, site)
+
+    rack = 0
+    for f, level in enumerate(levels):
+        for slot in range(racks_per_level):
+            if rack >= rack_count:
+                break
+            column, row = slot % columns, slot // columns
+            along_x = (row + column) % 2 == 0
+            origin = (column * cell + 10.0, row * cell + 10.0)
+            doc.racks.append(_add_rack(doc, rng, level, f, origin, along_x, rack_width, segments_per_run,
+                      pipe_length, hanger_spacing, unhosted_ratio, host_missing_ratio,
+                      attached_ratio, insulated))
+            rack += 1
+    return doc
+
+
+def _add_structure(doc, floor, site):
+    slab_bottom = (floor + 1) * FLOOR_HEIGHT - SLAB_THICKNESS
+    doc.add(StructuralElement(BuiltInCategory.OST_Floors, "Slab {0}".format(floor + 1),
+                              (0.0, 0.0, slab_bottom), (site[0], site[1], slab_bottom + SLAB_THICKNESS)))
+    x = BEAM_SPACING
+    while x < site[0]:
+        doc.add(StructuralElement(BuiltInCategory.OST_StructuralFraming, "W12x26",
+                                  (x - 0.25, 0.0, slab_bottom - BEAM_DEPTH), (x + 0.25, site[1], slab_bottom)))
+        x += BEAM_SPACING
+
+
+def _add_rack(doc, rng, level, floor, origin, along_x, rack_width, segments, pipe_length,
+              hanger_spacing, unhosted_ratio, host_missing_ratio, attached_ratio, insulated):
+    boi = floor * FLOOR_HEIGHT + RACK_ELEVATION
+    offset = 0.0
+    lanes = []
+    for lane in range(rack_width):
+        name, material, spec = SERVICES[rng.randrange(len(SERVICES))]
+        service_id = [s[0] for s in SERVICES].index(name) + 1
+        size, od_inches = SIZES[rng.randrange(len(SIZES))]
+        od = od_inches / 12.0
+        spec = spec if insulated else 0
+        thickness = doc.fabrication.insulation_thickness(spec, od) if spec else 0.0
+        half = od / 2.0 + thickness
+        offset += half
+        centre_z = boi + half
+        lanes.append([])
+        for segment in range(segments):
+            a, b = segment * pipe_length, (segment + 1) * pipe_length
+            if along_x:
+                start = (origin[0] + a, origin[1] + offset, centre_z)
+                end   = (origin[0] + b, origin[1] + offset, centre_z)
+            else:
+                start = (origin[0] + offset, origin[1] + a, centre_z)
+                end   = (origin[0] + offset, origin[1] + b, centre_z)
+            pipe = FabricationPart(BuiltInCategory.OST_FabricationPipework, size, material,
+                                   service_id, name, od, start, end)
+            pipe.LevelId = level.Id
+            doc.add(pipe)
+            pipe._insulation_spec = spec
+            lanes[-1].append(pipe)
+            _add_hangers(doc, rng, pipe, start, end, pipe_length, hanger_spacing,
+                         unhosted_ratio, host_missing_ratio, attached_ratio)
+        offset += half + RACK_GAP
+    return lanes
+
+
+def _add_hangers(doc, rng, pipe, start, end, pipe_length, spacing, unhosted_ratio,
+                 host_missing_ratio, attached_ratio):
+    count = max(1, int(pipe_length // spacing))
+    for i in range(count):
+        t = (i + 0.5) / count
+        point = tuple(s + (e - s) * t for s, e in zip(start, end))
+        # Some rods were modelled a little short or long of the structure
+        hanger = doc.add_hanger(pipe, point, "Clevis Hanger", rng.random() < attached_ratio)
+        rod = hanger.rods[0]
+        if not rod.attached:
+            rod.length = max(rod.length + rng.uniform(-0.25, 0.25), 0.1)
+        draw = rng.random()
+        if draw < unhosted_ratio:
+            _unhost(doc, hanger, pipe, ElementId.InvalidElementId)
+        elif draw < unhosted_ratio + host_missing_ratio:
+            _unhost(doc, hanger, pipe, ElementId(10 ** 9 + hanger.Id.IntegerValue))
+
+
+def _unhost(doc, hanger, pipe, host_id):
+    doc.hangers_by_host[pipe.Id.IntegerValue].remove(hanger)
+    hanger.host_id = host_id
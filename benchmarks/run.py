@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""Runs the Modeling panel scenarios on synthetic models and checks them against a baseline.
+
+    python run.py                              # default scales, compare to baseline.json
+    python run.py --scales 1000,10000,100000
+    python run.py --only "Rod Length" --repeat 5
+    python run.py --save-baseline              # accept the current figures
+
+For every scenario and scale it records the best wall time of --repeat runs,
+the Revit API call counts of one run and, on Python 3, the peak memory the
+run allocated (tracemalloc, measured in a separate run so tracing does not
+slow the timed ones). Results go to results.json; any scenario busier or
+heavier than the baseline by more than the tolerances makes the exit status 1.
+Wall time only counts with --check-time, against a baseline recorded on the
+same machine.
+"""
+#IMPORTS
+#==================================================
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+try:
+    import tracemalloc
+except ImportError:             # Python 2.7 / IronPython: no memory figures
+    tracemalloc = None
+
+from revitstub import install
+install()
+
+from revitstub import api
+from revitstub.model import build_model
+from scenarios import SCENARIOS
+
+#VARIABLES
+#==================================================
+HERE          = os.path.dirname(os.path.abspath(__file__))
+RESULTS_PATH  = os.path.join(HERE, "results.json")
+BASELINE_PATH = os.path.join(HERE, "baseline.json")
+SCALES        = [1000, 10000]
+SEED          = 0
+
+# Allowed growth over the baseline before a figure counts as a regression.
+# Call counts are deterministic, so any growth is flagged; wall time varies
+# from run to run and machine to machine, so it is only checked on request
+# (--check-time) and then with a wide margin.
+# Differences below the floors are noise on runs this short and are ignored.
+TIME_TOLERANCE   = 0.50
+CALLS_TOLERANCE  = 0.0
+MEMORY_TOLERANCE = 0.25
+TIME_FLOOR       = 0.05         # s
+MEMORY_FLOOR     = 256 * 1024   # bytes
+
+clock = getattr(time, "perf_counter", time.time)
+
+#FUNCTIONS
+#==================================================
+def run_scenario(scenario, scale, repeat):
+    """Times one scenario at one scale. Returns its result record."""
+    best = None
+    calls = None
+    extra = None
+    for _ in range(repeat):
+        doc = build_model(parts=scale, seed=SEED)
+        run = scenario.setup(doc)
+        api.reset_calls()
+        start = clock()
+        extra = run() or {}
+        elapsed = clock() - start
+        calls = dict(api.CALLS)
+        best = elapsed if best is None else min(best, elapsed)
+
+    peak = None
+    if tracemalloc is not None:
+        doc = build_model(parts=scale, seed=SEED)
+        run = scenario.setup(doc)
+        tracemalloc.start()
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    if "rows" in extra and best:
+        extra["rows_per_second"] = round(extra["rows"] / best)
+    return {
+        "scenario":    scenario.name,
+        "scale":       scale,
+        "seconds":     round(best, 4),
+        "total_calls": sum(calls.values()),
+        "calls":       calls,
+        "peak_bytes":  peak,
+        "extra":       extra,
+    }
+
+
+def compare(results, baseline, time_tolerance=None, calls_tolerance=CALLS_TOLERANCE,
+            memory_tolerance=MEMORY_TOLERANCE):
+    """Regressions against baseline, as a list of messages (empty when all is well).
+
+    Wall time is left out unless a time_tolerance is given.
+    """
+    previous = dict(((r["scenario"], r["scale"]), r) for r in baseline.get("results", []))
+    checks = [("total_calls", calls_tolerance, 0),
+              ("peak_bytes", memory_tolerance, MEMORY_FLOOR)]
+    if time_tolerance is not None:
+        checks.insert(0, ("seconds", time_tolerance, TIME_FLOOR))
+    regressions = []
+    for result in results:
+        before = previous.get((result["scenario"], result["scale"]))
+        if before is None:
+            continue
+        for key, tolerance, floor in checks:
+            old, new = before.get(key), result.get(key)
+            if old is None or new is None:
+                continue
+            if new > old * (1.0 + tolerance) and new - old > floor:
+                regressions.append("{0} @ {1}: {2} {3} -> {4} (+{5:.0%})".format(
+                    result["scenario"], result["scale"], key, old, new, float(new - old) / max(old, 1e-9)))
+        for name, count in sorted(result["calls"].items()):
+            old = before.get("calls", {}).get(name, 0)
+            if count > old * (1.0 + calls_tolerance):
+                regressions.append("{0} @ {1}: {2} calls {3} -> {4}".format(
+                    result["scenario"], result["scale"], name, old, count))
+    return regressions
+
+
+def format_row(result):
+    peak = "-" if result["peak_bytes"] is None else "{0:.2f}".format(result["peak_bytes"] / 1048576.0)
+    return "{0:<48} {1:>8} {2:>9.3f} {3:>9} {4:>8}".format(
+        result["scenario"], result["scale"], result["seconds"], result["total_calls"], peak)
+
+
+def read_json(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def write_json(path, data):
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+        f.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default=",".join(str(s) for s in SCALES),
+                        help="comma-separated model sizes in parts")
+    parser.add_argument("--only", default="", help="run scenarios whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per scenario and scale")
+    parser.add_argument("--output", default=RESULTS_PATH)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--check-time", action="store_true",
+                        help="also flag slower wall times (baseline recorded on this machine only)")
+    parser.add_argument("--time-tolerance", type=float, default=TIME_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+    scenarios = [s for name, s in SCENARIOS.items() if args.only.lower() in name.lower()]
+
+    print("{0:<48} {1:>8} {2:>9} {3:>9} {4:>8}".format("Scenario", "Parts", "Seconds", "API calls", "Peak MB"))
+    results = []
+    for scenario in scenarios:
+        for scale in scales:
+            result = run_scenario(scenario, scale, max(1, args.repeat))
+            results.append(result)
+            print(format_row(result))
+
+    data = {
+        "meta": {
+            "python":   platform.python_version(),
+            "platform": platform.platform(),
+            "date":     time.strftime("%Y-%m-%d %H:%M:%S"),
+            "seed":     SEED,
+            "repeat":   args.repeat,
+        },
+        "results": results,
+    }
+    write_json(args.output, data)
+    print("\nResults written to {0}".format(args.output))
+
+    if args.save_baseline:
+        write_json(args.baseline, data)
+        print("Baseline saved to {0}".format(args.baseline))
+        return 0
+
+    baseline = read_json(args.baseline)
+    if baseline is None:
+        print("No baseline at {0}; run with --save-baseline to create one.".format(args.baseline))
+        return 0
+
+    regressions = compare(results, baseline, time_tolerance=args.time_tolerance if args.check_time else None)
+    if args.check_time and baseline["meta"].get("platform") != data["meta"]["platform"]:
+        print("Baseline was recorded on {0}; compare timings with care.".format(baseline["meta"].get("platform")))
+    if regressions:
+        print("\n{0} regression(s) against the baseline:".format(len(regressions)))
+        for message in regressions:
+            print("  " + message)
+        return 1
+    print("No regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
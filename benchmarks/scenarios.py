@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""One scenario per Modeling panel tool, driving the same lib code the button runs.
+
+A scenario's setup(doc) does the untimed part (what the user picks before the
+tool touches the model) and returns run(), the timed part. run() may return a
+dict of extra figures to record next to the timings.
+
+Selection-based tools act on the pipes of SELECTED_RACKS racks, the way a
+detailer works a few racks at a time; model-wide tools act on the whole model.
+The model size is what changes from one scale to the next.
+"""
+#IMPORTS
+#==================================================
+from collections import namedtuple, OrderedDict
+
+from Autodesk.Revit.DB import Transaction, BuiltInCategory
+
+from Snippets._alignment import (ELEVATION_PARAMS, REFERENCE_REACH, get_elevation, apply_elevations,
+                                 align_to_nearest_reference)
+from Snippets._fabparts import HalfOdProvider
+from Snippets._hangers import collect_hangers, audit_hosts, sync_comment_flags
+from Snippets._insulation import InsulationChange
+from Snippets._parttable import PartTable
+from Snippets._rods import (index_hosted_hangers, follow_host_moves, set_rod_extensions,
+                            set_rod_lengths_to_structure, get_3d_view)
+from Snippets._spread import spread_by_gap, get_bottom_elevation
+
+#VARIABLES
+#==================================================
+SELECTED_RACKS = 2
+SPREAD_GAP     = 2.0 / 12.0     # ft
+ROD_EXTENSION  = -1.0 / 12.0    # ft, 1" below structure
+
+INSULATION_SERVICE = "Chilled Water"
+INSULATION_SPECS = [
+    {'Service': INSULATION_SERVICE, 'Min_OD': 0.0, 'Max_OD': 1.5,          'Insulation_Specification': 2},
+    {'Service': INSULATION_SERVICE, 'Min_OD': 1.5, 'Max_OD': float('inf'), 'Insulation_Specification': 3},
+]
+
+Scenario = namedtuple("Scenario", "name setup")
+
+#FUNCTIONS
+#==================================================
+def selected_racks(doc):
+    return doc.racks[:SELECTED_RACKS]
+
+
+def selected_pipes(doc):
+    return [pipe for rack in selected_racks(doc) for lane in rack for pipe in lane]
+
+
+def place_insulation(doc):
+    parts = selected_pipes(doc)
+
+    def run():
+        change = InsulationChange(doc, parts)
+        with Transaction(doc, "Change Insulation Specification") as t:
+            t.Start()
+            change.apply(INSULATION_SPECS, INSULATION_SERVICE)
+            t.Commit()
+        shifts = change.shifts()
+        with Transaction(doc, "Re-spread Racks") as t:
+            t.Start()
+            moved = change.respread(shifts)
+            t.Commit()
+        return {"changed": len(change.changed), "moved": moved}
+    return run
+
+
+def _spread_runs(doc):
+    """(reference, pipes to move) for every segment of the selected racks, lane 0 first."""
+    runs = []
+    for rack in selected_racks(doc):
+        for segment in range(len(rack[0])):
+            pipes = [lane[segment] for lane in rack]
+            runs.append((pipes[0], pipes[1:]))
+    return runs
+
+
+def spread_by_gap_tool(doc):
+    runs = _spread_runs(doc)
+
+    def run():
+        moved = 0
+        for reference, pipes in runs:
+            half_ods = HalfOdProvider()
+            with Transaction(doc, "Move Pipes") as t:
+                t.Start()
+                moved += len(spread_by_gap(reference, pipes, SPREAD_GAP, half_ods.get,
+                                           digits=5, fabrication_only=True))
+                t.Commit()
+        return {"moved": moved}
+    return run
+
+
+def align_boi_and_spread(doc):
+    runs = _spread_runs(doc)
+
+    def run():
+        moved = rods = 0
+        for reference, pipes in runs:
+            half_ods = HalfOdProvider()
+            hangers_by_host = index_hosted_hangers(doc, pipes)
+            with Transaction(doc, "Spread + Align BOP") as t:
+                t.Start()
+                result = spread_by_gap(reference, pipes, SPREAD_GAP, half_ods.get,
+                                       bottom_elevation=get_bottom_elevation(reference))
+                z_moves = dict((p.Id.IntegerValue, vec.Z) for p, vec in result)
+                rods += follow_host_moves(doc, hangers_by_host, z_moves)[0]
+                t.Commit()
+            moved += len(result)
+        return {"moved": moved, "rods_updated": rods}
+    return run
+
+
+def elevation_alignment(param_name):
+    def setup(doc):
+        parts = selected_pipes(doc)
+        reference = parts[0]
+
+        def run():
+            elevation = get_elevation(reference, param_name)
+            with Transaction(doc, "Align Elevation") as t:
+                t.Start()
+                aligned, rods, _ = apply_elevations(doc, [(p, elevation) for p in parts[1:]], param_name)
+                t.Commit()
+            return {"aligned": aligned, "rods_updated": rods}
+        return run
+    return setup
+
+
+def align_to_nearest_ref(doc):
+    racks = selected_racks(doc)
+    references = [pipe for rack in racks for pipe in rack[0]]
+    parts = [pipe for rack in racks for lane in rack[1:] for pipe in lane]
+    param_name = ELEVATION_PARAMS["Bottom of Pipe (BOP)"]
+
+    def run():
+        assignments, _ = align_to_nearest_reference(references, parts, param_name, max_offset=REFERENCE_REACH)
+        with Transaction(doc, "Align to Nearest Reference") as t:
+            t.Start()
+            aligned, rods, _ = apply_elevations(doc, [(p, z) for p, _, z in assignments], param_name)
+            t.Commit()
+        return {"aligned": aligned, "rods_updated": rods}
+    return run
+
+
+def check_hangers(doc):
+    def run():
+        audit = audit_hosts(doc, collect_hangers(doc))
+        flagged, cleared, _ = sync_comment_flags(doc, audit)
+        return {"hangers": audit.total, "flagged": flagged}
+    return run
+
+
+def adjust_rod_length_extension(doc):
+    def run():
+        rods_set, _ = set_rod_extensions(doc, collect_hangers(doc), ROD_EXTENSION)
+        return {"rods_set": rods_set}
+    return run
+
+
+def adjust_rod_length_measure(doc):
+    def run():
+        hangers = collect_hangers(doc)
+        report, _ = set_rod_lengths_to_structure(doc, hangers, ROD_EXTENSION, get_3d_view(doc))
+        return {"measured": report["measured"], "ray_casts": report["ray_casts"]}
+    return run
+
+
+def part_table(doc):
+    def run():
+        table = PartTable.collect(doc, BuiltInCategory.OST_FabricationPipework)
+        return {"rows": len(table), "bytes_per_row": float(table.nbytes()) / max(len(table), 1)}
+    return run
+
+#SCENARIOS
+#==================================================
+SCENARIOS = OrderedDict((s.name, s) for s in [
+    Scenario("Place Insulation", place_insulation),
+    Scenario("Spread by Gap", spread_by_gap_tool),
+    Scenario("Align BOI + Adjust Spread", align_boi_and_spread),
+] + [
+    Scenario("Elevation Alignment: {0}".format(mode), elevation_alignment(param))
+    for mode, param in ELEVATION_PARAMS.items()
+] + [
+    Scenario("Elevation Alignment: Nearest Ref", align_to_nearest_ref),
+    Scenario("Check Hangers", check_hangers),
+    Scenario("Adjust Rod Length: Extension", adjust_rod_length_extension),
+    Scenario("Adjust Rod Length: Measure", adjust_rod_length_measure),
+    Scenario("PartTable", part_table),
+])
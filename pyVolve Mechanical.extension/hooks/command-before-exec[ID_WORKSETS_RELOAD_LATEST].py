@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+#⬇️ Imports
+from Snippets._session import RELOAD, start_command, finish_on_idling
+
+#--------------------------------------------------
+#📦 Variables
+sender = __eventsender__ # UIApplication
+args   = __eventargs__   # Autodesk.Revit.UI.Events.BeforeExecutedEventArgs
+doc    = sender.ActiveUIDocument.Document
+
+#--------------------------------------------------
+# #🎯 MAIN
+# Reload Latest has no 'after' event: Revit goes idle again once it is done.
+start_command(RELOAD, doc)
+finish_on_idling(sender, RELOAD, doc)
@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+#⬇️ Imports
+from Snippets._cache import invalidate
+from Snippets._session import record_changes
+
+#--------------------------------------------------
+#📦 Variables
+sender = __eventsender__ # Autodesk.Revit.ApplicationServices.Application
+args   = __eventargs__   # Autodesk.Revit.DB.Events.DocumentChangedEventArgs
+doc    = args.GetDocument()
+
+#--------------------------------------------------
+# #🎯 MAIN
+# Runs after every transaction, so it only collects element ids.
+record_changes(doc, args)
+invalidate(doc, args)
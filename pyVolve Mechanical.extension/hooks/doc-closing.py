@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+#⬇️ Imports
+from Snippets._cache import drop_document
+
+#--------------------------------------------------
+#📦 Variables
+sender = __eventsender__ # Autodesk.Revit.ApplicationServices.Application
+args   = __eventargs__   # Autodesk.Revit.DB.Events.DocumentClosingEventArgs
+doc    = args.Document
+
+#--------------------------------------------------
+# #🎯 MAIN
+# Cached indexes of the document are let go.
+drop_document(doc)
@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+#⬇️ Imports
+from Snippets._warmup import start_warmup
+
+#--------------------------------------------------
+#📦 Variables
+sender = __eventsender__ # Autodesk.Revit.ApplicationServices.Application
+args   = __eventargs__   # Autodesk.Revit.DB.Events.DocumentOpenedEventArgs
+uiapp  = __revit__       # UIApplication, for Idling
+doc    = args.Document
+
+#--------------------------------------------------
+# #🎯 MAIN
+# Part indexes are built while Revit is idle, so the first click finds them warm.
+start_warmup(uiapp, doc)
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+#⬇️ Imports
+from Snippets._session import SAVE, finish_command, status_of
+from Snippets._sidecar import save_sidecar, warn
+
+#--------------------------------------------------
+#📦 Variables
+sender = __eventsender__ # Autodesk.Revit.ApplicationServices.Application
+args   = __eventargs__   # Autodesk.Revit.DB.Events.DocumentSavedEventArgs
+doc    = args.Document
+
+#--------------------------------------------------
+# #🎯 MAIN
+# Logs the save, and keeps the part indexes as saved for the next session
+# (only the file's header is rewritten when they did not change).
+finish_command(SAVE, doc, status_of(args))
+if status_of(args) == "ok":
+    try:
+        save_sidecar(doc)
+    except Exception as e:
+        warn("Could not save the part index sidecar: {0}".format(e))
@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+#⬇️ Imports
+from Snippets._session import SAVE, start_command
+
+#--------------------------------------------------
+#📦 Variables
+sender = __eventsender__ # Autodesk.Revit.ApplicationServices.Application
+args   = __eventargs__   # Autodesk.Revit.DB.Events.DocumentSavingEventArgs
+doc    = args.Document
+
+#--------------------------------------------------
+# #🎯 MAIN
+# Timed until doc-saved.
+start_command(SAVE, doc)
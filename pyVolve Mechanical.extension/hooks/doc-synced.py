@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+#⬇️ Imports
+from Snippets._session import SYNC, finish_command, status_of
+
+#--------------------------------------------------
+#📦 Variables
+sender = __eventsender__ # Autodesk.Revit.ApplicationServices.Application
+args   = __eventargs__   # Autodesk.Revit.DB.Events.DocumentSynchronizedWithCentralEventArgs
+doc    = args.Document
+
+#--------------------------------------------------
+# #🎯 MAIN
+# Logs the sync and, when it succeeded, starts a new count of changed parts.
+finish_command(SYNC, doc, status_of(args))
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+#⬇️ Imports
+import os
+
+from Snippets._session import SYNC, start_command
+from Snippets._validation import check_before_sync
+
+#--------------------------------------------------
+#📦 Variables
+sender = __eventsender__ # Autodesk.Revit.ApplicationServices.Application
+args   = __eventargs__   # Autodesk.Revit.DB.Events.DocumentSynchronizingWithCentralEventArgs
+doc    = args.Document
+
+SPECS_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         "pyVolve Mechanical.tab", "Modeling.panel", "Insulation.pulldown",
+                         "Verify Correct Insulation.pushbutton", "InsulationSpecs.csv")
+
+#--------------------------------------------------
+# #🎯 MAIN
+# Quick checks on the parts changed since the last sync, within the time budget.
+# Issues are reported only; the sync goes ahead.
+report = check_before_sync(doc, SPECS_CSV)
+if report is not None and not report.clean:
+    print(report.summary())
+
+# Timed until doc-synced.
+start_command(SYNC, doc)
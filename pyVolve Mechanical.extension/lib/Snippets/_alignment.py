@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""Elevation alignment helpers shared by the Elevation Alignment tools."""
+#IMPORTS
+#==================================================
+from collections import OrderedDict
+
+from Autodesk.Revit.DB import StorageType, LocationCurve
+
+from Snippets._spatial import SegmentGrid, unit_direction_2d
+from Snippets._rods import index_hosted_hangers, follow_host_moves
+
+#VARIABLES
+#==================================================
+# Alignment mode -> fabrication parameter that drives it
+ELEVATION_PARAMS = OrderedDict([
+    ("Bottom of Insulation (BOI)", "Lower End Bottom of Insulation Elevation"),
+    ("Bottom of Pipe (BOP)",       "Lower End Bottom Elevation"),
+    ("Centerline",                 "Middle Elevation"),
+    ("Top of Pipe (TOP)",          "Upper End Top Elevation"),
+    ("Top of Insulation (TOI)",    "Upper End Top of Insulation Elevation"),
+])
+
+REFERENCE_REACH = 10.0      # ft - largest plan offset from a reference's axis Align to Nearest Ref accepts
+
+#FUNCTIONS
+#==================================================
+def get_elevation(element, param_name):
+    """Returns the double value of param_name, or None if missing or not a length."""
+    param = element.LookupParameter(param_name)
+    if param and param.StorageType == StorageType.Double:
+        return param.AsDouble()
+    return None
+
+
+def set_elevation(element, param_name, value):
+    """Sets param_name on element. Returns True when the value was written."""
+    param = element.LookupParameter(param_name)
+    if param and param.StorageType == StorageType.Double and not param.IsReadOnly:
+        param.Set(value)
+        return True
+    return False
+
+
+def apply_elevations(doc, targets, param_name):
+    """Writes target elevations and keeps the rods of hangers on moved parts in place.
+
+    targets: list of (part, elevation)
+    Runs inside the caller's transaction. Only hangers hosted on parts that
+    actually change elevation are looked up (see index_hosted_hangers), and
+    their rods are refreshed in the same transaction.
+    Returns (aligned, rods_updated, rod_failures).
+    """
+    changes = []
+    for part, elevation in targets:
+        before = get_elevation(part, param_name)
+        dz = elevation - before if before is not None else 0.0
+        changes.append((part, elevation, dz))
+
+    hangers_by_host = index_hosted_hangers(doc, [part for part, _, dz in changes if dz])
+    aligned = 0
+    moves = {}
+    for part, elevation, dz in changes:
+        if set_elevation(part, param_name, elevation):
+            aligned += 1
+            if dz:
+                moves[part.Id.IntegerValue] = dz
+    rods_updated, rod_failures = follow_host_moves(doc, hangers_by_host, moves)
+    return aligned, rods_updated, rod_failures
+
+
+def get_plan_axis(element):
+    """Returns ((x0, y0), (x1, y1)) of the element's location curve, or None."""
+    loc = element.Location
+    if not isinstance(loc, LocationCurve):
+        return None
+    curve = loc.Curve
+    if not curve:
+        return None
+    start = curve.GetEndPoint(0)
+    end   = curve.GetEndPoint(1)
+    return (start.X, start.Y), (end.X, end.Y)
+
+
+def align_to_nearest_reference(references, parts, param_name, max_distance=None, max_offset=None):
+    """Matches each part to the nearest parallel reference in plan.
+
+    references: list of reference FabricationParts
+    parts:      list of FabricationParts to align
+    max_distance bounds the plan distance from a part's midpoint to the
+    reference segment; max_offset bounds only its offset from the
+    reference's axis, so a part further along the same run still matches.
+    Returns (assignments, skipped) where assignments is a list of
+    (part, reference, target_elevation) and skipped a list of (part, reason).
+    Nothing is written to the model here; the caller applies the assignments
+    with apply_elevations() inside its own transaction.
+    """
+    ref_elevations = {}
+    ref_segments = []
+    for ref in references:
+        axis = get_plan_axis(ref)
+        elevation = get_elevation(ref, param_name)
+        if axis is None or elevation is None:
+            continue
+        key = ref.Id.IntegerValue
+        ref_elevations[key] = (ref, elevation)
+        ref_segments.append((key, axis[0], axis[1]))
+
+    index = SegmentGrid(ref_segments)
+    assignments = []
+    skipped = []
+    for part in parts:
+        if part.Id.IntegerValue in ref_elevations:
+            continue
+        axis = get_plan_axis(part)
+        if axis is None:
+            skipped.append((part, "no location curve"))
+            continue
+        start, end = axis
+        direction = unit_direction_2d(start, end)
+        if direction is None:
+            skipped.append((part, "vertical in plan"))
+            continue
+        midpoint = ((start[0] + end[0]) / 2.0, (start[1] + end[1]) / 2.0)
+        key, _ = index.nearest(midpoint, direction, max_distance, max_offset)
+        if key is None:
+            skipped.append((part, "no parallel reference"))
+            continue
+        ref, elevation = ref_elevations[key]
+        assignments.append((part, ref, elevation))
+    return assignments, skipped
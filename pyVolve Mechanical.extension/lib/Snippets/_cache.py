@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+"""Per-document indexes of fabrication parts, kept alive between button clicks.
+
+    hosts = get_index(doc, HangerHosts)
+    hanger_ids = hosts.ids(pipe.Id.IntegerValue)
+
+An index maps each part's id to one value (its service, size, host or
+bounding box) and each value back to its ids. Indexes are kept in the
+AppDomain, like the hooks' session state, and are patched rather than
+rebuilt after the model changes: the doc-changed hook queues the added,
+modified and deleted ids (invalidate()), and the next get_index() re-reads
+only those elements into every index of that document. Sync and Reload
+Latest bring other people's changes in through the same DocumentChanged
+events, so they are patched like local edits.
+
+Indexes can also be built ahead of time, a slice at a time, by a warmup
+job (see Snippets._warmup); asking for an index the job has not finished
+completes it on the spot.
+
+Each document keeps at most 'cache_max_records' records; the least recently
+used indexes are evicted first, and only MAX_DOCUMENTS documents are kept.
+Cached objects may come from another script engine, so they are looked up
+by name, never by class.
+"""
+#IMPORTS
+#==================================================
+import math
+from collections import OrderedDict
+
+from Autodesk.Revit.DB import FilteredElementCollector, ElementClassFilter, ElementId, FabricationPart
+
+from Snippets._settings import CACHE, CACHE_LIMIT, is_enabled, get_setting
+
+#VARIABLES
+#==================================================
+STATE_KEY = "pyVolve.cache.1"
+
+MAX_RECORDS   = 600000      # per document, across its indexes
+MAX_DOCUMENTS = 3
+
+BUCKET_SIZE = 10.0          # ft, side of a SpatialBuckets cell
+
+_local_state = OrderedDict()    # outside Revit (benchmarks, tests)
+
+#FUNCTIONS
+#==================================================
+def _documents():
+    """doc key -> DocumentCache, least recently used first."""
+    try:
+        from System import AppDomain
+        domain = AppDomain.CurrentDomain
+        documents = domain.GetData(STATE_KEY)
+        if documents is None:
+            documents = OrderedDict()
+            domain.SetData(STATE_KEY, documents)
+        return documents
+    except ImportError:
+        return _local_state
+
+
+def _touch(ordered, key):
+    value = ordered.pop(key)
+    ordered[key] = value
+    return value
+
+
+def document_key(doc):
+    return doc.PathName or doc.Title
+
+
+def max_records():
+    try:
+        return int(get_setting(CACHE_LIMIT, MAX_RECORDS))
+    except (TypeError, ValueError):
+        return MAX_RECORDS
+
+
+def document_cache(doc):
+    """The DocumentCache of doc, created when missing; marks doc as most recently used."""
+    documents = _documents()
+    key = document_key(doc)
+    if key in documents:
+        return _touch(documents, key)
+    cache = documents[key] = DocumentCache()
+    while len(documents) > MAX_DOCUMENTS:
+        documents.popitem(last=False)
+    return cache
+
+
+def is_cached(doc, cache):
+    """True while cache is still the one kept for doc (not dropped or evicted)."""
+    return _documents().get(document_key(doc)) is cache
+
+
+def get_index(doc, index_class):
+    """The index_class index of doc: cached, patched with pending changes, or built now."""
+    if not is_enabled(CACHE, True):
+        return index_class().build(doc)
+    return document_cache(doc).get(doc, index_class)
+
+
+def invalidate(doc, args):
+    """Queues the fabrication parts a DocumentChanged event added, modified or deleted."""
+    cache = _documents().get(document_key(doc))
+    if cache is None:
+        return
+    try:
+        parts = ElementClassFilter(FabricationPart)
+        changed = [i.IntegerValue for i in args.GetAddedElementIds(parts)]
+        changed += [i.IntegerValue for i in args.GetModifiedElementIds(parts)]
+        # Deleted elements cannot be filtered by class any more
+        deleted = [i.IntegerValue for i in args.GetDeletedElementIds()]
+        cache.invalidate(changed, deleted)
+    except Exception:
+        # A change that cannot be tracked leaves nothing to trust
+        drop_document(doc)
+
+
+def drop_document(doc):
+    cache = _documents().pop(document_key(doc), None)
+    if cache is not None and cache.warmup is not None:
+        cache.warmup.cancel()
+
+
+def feed(part, indexes):
+    """Reads part once into every index of indexes, replacing what they held for it.
+
+    Indexes that work from the bounding box (box_value) share one read of it.
+    """
+    element_id = part.Id.IntegerValue
+    bbox = False
+    for index in indexes:
+        index._discard(element_id)
+        if index.from_box:
+            if bbox is False:
+                bbox = part.get_BoundingBox(None)
+            value = index.box_value(bbox) if bbox is not None else None
+        else:
+            value = index.value(part)
+        if value is not None:
+            index._set(element_id, value)
+
+
+def patch_indexes(doc, indexes, changed, deleted):
+    """Re-reads changed ids into indexes, one GetElement each, and forgets deleted ones."""
+    for element_id in deleted:
+        for index in indexes:
+            index._discard(element_id)
+    for element_id in changed:
+        part = doc.GetElement(ElementId(element_id))
+        if isinstance(part, FabricationPart):
+            feed(part, indexes)
+        else:
+            for index in indexes:
+                index._discard(element_id)
+
+
+def hangers_on(doc, part_ids):
+    """Hangers hosted on any of part_ids (ints), from the cached host index."""
+    hosts = get_index(doc, HangerHosts)
+    hangers = []
+    for part_id in part_ids:
+        for hanger_id in hosts.ids(part_id):
+            hanger = doc.GetElement(ElementId(hanger_id))
+            if hanger is not None:
+                hangers.append(hanger)
+    return hangers
+
+#CLASSES
+#==================================================
+class Index(object):
+    """id -> value for the fabrication parts value() accepts, and value -> ids.
+
+    Subclasses set name and implement value(part), returning None to leave
+    the part out, or set from_box and implement box_value(bbox) when the
+    value comes from the bounding box alone. grouped = False skips the
+    value -> ids side.
+    """
+    name     = None
+    grouped  = True
+    from_box = False
+
+    def __init__(self):
+        self.values = {}
+        self.groups = {}
+
+    def __len__(self):
+        return len(self.values)
+
+    def value(self, part):
+        if self.from_box:
+            bbox = part.get_BoundingBox(None)
+            return self.box_value(bbox) if bbox is not None else None
+        raise NotImplementedError
+
+    def box_value(self, bbox):
+        raise NotImplementedError
+
+    def build(self, doc):
+        for part in FilteredElementCollector(doc).OfClass(FabricationPart):
+            self._add(part)
+        return self
+
+    def load(self, pairs):
+        """Fills the index from (id, value) pairs read elsewhere, such as a sidecar file."""
+        for element_id, value in pairs:
+            if value is not None:
+                self._set(element_id, value)
+        return self
+
+    def patch(self, doc, changed, deleted):
+        """Re-reads changed ids and forgets deleted ones."""
+        patch_indexes(doc, [self], changed, deleted)
+
+    def ids(self, value):
+        return self.groups.get(value, ())
+
+    def value_of(self, element_id):
+        return self.values.get(element_id)
+
+    def _add(self, part):
+        value = self.value(part)
+        if value is not None:
+            self._set(part.Id.IntegerValue, value)
+
+    def _set(self, element_id, value):
+        self.values[element_id] = value
+        if self.grouped:
+            self.groups.setdefault(value, set()).add(element_id)
+
+    def _discard(self, element_id):
+        value = self.values.pop(element_id, None)
+        if value is None or not self.grouped:
+            return
+        ids = self.groups.get(value)
+        if ids is not None:
+            ids.discard(element_id)
+            if not ids:
+                del self.groups[value]
+
+
+class PartsByService(Index):
+    name = "service"
+
+    def value(self, part):
+        return part.ServiceName or None
+
+
+class PartsBySize(Index):
+    name = "size"
+
+    def value(self, part):
+        return part.Size or None
+
+
+class HangerHosts(Index):
+    """Hanger id -> host id (int), and host -> hanger ids. Unhosted hangers map to -1."""
+    name = "hosts"
+
+    def value(self, part):
+        if not part.IsAHanger():
+            return None
+        info = part.GetHostedInfo()
+        return info.HostId.IntegerValue if info is not None else -1
+
+
+class GeometryRecords(Index):
+    """Part id -> bounding box (min x, min y, min z, max x, max y, max z) in feet."""
+    name     = "geometry"
+    grouped  = False
+    from_box = True
+
+    def box_value(self, bbox):
+        return (bbox.Min.X, bbox.Min.Y, bbox.Min.Z, bbox.Max.X, bbox.Max.Y, bbox.Max.Z)
+
+
+class SpatialBuckets(Index):
+    """Part id -> (i, j) plan cell of BUCKET_SIZE holding its bounding box center, and cell -> ids."""
+    name     = "buckets"
+    from_box = True
+
+    @staticmethod
+    def cell(x, y):
+        return int(math.floor(x / BUCKET_SIZE)), int(math.floor(y / BUCKET_SIZE))
+
+    def box_value(self, bbox):
+        return self.cell((bbox.Min.X + bbox.Max.X) / 2.0, (bbox.Min.Y + bbox.Max.Y) / 2.0)
+
+    def ids_near(self, x, y, distance):
+        """Ids in the cells within distance (ft) of (x, y)."""
+        reach = int(math.ceil(distance / BUCKET_SIZE))
+        ci, cj = self.cell(x, y)
+        found = []
+        for i in range(ci - reach, ci + reach + 1):
+            for j in range(cj - reach, cj + reach + 1):
+                found.extend(self.groups.get((i, j), ()))
+        return found
+
+
+class DocumentCache(object):
+    """The indexes of one document, least recently used first, and the changes not yet applied."""
+
+    def __init__(self):
+        self.indexes = OrderedDict()
+        self.changed = set()
+        self.deleted = set()
+        self.warmup  = None         # WarmupJob still building indexes, if any
+        self.generation = 0         # bumped by every queued change
+        self.saved = None           # generation the sidecar file was last written or loaded at
+
+    @property
+    def records(self):
+        return sum(len(index) for index in self.indexes.values())
+
+    def invalidate(self, changed, deleted):
+        self.generation += 1
+        self.changed.update(changed)
+        self.deleted.update(deleted)
+        self.changed.difference_update(self.deleted)
+
+    def get(self, doc, index_class):
+        self.apply_changes(doc)
+        name = index_class.name
+        if name not in self.indexes and self.warmup is not None and name in self.warmup.pending:
+            self.warmup.complete(name)
+        if name in self.indexes:
+            return _touch(self.indexes, name)
+        return self.install(name, index_class().build(doc))
+
+    def apply_changes(self, doc):
+        """Patches every index, finished or still warming, with the queued changes."""
+        if not (self.changed or self.deleted):
+            return
+        indexes = list(self.indexes.values())
+        if self.warmup is not None:
+            indexes += list(self.warmup.pending.values())
+        patch_indexes(doc, indexes, self.changed, self.deleted)
+        self.changed, self.deleted = set(), set()
+
+    def install(self, name, index):
+        self.indexes[name] = index
+        self._evict(max_records(), keep=name)
+        return index
+
+    def _evict(self, limit, keep):
+        for name in list(self.indexes):
+            if self.records <= limit:
+                break
+            if name != keep:
+                del self.indexes[name]
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""Small FabricationPart readers shared across the Modeling panel tools."""
+#IMPORTS
+#==================================================
+import re
+
+from Autodesk.Revit.DB import (FilteredElementCollector, BuiltInCategory, FabricationPart,
+                               FabricationConfiguration, LocationCurve, LocationPoint, Line,
+                               ElementFilter, BoundingBoxIntersectsFilter, LogicalOrFilter,
+                               Outline, XYZ)
+from System.Collections.Generic import List
+
+#VARIABLES
+#==================================================
+_SIZE_JUNK      = re.compile(r"[^0-9/\-. ]")
+_SIZE_SEPARATOR = re.compile(r"[xX]")        # reducers and tees: '4"x2"'
+
+#FUNCTIONS
+#==================================================
+def parse_size_to_inches(size_str):
+    """
+    Parse size string to inches.
+
+    Args:
+        size_str (str): Size string to parse, e.g. '1 1/2"', '3/4"ø', '4-2"' or '4"x2"'
+
+    Returns:
+        float: Size in inches; the first size of a reducer or tee
+    """
+    # Only the first of 'x'-separated sizes counts
+    size_str = _SIZE_SEPARATOR.split(size_str or '')[0]
+    # Drop quotes, diameter marks and anything else that is not part of a number
+    size_str = _SIZE_JUNK.sub('', size_str).strip()
+
+    if not size_str:
+        return 0.0
+
+    # Check if there's a dash in the size_str
+    if '-' in size_str:
+        # If there's a dash, only parse the first token
+        parts = size_str.split()
+        if not parts:
+            return 0.0
+        first_token = parts[0]
+
+        # If the first token contains a dash, split and take the first part
+        if '-' in first_token:
+            first_token = first_token.split('-')[0]
+
+        # Parse the cleaned first_token
+        if '/' in first_token:
+            num, den = first_token.split('/')
+            return float(num) / float(den)
+        else:
+            return float(first_token)
+    else:
+        # No dash: parse the entire size_str
+        # Combine all tokens to get a total in inches
+        parts = size_str.split()
+        total = 0.0
+        for p in parts:
+            if '/' in p:
+                num, den = p.split('/')
+                total += float(num) / float(den)
+            else:
+                total += float(p)
+        return total
+
+
+def collect_parts(doc, category, view_id=None):
+    """FabricationParts of one BuiltInCategory in the model, or visible in view_id."""
+    if view_id is None:
+        collector = FilteredElementCollector(doc)
+    else:
+        collector = FilteredElementCollector(doc, view_id)
+    return [p for p in collector.OfCategory(category).WhereElementIsNotElementType()
+            if isinstance(p, FabricationPart)]
+
+
+def collect_parts_near(doc, category, parts, margin=0.0):
+    """FabricationParts of one BuiltInCategory whose bounding box touches one of parts.
+
+    Each part's box is grown by margin (ft) in every direction. The cost
+    follows the number of parts given, not the size of the model.
+    """
+    filters = List[ElementFilter]()
+    grow = XYZ(margin, margin, margin)
+    for part in parts:
+        bbox = part.get_BoundingBox(None)
+        if bbox is not None:
+            filters.Add(BoundingBoxIntersectsFilter(Outline(bbox.Min - grow, bbox.Max + grow)))
+    if filters.Count == 0:
+        return []
+
+    area = filters[0] if filters.Count == 1 else LogicalOrFilter(filters)
+    collector = FilteredElementCollector(doc).OfCategory(category).WhereElementIsNotElementType()
+    return [p for p in collector.WherePasses(area) if isinstance(p, FabricationPart)]
+
+
+def insulated_half_od(part):
+    """Half the outside diameter plus the insulation thickness, in feet."""
+    od_param = part.LookupParameter("Outside Diameter")
+    od_value = od_param.AsDouble() if od_param else 0.0
+    return od_value / 2.0 + part.InsulationThickness
+
+
+def get_line(element):
+    """The element's location Line, or None for points, arcs and missing locations."""
+    loc = element.Location
+    if isinstance(loc, LocationCurve) and isinstance(loc.Curve, Line):
+        return loc.Curve
+    return None
+
+
+def get_point(element):
+    """A representative point: location point, curve midpoint or bounding box center."""
+    loc = element.Location
+    if isinstance(loc, LocationPoint):
+        return loc.Point
+    if isinstance(loc, LocationCurve):
+        return loc.Curve.Evaluate(0.5, True)
+    bbox = element.get_BoundingBox(None)
+    if bbox is not None:
+        return (bbox.Min + bbox.Max) / 2.0
+    return None
+
+#CLASSES
+#==================================================
+class MaterialNames(object):
+    """Fabrication material id -> name, asking the configuration once per id."""
+
+    def __init__(self, doc):
+        self.config = FabricationConfiguration.GetFabricationConfiguration(doc)
+        self.names  = {}
+
+    def get(self, part):
+        material_id = part.Material
+        name = self.names.get(material_id)
+        if name is None:
+            name = self.config.GetMaterialName(material_id) if self.config else ""
+            self.names[material_id] = name
+        return name
+
+
+class HalfOdProvider(object):
+    """Insulated half OD per (material, size, insulation specification).
+
+    Parts that share material, size and insulation share one value, so the
+    model is only read for the first part of each combination; gap solving
+    over a large rack is almost all hits.
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.hits   = 0
+        self.misses = 0
+
+    def get(self, part):
+        key = (part.Material, part.Size, part.InsulationSpecification)
+        value = self.values.get(key)
+        if value is None:
+            value = insulated_half_od(part)
+            self.values[key] = value
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def summary(self):
+        return "Half OD lookups: {0} ({1} read from the model)".format(self.hits + self.misses, self.misses)
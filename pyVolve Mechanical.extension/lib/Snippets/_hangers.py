@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+"""Fabrication hanger collection and host auditing."""
+#IMPORTS
+#==================================================
+import time
+
+from Autodesk.Revit.DB import (FilteredElementCollector, BuiltInCategory, FabricationPart,
+                               StorageType, Transaction, WorksharingUtils, CheckoutStatus,
+                               RevitLinkInstance, XYZ)
+
+from Snippets._spatial import BoxColumnIndex
+
+#VARIABLES
+#==================================================
+FLAG_PARAM        = "Comments"
+FLAG_NOT_HOSTED   = "Not Hosted"
+FLAG_HOST_MISSING = "Host Missing"
+
+SCOPE_VIEW  = "Active View"
+SCOPE_MODEL = "Entire Model"
+
+# Categories a hanger rod can be attached to
+STRUCTURE_CATEGORIES = (BuiltInCategory.OST_StructuralFraming, BuiltInCategory.OST_Floors)
+
+#FUNCTIONS
+#==================================================
+def collect_hangers(doc, view_id=None):
+    """Returns every fabrication hanger in the model, or only those visible in view_id."""
+    if view_id is None:
+        collector = FilteredElementCollector(doc)
+    else:
+        collector = FilteredElementCollector(doc, view_id)
+    return [h for h in collector.OfCategory(BuiltInCategory.OST_FabricationHangers)
+                                .WhereElementIsNotElementType()
+            if isinstance(h, FabricationPart)]
+
+
+def is_hanger(element):
+    """True for the parts collect_hangers() returns: fabrication parts that are hangers."""
+    return isinstance(element, FabricationPart) and element.IsAHanger()
+
+
+def get_hangers(doc, selection, prompt, telemetry):
+    """Hangers a tool works on: the selected ones, or every hanger in a scope the user picks.
+
+    selection is the selected element ids. Selected elements that are not
+    hangers (pipes, ducts, fittings...) are left out and returned as
+    skipped ids. With nothing selected the user picks Active View or Entire
+    Model, asked with prompt. Reading the hangers is timed as the "read"
+    phase of telemetry.
+    Returns (hangers, skipped ids); hangers is None when the user cancels.
+    """
+    if selection:
+        telemetry.phase("read")
+        hangers, skipped = [], []
+        for element_id in selection:
+            element = doc.GetElement(element_id)
+            if is_hanger(element):
+                hangers.append(element)
+            else:
+                skipped.append(element_id)
+        return hangers, skipped
+
+    from pyrevit import forms
+    scope = forms.CommandSwitchWindow.show([SCOPE_VIEW, SCOPE_MODEL], message=prompt)
+    if scope not in (SCOPE_VIEW, SCOPE_MODEL):
+        return None, []
+    # The collector pass grows with the model, so it is timed as "read"
+    telemetry.phase("read")
+    if scope == SCOPE_VIEW:
+        return collect_hangers(doc, doc.ActiveView.Id), []
+    return collect_hangers(doc), []
+
+
+def map_hangers_to_hosts(hangers):
+    """host id (int) -> list of hangers, built in one pass over GetHostedInfo()."""
+    by_host = {}
+    for hanger in hangers:
+        info = hanger.GetHostedInfo()
+        if info is None:
+            continue
+        host = info.HostId.IntegerValue
+        if host != -1:
+            by_host.setdefault(host, []).append(hanger)
+    return by_host
+
+
+def audit_hosts(doc, hangers):
+    """Sorts hangers by host state in a single pass over GetHostedInfo()."""
+    audit = HangerAudit()
+    for hanger in hangers:
+        try:
+            hosted_info = hanger.GetHostedInfo()
+        except Exception as e:
+            audit.errors.append((hanger, str(e)))
+            continue
+
+        host_id = hosted_info.HostId if hosted_info else None
+        if host_id is None or host_id.IntegerValue == -1:
+            audit.unhosted.append(hanger)
+        elif doc.GetElement(host_id) is None:
+            audit.host_missing.append(hanger)
+        else:
+            audit.hosted.append(hanger)
+    return audit
+
+
+def sync_comment_flags(doc, audit):
+    """Writes host flags into Comments, touching only hangers whose flag is out of date.
+
+    Problem hangers get FLAG_NOT_HOSTED / FLAG_HOST_MISSING, hosted hangers that
+    still carry one of those flags are cleared. Hangers owned by another user
+    are left alone. Returns (flagged, cleared, not_owned) counts; no
+    transaction is opened when nothing needs to change.
+    """
+    flags = (FLAG_NOT_HOSTED, FLAG_HOST_MISSING)
+    wanted = [(h, FLAG_NOT_HOSTED) for h in audit.unhosted]
+    wanted += [(h, FLAG_HOST_MISSING) for h in audit.host_missing]
+    wanted += [(h, "") for h in audit.hosted]
+
+    changes = []
+    for hanger, flag in wanted:
+        param = hanger.LookupParameter(FLAG_PARAM)
+        if not param or param.StorageType != StorageType.String or param.IsReadOnly:
+            continue
+        current = param.AsString() or ""
+        if current == flag or (not flag and current not in flags):
+            continue
+        changes.append((hanger, param, flag))
+
+    flagged = cleared = not_owned = 0
+    if not changes:
+        return flagged, cleared, not_owned
+
+    with Transaction(doc, "Update Hanger Host Flags") as t:
+        t.Start()
+        for hanger, param, flag in changes:
+            if doc.IsWorkshared and WorksharingUtils.GetCheckoutStatus(doc, hanger.Id) == CheckoutStatus.OwnedByOtherUser:
+                not_owned += 1
+                continue
+            param.Set(flag)
+            if flag:
+                flagged += 1
+            else:
+                cleared += 1
+        t.Commit()
+    return flagged, cleared, not_owned
+
+def _transformed_box(bbox, transform):
+    """Axis-aligned (min, max) tuples of bbox after applying transform (None for identity)."""
+    if transform is None:
+        return (bbox.Min.X, bbox.Min.Y, bbox.Min.Z), (bbox.Max.X, bbox.Max.Y, bbox.Max.Z)
+    corners = [transform.OfPoint(XYZ(x, y, z))
+               for x in (bbox.Min.X, bbox.Max.X)
+               for y in (bbox.Min.Y, bbox.Max.Y)
+               for z in (bbox.Min.Z, bbox.Max.Z)]
+    return (min(p.X for p in corners), min(p.Y for p in corners), min(p.Z for p in corners)), \
+           (max(p.X for p in corners), max(p.Y for p in corners), max(p.Z for p in corners))
+
+
+def _structure_boxes(doc, transform=None, link_id=None):
+    """(key, box min, box max) per structural element; key = (link instance id or None, element id)."""
+    for category in STRUCTURE_CATEGORIES:
+        collector = FilteredElementCollector(doc).OfCategory(category).WhereElementIsNotElementType()
+        for element in collector:
+            bbox = element.get_BoundingBox(None)
+            if bbox is None:
+                continue
+            box_min, box_max = _transformed_box(bbox, transform)
+            yield ((link_id, element.Id.IntegerValue), box_min, box_max)
+
+
+def build_structure_index(doc, include_links=True):
+    """Indexes the underside of structural framing and floors once per run.
+
+    Bounding boxes stand in for the bottom faces: exact for flat slabs and
+    orthogonal beams, slightly conservative for skewed or sloped members.
+    Linked models are included so hangers under linked structure are found;
+    keys are (link instance id, element id), with None for the host model,
+    since ids repeat across models.
+    Returns (index, build_seconds).
+    """
+    start = time.time()
+    boxes = list(_structure_boxes(doc))
+    if include_links:
+        for link in FilteredElementCollector(doc).OfClass(RevitLinkInstance):
+            link_doc = link.GetLinkDocument()
+            if link_doc is not None:
+                boxes.extend(_structure_boxes(link_doc, link.GetTotalTransform(), link.Id.IntegerValue))
+    index = BoxColumnIndex(boxes)
+    return index, time.time() - start
+
+
+def rehost_hangers(doc, hangers, index):
+    """Re-attaches unhosted hangers to the structure found above their rods.
+
+    Every rod top is looked up in index first (no model access), then all
+    changes are made in a single transaction: rods are attached to structure
+    where Revit allows it, otherwise extended up to the underside found.
+    Rods whose top is already inside a structure box (a sloped deck, a deep
+    beam) are left at their length.
+    """
+    report = RehostReport(len(index))
+    plans = []
+
+    start = time.time()
+    tested_before = index.candidates_tested
+    for hanger in hangers:
+        rod_info = hanger.GetRodInfo()
+        if rod_info is None or rod_info.RodCount == 0:
+            report.no_rods.append(hanger)
+            continue
+        rods = []
+        for rod_index in range(rod_info.RodCount):
+            top = rod_info.GetRodEndPosition(rod_index)
+            report.queries += 1
+            _, bottom_z = index.first_above((top.X, top.Y, top.Z))
+            if bottom_z is not None:
+                rods.append((rod_index, bottom_z - top.Z))
+        if rods:
+            plans.append((hanger, rod_info, rods))
+        else:
+            report.no_structure.append(hanger)
+    report.query_seconds = time.time() - start
+    report.candidates_tested = index.candidates_tested - tested_before
+
+    if not plans:
+        return report
+
+    with Transaction(doc, "Rehost Hangers") as t:
+        t.Start()
+        for hanger, rod_info, rods in plans:
+            try:
+                if rod_info.CanRodsBeHosted:
+                    rod_info.AttachToStructure()
+                if rod_info.IsAttachedToStructure:
+                    report.attached.append(hanger)
+                    continue
+                for rod_index, gap in rods:
+                    if gap > 0.0:
+                        rod_info.SetRodLength(rod_index, rod_info.GetRodLength(rod_index) + gap)
+                report.extended.append(hanger)
+            except Exception as e:
+                report.failed.append((hanger, str(e)))
+        t.Commit()
+    return report
+
+#CLASSES
+#==================================================
+class HangerAudit(object):
+    """Result of audit_hosts(): hangers split into hosted, unhosted and host-missing."""
+
+    def __init__(self):
+        self.hosted       = []
+        self.unhosted     = []      # HostId == -1
+        self.host_missing = []      # HostId points at an element that no longer exists
+        self.errors       = []      # (hanger, message) for hangers that could not be read
+
+    @property
+    def total(self):
+        return len(self.hosted) + len(self.unhosted) + len(self.host_missing) + len(self.errors)
+
+    @property
+    def problems(self):
+        return self.unhosted + self.host_missing
+
+    def summary(self):
+        return (
+            "Number of Hangers checked: {0}\n"
+            "Hosted: {1}\n"
+            "Not hosted (HostId = -1): {2}\n"
+            "Host missing: {3}\n"
+            "Unreadable: {4}"
+        ).format(self.total, len(self.hosted), len(self.unhosted),
+                 len(self.host_missing), len(self.errors))
+
+
+class RehostReport(object):
+    """Outcome and cost figures of rehost_hangers()."""
+
+    def __init__(self, structure_count):
+        self.structure_count   = structure_count
+        self.build_seconds     = 0.0
+        self.query_seconds     = 0.0
+        self.queries           = 0
+        self.candidates_tested = 0
+        self.attached     = []      # now hosted by structure
+        self.extended     = []      # could not be hosted, rods lengthened to structure
+        self.no_structure = []      # nothing found above any rod
+        self.no_rods      = []
+        self.failed       = []      # (hanger, message)
+
+    def summary(self):
+        per_query = float(self.candidates_tested) / self.queries if self.queries else 0.0
+        return (
+            "Attached to structure: {0}\n"
+            "Rods extended to structure: {1}\n"
+            "No structure above: {2}\n"
+            "No rods: {3}\n"
+            "Failed: {4}\n\n"
+            "Structure index: {5} elements built in {6:.3f} s\n"
+            "Rod queries: {7} in {8:.3f} s ({9:.1f} candidates tested per query)"
+        ).format(len(self.attached), len(self.extended), len(self.no_structure),
+                 len(self.no_rods), len(self.failed), self.structure_count,
+                 self.build_seconds, self.queries, self.query_seconds, per_query)
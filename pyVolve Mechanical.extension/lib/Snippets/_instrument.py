@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""Opt-in API call counting for a tool run.
+
+    instrument = Instrument.from_settings()
+    part = instrument.wrap(doc.GetElement(element_id))
+    ...
+    if instrument.enabled:
+        print(instrument.report("Align by BOI"))
+
+Wrapped documents, elements, parameters and locations forward everything to
+the real object. LookupParameter, get_Parameter, GetElement, Location, Move,
+Parameter.Set and property sets are counted and timed, and what they return
+is wrapped in turn. Wrapped objects pass isinstance() checks for the real
+type, but Revit API constructors (FilteredElementCollector, Transaction, ...)
+need the real object: hand lib functions the real document, see unwrap().
+When the switch is off, wrap() returns its argument and nothing is counted.
+"""
+#IMPORTS
+#==================================================
+import time
+from collections import Counter
+
+from Snippets._settings import INSTRUMENT, is_enabled
+
+#VARIABLES
+#==================================================
+COUNTED_METHODS    = ("LookupParameter", "get_Parameter", "GetElement", "Move", "Set")
+COUNTED_PROPERTIES = ("Location",)
+
+# Results of these are wrapped too, so calls on them are counted
+WRAPPED_RESULTS = ("LookupParameter", "get_Parameter", "GetElement", "Location")
+
+clock = getattr(time, "perf_counter", None) or time.clock
+
+#FUNCTIONS
+#==================================================
+def unwrap(obj):
+    """The real object behind a wrapped one (anything else is returned as is)."""
+    if isinstance(obj, _Proxy):
+        return object.__getattribute__(obj, "_target")
+    return obj
+
+#CLASSES
+#==================================================
+class CallStats(object):
+    """Call counts and cumulative seconds per '<Type>.<member>'."""
+
+    def __init__(self):
+        self.counts  = Counter()
+        self.seconds = Counter()
+
+    def record(self, name, seconds):
+        self.counts[name]  += 1
+        self.seconds[name] += seconds
+
+    @property
+    def total_calls(self):
+        return sum(self.counts.values())
+
+    @property
+    def total_seconds(self):
+        return sum(self.seconds.values())
+
+    def histogram(self, width=30):
+        """One line per call, slowest first, with a bar scaled to the slowest."""
+        if not self.counts:
+            return "No API calls recorded."
+        rows = sorted(self.counts, key=lambda n: self.seconds[n], reverse=True)
+        longest = max(self.seconds.values()) or 1.0
+        lines = ["{0:<48} {1:>8} {2:>10}".format("Call", "Count", "ms")]
+        for name in rows:
+            bar = "#" * int(round(width * self.seconds[name] / longest))
+            lines.append("{0:<48} {1:>8} {2:>10.1f} {3}".format(
+                name, self.counts[name], self.seconds[name] * 1000.0, bar))
+        lines.append("{0:<48} {1:>8} {2:>10.1f}".format(
+            "Total", self.total_calls, self.total_seconds * 1000.0))
+        return "\n".join(lines)
+
+
+class _Proxy(object):
+    """Forwards to the wrapped object, counting the members in COUNTED_*."""
+    __slots__ = ("_target", "_stats")
+
+    def __init__(self, target, stats):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_stats", stats)
+
+    @property
+    def __class__(self):
+        return type(object.__getattribute__(self, "_target"))
+
+    def _name(self, member):
+        return "{0}.{1}".format(type(object.__getattribute__(self, "_target")).__name__, member)
+
+    def _wrap(self, value):
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        return _Proxy(value, object.__getattribute__(self, "_stats"))
+
+    def __getattr__(self, member):
+        target = object.__getattribute__(self, "_target")
+        stats  = object.__getattribute__(self, "_stats")
+        if member in COUNTED_PROPERTIES:
+            start = clock()
+            value = getattr(target, member)
+            stats.record(self._name(member), clock() - start)
+            return self._wrap(value) if member in WRAPPED_RESULTS else value
+
+        value = getattr(target, member)
+        if member not in COUNTED_METHODS or not callable(value):
+            return value
+
+        name = self._name(member)
+        wrap_result = member in WRAPPED_RESULTS
+
+        def counted(*args):
+            args = [unwrap(a) for a in args]
+            start = clock()
+            try:
+                result = value(*args)
+            finally:
+                stats.record(name, clock() - start)
+            return self._wrap(result) if wrap_result else result
+        return counted
+
+    def __setattr__(self, member, value):
+        target = object.__getattribute__(self, "_target")
+        start = clock()
+        try:
+            setattr(target, member, unwrap(value))
+        finally:
+            object.__getattribute__(self, "_stats").record(self._name(member) + " (set)", clock() - start)
+
+    def __eq__(self, other):
+        return object.__getattribute__(self, "_target") == unwrap(other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(object.__getattribute__(self, "_target"))
+
+    def __repr__(self):
+        return "<counted {0!r}>".format(object.__getattribute__(self, "_target"))
+
+
+class Instrument(object):
+    """Wraps objects handed to tool logic and reports what was called on them."""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.stats   = CallStats()
+        self.started = clock()
+
+    @classmethod
+    def from_settings(cls):
+        """On when the INSTRUMENT setting is on (see _settings)."""
+        return cls(is_enabled(INSTRUMENT))
+
+    def wrap(self, obj):
+        if not self.enabled or obj is None:
+            return obj
+        return _Proxy(obj, self.stats)
+
+    def wrap_all(self, objects):
+        return [self.wrap(o) for o in objects]
+
+    def report(self, title="Tool"):
+        """Histogram of the counted calls and their share of the run so far."""
+        elapsed = clock() - self.started
+        share = self.stats.total_seconds / elapsed if elapsed > 0 else 0.0
+        return "{0}: {1} API calls, {2:.1f} ms of {3:.1f} ms ({4:.0%})\n{5}".format(
+            title, self.stats.total_calls, self.stats.total_seconds * 1000.0,
+            elapsed * 1000.0, share, self.stats.histogram())
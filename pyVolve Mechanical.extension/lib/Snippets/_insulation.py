@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""Insulation specs by service and size, and re-spreading racks after they change."""
+#IMPORTS
+#==================================================
+import csv
+
+from Autodesk.Revit.DB import ElementId, LocationCurve
+
+from Snippets._fabparts import parse_size_to_inches, HalfOdProvider
+from Snippets._parttable import PartTable
+from Snippets._racks import RackIndex, collect_rack_candidates
+
+#FUNCTIONS
+#==================================================
+def load_insulation_specs(csv_path):
+    """Rows of InsulationSpecs.csv (Service, Min OD, Max OD, Insulation Specification).
+
+    Empty Min OD / Max OD mean no lower / upper bound.
+    """
+    specs = []
+    with open(csv_path, 'r') as f:
+        for row in csv.DictReader(f):
+            min_od = float(row['Min OD']) if row['Min OD'].strip() else 0.0
+            max_od = float(row['Max OD']) if row['Max OD'].strip() else float('inf')
+            specs.append({
+                'Service': row['Service'].strip(),
+                'Min_OD': min_od,
+                'Max_OD': max_od,
+                'Insulation_Specification': int(row['Insulation Specification'])
+            })
+    return specs
+
+
+def find_insulation_spec(specs, service, size_inches):
+    """Insulation specification for a service and size, 0 (none) if no row matches."""
+    for spec in specs:
+        if spec['Service'] == service and spec['Min_OD'] <= size_inches <= spec['Max_OD']:
+            return spec['Insulation_Specification']
+    return 0
+
+#CLASSES
+#==================================================
+class InsulationChange(object):
+    """Insulation placed on a set of parts, and the rack shifts it calls for.
+
+    Create it before anything changes: it indexes the racks around the parts
+    and records their insulated half ODs. Then, inside the caller's
+    transactions: apply(), shifts(), respread().
+    """
+
+    def __init__(self, doc, parts):
+        self.doc = doc
+        self.parts = list(parts)
+        self.rack_index = RackIndex(PartTable.from_parts(collect_rack_candidates(doc, self.parts)))
+        # Keyed by insulation specification, so values read after the change are fresh
+        self.half_ods = HalfOdProvider()
+        self.old_half_ods = dict((part.Id.IntegerValue, self.half_ods.get(part)) for part in self.parts)
+        self.changed = {}
+        self.racks = []
+
+    def apply(self, specs, service):
+        """Sets each part's insulation specification. Returns the ids that failed."""
+        failed = []
+        for part in self.parts:
+            try:
+                part.InsulationSpecification = find_insulation_spec(
+                    specs, service, parse_size_to_inches(part.Size))
+            except Exception:
+                failed.append(part.Id)
+        return failed
+
+    def shifts(self):
+        """[(rack, part_id, shift)] restoring the gaps in racks whose sizes changed."""
+        self.changed = {}
+        for part in self.parts:
+            half_od = self.half_ods.get(part)
+            if abs(half_od - self.old_half_ods[part.Id.IntegerValue]) > 1e-9:
+                self.changed[part.Id.IntegerValue] = half_od
+
+        self.racks = self.rack_index.racks_for(self.changed.keys())
+        return [(rack, part_id, shift)
+                for rack in self.racks for part_id, shift in rack.resolve(self.changed)]
+
+    def respread(self, shifts):
+        """Moves the parts by their shifts. Returns the number moved."""
+        moved = 0
+        for rack, part_id, shift in shifts:
+            part = self.doc.GetElement(ElementId(part_id))
+            if part is not None and isinstance(part.Location, LocationCurve):
+                part.Location.Move(rack.translation(shift))
+                moved += 1
+        return moved
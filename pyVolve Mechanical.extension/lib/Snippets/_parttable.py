@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""Columnar snapshot of the FabricationPart properties the Modeling tools read."""
+#IMPORTS
+#==================================================
+from array import array
+
+from Autodesk.Revit.DB import (FilteredElementCollector, FabricationPart, BuiltInParameter,
+                               LocationCurve, Line)
+
+#VARIABLES
+#==================================================
+NAN = float('nan')
+
+#CLASSES
+#==================================================
+class StringPool(object):
+    """Interns repeated strings (sizes, service names) as small int codes."""
+
+    def __init__(self):
+        self.values = []
+        self.codes  = {}
+
+    def code(self, value):
+        value = value or ""
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self.codes[value] = code
+        return code
+
+    def __getitem__(self, code):
+        return self.values[code]
+
+    def __len__(self):
+        return len(self.values)
+
+
+class PartTable(object):
+    """One row per part, one typed array per property.
+
+    Filled in a single pass over the parts: location line end points, size,
+    outside diameter, insulation thickness and specification, service name
+    and bottom elevation. Ids are stored as ints and strings as StringPool
+    codes, so the table holds no Element references and costs a fixed number
+    of bytes per part (see nbytes()). Missing lengths are NaN.
+    """
+
+    def __init__(self):
+        self.ids = array('l')
+        self.x0 = array('d')
+        self.y0 = array('d')
+        self.z0 = array('d')
+        self.x1 = array('d')
+        self.y1 = array('d')
+        self.z1 = array('d')
+        self.outside_diameter     = array('d')
+        self.insulation_thickness = array('d')
+        self.bottom_elevation     = array('d')
+        self.insulation_spec = array('l')
+        self.size_code       = array('l')
+        self.service_code    = array('l')
+        self.sizes    = StringPool()
+        self.services = StringPool()
+        self._rows = None
+
+    @classmethod
+    def from_parts(cls, parts):
+        table = cls()
+        for part in parts:
+            table.append(part)
+        return table
+
+    @classmethod
+    def collect(cls, doc, category, view_id=None):
+        """Table of every part of category in the model, or visible in view_id.
+
+        Parts are appended straight from the collector, so no element list is kept.
+        """
+        if view_id is None:
+            collector = FilteredElementCollector(doc)
+        else:
+            collector = FilteredElementCollector(doc, view_id)
+        table = cls()
+        for part in collector.OfCategory(category).WhereElementIsNotElementType():
+            if isinstance(part, FabricationPart):
+                table.append(part)
+        return table
+
+    def append(self, part):
+        self.ids.append(part.Id.IntegerValue)
+
+        loc = part.Location
+        curve = loc.Curve if isinstance(loc, LocationCurve) else None
+        if isinstance(curve, Line):
+            start = curve.GetEndPoint(0)
+            end   = curve.GetEndPoint(1)
+            points = (start.X, start.Y, start.Z, end.X, end.Y, end.Z)
+        else:
+            points = (NAN,) * 6
+        for column, value in zip((self.x0, self.y0, self.z0, self.x1, self.y1, self.z1), points):
+            column.append(value)
+
+        od_param = part.LookupParameter("Outside Diameter")
+        self.outside_diameter.append(od_param.AsDouble() if od_param else NAN)
+        self.insulation_thickness.append(part.InsulationThickness)
+        self.insulation_spec.append(part.InsulationSpecification)
+        bottom = part.get_Parameter(BuiltInParameter.FABRICATION_BOTTOM_OF_PART)
+        self.bottom_elevation.append(bottom.AsDouble() if bottom and bottom.HasValue else NAN)
+        self.size_code.append(self.sizes.code(part.Size))
+        self.service_code.append(self.services.code(part.ServiceName))
+        self._rows = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def row(self, part_id):
+        """Row of part_id (int), or None. The id -> row map is built on first use."""
+        if self._rows is None:
+            self._rows = dict((value, index) for index, value in enumerate(self.ids))
+        return self._rows.get(part_id)
+
+    def line(self, row):
+        """((x0, y0, z0), (x1, y1, z1)) of a straight part, or None."""
+        if self.x0[row] != self.x0[row]:    # NaN
+            return None
+        return (self.x0[row], self.y0[row], self.z0[row]), (self.x1[row], self.y1[row], self.z1[row])
+
+    def half_od(self, row):
+        """Half the outside diameter plus the insulation thickness, in feet."""
+        od = self.outside_diameter[row]
+        return (od / 2.0 if od == od else 0.0) + self.insulation_thickness[row]
+
+    def size(self, row):
+        return self.sizes[self.size_code[row]]
+
+    def service(self, row):
+        return self.services[self.service_code[row]]
+
+    def nbytes(self):
+        """Bytes held by the columns (string pools and the lazy row map excluded)."""
+        columns = (self.ids, self.x0, self.y0, self.z0, self.x1, self.y1, self.z1,
+                   self.outside_diameter, self.insulation_thickness, self.bottom_elevation,
+                   self.insulation_spec, self.size_code, self.service_code)
+        return sum(len(c) * c.itemsize for c in columns)
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""Runs a tool's main() under a deterministic profiler on request.
+
+    TELEMETRY = ToolRun(__title__, doc)
+
+    @profiled(TELEMETRY)
+    def main():
+        ...
+
+Profiling is requested by shift-clicking the button or by turning the
+'profile' setting on (see _settings). The stats are saved as
+<tool>-<date>-<time>.prof next to the telemetry log, where pstats, snakeviz
+or gprof2dot can open them, and the functions with the most cumulative time
+are printed in the output window. cProfile is used when the interpreter has
+it, the pure Python profile module otherwise. Profiled runs are marked in the
+telemetry log, so their overhead does not count towards p50/p95.
+"""
+#IMPORTS
+#==================================================
+import functools
+import os
+import re
+import time
+
+try:
+    import __builtin__ as builtins
+except ImportError:
+    import builtins
+
+from Snippets._settings import PROFILE, is_enabled
+from Snippets._telemetry import log_dir
+
+#VARIABLES
+#==================================================
+TOP = 25
+
+#FUNCTIONS
+#==================================================
+def profiling_requested(func):
+    """True when the 'profile' setting is on or func's button was shift-clicked."""
+    if is_enabled(PROFILE):
+        return True
+    # pyRevit sets __shiftclick__ in the script's scope or in builtins
+    scope = getattr(func, "__globals__", {})
+    return bool(scope.get("__shiftclick__", getattr(builtins, "__shiftclick__", False)))
+
+
+def new_profiler():
+    """A cProfile or profile Profile, or None when neither works here."""
+    try:
+        import cProfile
+        return cProfile.Profile()
+    except Exception:
+        pass
+    try:
+        import profile
+        return profile.Profile()
+    except Exception:
+        return None
+
+
+def stats_path(tool, directory=None):
+    name = re.sub(r"[^A-Za-z0-9]+", "_", tool).strip("_") or "tool"
+    return os.path.join(directory or log_dir(), "{0}-{1}.prof".format(name, time.strftime("%Y%m%d-%H%M%S")))
+
+
+def save_stats(profiler, tool, directory=None):
+    """Writes the profiler's stats for tool. Returns the file path."""
+    path = stats_path(tool, directory)
+    folder = os.path.dirname(path)
+    if not os.path.isdir(folder):
+        os.makedirs(folder)
+    profiler.dump_stats(path)
+    return path
+
+
+def _label(key):
+    filename, line, function = key
+    if filename == "~":                 # built-in, function reads "<built-in method ...>"
+        return function
+    return "{0} ({1}:{2})".format(function, os.path.basename(filename), line)
+
+
+def top_functions(profiler, limit=TOP):
+    """[(function, calls, own seconds, cumulative seconds)], most cumulative time first."""
+    import pstats
+    stats = pstats.Stats(profiler).stats
+    rows = [(_label(key), calls, own, cumulative)
+            for key, (_, calls, own, cumulative, _) in stats.items()]
+    rows.sort(key=lambda r: r[3], reverse=True)
+    return rows[:limit]
+
+
+def print_report(tool, rows, path):
+    """Prints the top functions as a table in the pyRevit output window (plain text elsewhere)."""
+    title = "{0} - top {1} functions by cumulative time".format(tool, len(rows))
+    table = [[name, calls, "{0:.4f}".format(own), "{0:.4f}".format(cumulative)]
+             for name, calls, own, cumulative in rows]
+    columns = ["Function", "Calls", "Own (s)", "Cumulative (s)"]
+    try:
+        from pyrevit import script
+        script.get_output().print_table(table, columns=columns, title=title)
+    except Exception:       # outside pyRevit
+        print(title)
+        for row in [columns] + table:
+            print("{0:<70} {1:>8} {2:>10} {3:>14}".format(*row))
+    print("Profile saved to {0}".format(path))
+
+
+def profiled(run):
+    """Decorator running main() under the profiler when requested. run is the tool's ToolRun."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiling_requested(func):
+                return func(*args, **kwargs)
+            profiler = new_profiler()
+            if profiler is None:
+                print("No profiler is available in this interpreter; running without it.")
+                return func(*args, **kwargs)
+
+            run.profiled = True
+            try:
+                return profiler.runcall(func, *args, **kwargs)
+            finally:
+                # A failure here must not hide the tool's own exception
+                try:
+                    print_report(run.tool, top_functions(profiler), save_stats(profiler, run.tool))
+                except Exception as e:
+                    print("Could not save the profile: {0}".format(e))
+        return wrapper
+    return decorate
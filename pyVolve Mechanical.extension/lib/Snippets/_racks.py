@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""Pipe rack membership and gap re-solving for the spread and insulation tools."""
+#IMPORTS
+#==================================================
+import math
+from collections import namedtuple
+
+from Autodesk.Revit.DB import BuiltInCategory, XYZ
+
+from Snippets._fabparts import collect_parts_near
+from Snippets._spatial import canonical_direction
+
+#VARIABLES
+#==================================================
+RACK_MAX_GAP        = 1.0     # ft - parallel pipes closer than this (insulation to insulation) share a rack
+RACK_TIER_TOLERANCE = 0.25    # ft - bottom of insulation difference allowed within one rack tier
+RACK_REACH          = 10.0    # ft - how far around the changed parts neighbours are looked for
+SHIFT_TOLERANCE     = 1.0 / 192.0   # 1/16" - smaller shifts are not worth moving a pipe for
+
+RackMember = namedtuple("RackMember", "part_id offset half_od")
+
+#FUNCTIONS
+#==================================================
+def collect_rack_candidates(doc, parts, reach=RACK_REACH):
+    """Fabrication pipework within reach of parts; the pool a RackIndex's PartTable is built from."""
+    return collect_parts_near(doc, BuiltInCategory.OST_FabricationPipework, parts, reach)
+
+
+def _plan_direction(start, end):
+    """Unit plan direction of a level line with one sense per axis, or None if sloped/vertical."""
+    dx, dy = end[0] - start[0], end[1] - start[1]
+    length = math.sqrt(dx * dx + dy * dy)
+    if length < 1e-6 or abs(end[2] - start[2]) > RACK_TIER_TOLERANCE:
+        return None
+    return canonical_direction((dx / length, dy / length))
+
+#CLASSES
+#==================================================
+class _DisjointSet(object):
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a, b):
+        self.parent[self.find(a)] = self.find(b)
+
+
+class Rack(object):
+    """Parallel pipes side by side, sorted across the rack by their plan offset."""
+
+    def __init__(self, direction, members):
+        self.direction = direction                    # (dx, dy) along the pipes
+        self.normal    = (-direction[1], direction[0]) # across the rack
+        self.members   = sorted(members, key=lambda m: m.offset)
+
+    @property
+    def ids(self):
+        return [m.part_id for m in self.members]
+
+    def gaps(self):
+        """Insulation-to-insulation gaps between neighbouring members, in feet."""
+        return [b.offset - a.offset - a.half_od - b.half_od
+                for a, b in zip(self.members, self.members[1:])]
+
+    def resolve(self, new_half_ods):
+        """Shifts that restore every gap after some members' insulated size changed.
+
+        new_half_ods: {part id (int): half OD} for the members that changed.
+        The first member stays put; each following member moves across the
+        rack just enough to keep the gap it had to its neighbour.
+        Returns a list of (part id, shift in ft) for members that need to move.
+        """
+        shifts = []
+        gaps = self.gaps()
+        first = self.members[0]
+        previous_offset = first.offset
+        previous_half = new_half_ods.get(first.part_id, first.half_od)
+        for member, gap in zip(self.members[1:], gaps):
+            half = new_half_ods.get(member.part_id, member.half_od)
+            offset = previous_offset + previous_half + gap + half
+            shift = offset - member.offset
+            if abs(shift) >= SHIFT_TOLERANCE:
+                shifts.append((member.part_id, shift))
+            previous_offset, previous_half = offset, half
+        return shifts
+
+    def translation(self, shift):
+        """XYZ that moves a member shift feet across the rack."""
+        return XYZ(self.normal[0] * shift, self.normal[1] * shift, 0.0)
+
+
+class RackIndex(object):
+    """Rack membership of a set of pipes: part id -> Rack.
+
+    Pipes join one rack when they run parallel in plan, overlap along their
+    length, sit on the same tier (bottom of insulation within
+    RACK_TIER_TOLERANCE) and are no more than RACK_MAX_GAP apart. Pairs are
+    only compared within that reach of each other after sorting across the
+    axis, so building the index is close to linear in the number of pipes.
+    Everything is read from a PartTable; the model is not touched.
+    """
+
+    def __init__(self, table):
+        self.racks = []
+        self.rack_of = {}
+
+        by_direction = {}
+        for row in range(len(table)):
+            line = table.line(row)
+            if line is None:
+                continue
+            direction = _plan_direction(*line)
+            if direction is None:
+                continue
+            key = (round(direction[0], 3), round(direction[1], 3))
+            by_direction.setdefault(key, (direction, []))[1].append((row, line))
+
+        for direction, members in by_direction.values():
+            self._group(direction, members, table)
+
+    def _group(self, direction, members, table):
+        normal = (-direction[1], direction[0])
+        rows = []
+        for row, (start, end) in members:
+            half = table.half_od(row)
+            a = start[0] * direction[0] + start[1] * direction[1]
+            b = end[0] * direction[0] + end[1] * direction[1]
+            rows.append((start[0] * normal[0] + start[1] * normal[1],
+                         min(a, b), max(a, b),
+                         (start[2] + end[2]) / 2.0 - half,
+                         half, table.ids[row]))
+        rows.sort(key=lambda r: r[0])
+
+        widest = max(r[4] for r in rows)
+        sets = _DisjointSet(len(rows))
+        for i, (offset, lo, hi, bottom, half, _) in enumerate(rows):
+            reach = offset + half + widest + RACK_MAX_GAP
+            for j in range(i + 1, len(rows)):
+                other_offset, other_lo, other_hi, other_bottom, other_half, _ = rows[j]
+                if other_offset > reach:
+                    break
+                if other_offset - offset - half - other_half > RACK_MAX_GAP:
+                    continue
+                if other_lo >= hi or lo >= other_hi:
+                    continue
+                if abs(other_bottom - bottom) > RACK_TIER_TOLERANCE:
+                    continue
+                sets.union(i, j)
+
+        groups = {}
+        for i, row in enumerate(rows):
+            groups.setdefault(sets.find(i), []).append(RackMember(row[5], row[0], row[4]))
+        for group in groups.values():
+            if len(group) < 2:
+                continue
+            rack = Rack(direction, group)
+            self.racks.append(rack)
+            for member_id in rack.ids:
+                self.rack_of[member_id] = rack
+
+    def racks_for(self, part_ids):
+        """Racks holding any of part_ids, each once, in the order first met."""
+        found = []
+        for part_id in part_ids:
+            rack = self.rack_of.get(part_id)
+            if rack is not None and rack not in found:
+                found.append(rack)
+        return found
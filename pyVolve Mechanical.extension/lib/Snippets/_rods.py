@@ -0,0 +1,463 @@
+# -*- coding: utf-8 -*-
+"""Hanger rod helpers shared by Adjust Rod Length and the rod tools."""
+#IMPORTS
+#==================================================
+import csv
+import math
+import re
+from collections import Counter, namedtuple
+
+from Autodesk.Revit.DB import (Transaction, FilteredElementCollector, View3D, XYZ, PlanarFace,
+                               ReferenceIntersector, ElementMulticategoryFilter,
+                               FindReferenceTarget, ElementId, BuiltInCategory,
+                               FabricationAncillaryType)
+from System.Collections.Generic import List
+
+from Snippets._hangers import STRUCTURE_CATEGORIES, build_structure_index, map_hangers_to_hosts
+from Snippets._fabparts import collect_parts_near
+
+#VARIABLES
+#==================================================
+LENGTH_TOLERANCE = 1.0 / 192.0     # 1/16" - rods closer than this to target are left alone
+CUT_ROUNDING     = 1.0 / 96.0      # 1/8" - cut list lengths are rounded up to this
+
+# One read of everything the rod tools need from a hanger
+RodSnapshot = namedtuple("RodSnapshot", "hanger_id type_name rod_diameter lengths attached")
+RodIssue    = namedtuple("RodIssue", "hanger_id type_name check detail")
+
+#FUNCTIONS
+#==================================================
+def get_rod_info(element):
+    """Returns the element's FabricationRodInfo, or None if it has no rods to adjust."""
+    if not hasattr(element, "GetRodInfo") or not element.IsAHanger():
+        return None
+    return element.GetRodInfo()
+
+
+def parse_distance(input_text):
+    """Converts a feet/inch string to decimal feet, or returns None if the format is invalid.
+
+    Accepted formats: 1'  |  1' 1"  |  0' 0-1/2"  |  1"  |  1-1/2"  |  1/2"
+    """
+    input_text = (input_text or "").strip()
+    # Regex for valid formats
+    pattern = (
+        r"^(?:(\d+' \d+-\d+/\d+\")|"  # e.g. 0' 0-1/2"
+        r"(\d+-\d+/\d+\")|"           # e.g. 1-1/2"
+        r"(\d+/\d+\")|"               # e.g. 1/2"
+        r"(\d+' \d+\")|"              # e.g. 1' 1"
+        r"(\d+\")|"                   # e.g. 1"
+        r"(\d+'))$"                   # e.g. 1'
+    )
+    if not re.match(pattern, input_text):
+        return None
+
+    # 1) Feet + Inches + Fraction, e.g. "0' 0-1/2"
+    if "'" in input_text and "-" in input_text:
+        feet, rest = input_text.split("'")
+        feet = int(feet.strip())
+        inches, fraction = rest.split("-")
+        inches = int(inches.strip())
+        num, denom = map(int, fraction[:-1].split("/"))  # remove the trailing "
+        fraction_val = float(num) / float(denom)
+        return float(feet) + float(inches + fraction_val) / 12.0
+
+    # 2) Inches + Fraction only, e.g. "1-1/2"
+    elif "-" in input_text:
+        inches, fraction = input_text.split("-")
+        inches = int(inches.strip())
+        num, denom = map(int, fraction[:-1].split("/"))  # remove "
+        fraction_val = float(num) / float(denom)
+        return float(inches + fraction_val) / 12.0
+
+    # 3) Fraction only, e.g. "1/2"
+    elif "/" in input_text:
+        num, denom = map(int, input_text[:-1].split("/"))  # remove "
+        fraction_val = float(num) / float(denom)
+        return float(fraction_val) / 12.0
+
+    # 4) Feet + Inches, e.g. "1' 6""
+    elif "'" in input_text and '"' in input_text:
+        feet, inches = input_text.split("'")
+        feet = int(feet.strip())
+        inches = int(inches[:-1].strip())  # remove "
+        return float(feet) + float(inches) / 12.0
+
+    # 5) Inches only, e.g. "6""
+    elif '"' in input_text:
+        inches = int(input_text[:-1].strip())  # remove "
+        return float(inches) / 12.0
+
+    # 6) Feet only, e.g. "1'"
+    elif "'" in input_text:
+        feet = int(input_text[:-1].strip())  # remove '
+        return float(feet)
+
+    # Fallback
+    return 0.0
+
+
+def set_rod_extensions(doc, hangers, extension, transaction_name="Set Rod Extensions"):
+    """Sets the structure extension of every rod of every hanger in one transaction.
+
+    A hanger or rod that Revit refuses is recorded and skipped instead of
+    rolling back the rest, so the whole batch is a single undo step.
+    Returns (rods_set, failures) where failures is a list of (element, message).
+    """
+    rods_set, _, failures = set_rod_extensions_by_group(doc, {None: hangers}, {None: extension},
+                                                         transaction_name)
+    return rods_set, failures
+
+
+def set_rod_extensions_by_group(doc, groups, extensions, transaction_name="Set Rod Extensions"):
+    """Sets each group's structure extension on its hangers, all in one transaction.
+
+    groups:     key -> list of hangers
+    extensions: key -> extension (ft, negative below structure); groups without
+                an entry are left untouched
+    Rods already within LENGTH_TOLERANCE of their target are skipped, so
+    re-running a preset only writes what actually changed.
+    Returns (rods_set, rods_skipped, failures).
+    """
+    rods_set = 0
+    rods_skipped = 0
+    failures = []
+    with Transaction(doc, transaction_name) as t:
+        t.Start()
+        for key, hangers in groups.items():
+            extension = extensions.get(key)
+            if extension is None:
+                continue
+            for hanger in hangers:
+                rod_info = get_rod_info(hanger)
+                if rod_info is None:
+                    failures.append((hanger, "no FabricationRodInfo"))
+                    continue
+                for rod_index in range(rod_info.RodCount):
+                    try:
+                        if abs(rod_info.GetRodStructureExtension(rod_index) - extension) < LENGTH_TOLERANCE:
+                            rods_skipped += 1
+                            continue
+                        rod_info.SetRodStructureExtension(rod_index, extension)
+                        rods_set += 1
+                    except Exception as e:
+                        failures.append((hanger, "rod {0}: {1}".format(rod_index, e)))
+        t.Commit()
+    return rods_set, rods_skipped, failures
+
+
+def load_extension_presets(csv_path):
+    """Reads 'Level,Distance Below Structure' rows into {level name: extension}.
+
+    Distances use the Adjust Rod Length formats (see parse_distance) and are
+    stored negated, ready for SetRodStructureExtension. A '*' row is the
+    default for levels without their own row. Invalid rows raise ValueError.
+    """
+    presets = {}
+    with open(csv_path, 'r') as f:
+        for line_number, row in enumerate(csv.DictReader(f), 2):
+            level = row['Level'].strip()
+            distance = parse_distance(row['Distance Below Structure'])
+            if not level or distance is None:
+                raise ValueError("Invalid preset on line {0}: {1}".format(line_number, row))
+            presets[level] = -distance
+    return presets
+
+
+def partition_by_level(doc, hangers):
+    """{level name: [hangers]} in one pass, resolving each level's name once."""
+    names = {}
+    groups = {}
+    for hanger in hangers:
+        level_id = hanger.LevelId.IntegerValue
+        if level_id not in names:
+            level = doc.GetElement(hanger.LevelId)
+            names[level_id] = level.Name if level is not None else ""
+        groups.setdefault(names[level_id], []).append(hanger)
+    return groups
+
+
+def get_3d_view(doc):
+    """First non-template 3D view, used as the context for ray casting."""
+    for view in FilteredElementCollector(doc).OfClass(View3D):
+        if not view.IsTemplate:
+            return view
+    return None
+
+
+def set_rod_lengths_to_structure(doc, hangers, extension, view3d, transaction_name="Set Rod Lengths To Structure"):
+    """Sizes every rod to the structure above it, in one transaction.
+
+    Rods already attached to structure follow it, so they only get the
+    structure extension. Free rods are measured: a ray is cast upward from the
+    rod bottom and the rod is set to the distance found minus the requested
+    distance below structure (extension is negative below structure, as for
+    SetRodStructureExtension). The bottom (GetRodEndPosition less the rod
+    length) is used rather than the rod top on purpose: a free rod's top
+    is wherever its last length put it, and a rod that is too long already
+    pokes through the deck or beam it hangs from. A ray from such a top
+    would size the rod up to the floor above; from the bottom it finds the
+    first structure over the hanger, which is what the rod is cut to. Results come from a StructureHitCache, so racks
+    of hangers under the same beam or slab share one ray cast.
+    Returns (report, failures).
+    """
+    cache = StructureHitCache(doc, view3d)
+    report = {"attached": 0, "measured": 0, "unchanged": 0, "no_structure": 0}
+    failures = []
+    with Transaction(doc, transaction_name) as t:
+        t.Start()
+        for hanger in hangers:
+            rod_info = get_rod_info(hanger)
+            if rod_info is None:
+                failures.append((hanger, "no FabricationRodInfo"))
+                continue
+            attached = rod_info.IsAttachedToStructure
+            for rod_index in range(rod_info.RodCount):
+                try:
+                    if attached:
+                        rod_info.SetRodStructureExtension(rod_index, extension)
+                        report["attached"] += 1
+                        continue
+                    top    = rod_info.GetRodEndPosition(rod_index)
+                    length = rod_info.GetRodLength(rod_index)
+                    # Cast from the hanger end, see the docstring
+                    bottom = XYZ(top.X, top.Y, top.Z - length)
+                    hit_z  = cache.underside_above(bottom)
+                    if hit_z is None:
+                        report["no_structure"] += 1
+                        continue
+                    target = hit_z - bottom.Z + extension
+                    if target <= 0.0:
+                        failures.append((hanger, "rod {0}: structure too close".format(rod_index)))
+                    elif abs(target - length) < LENGTH_TOLERANCE:
+                        report["unchanged"] += 1
+                    else:
+                        rod_info.SetRodLength(rod_index, target)
+                        report["measured"] += 1
+                except Exception as e:
+                    failures.append((hanger, "rod {0}: {1}".format(rod_index, e)))
+        t.Commit()
+    report["ray_casts"]  = cache.ray_casts
+    report["cache_hits"] = cache.hits
+    return report, failures
+
+def index_hosted_hangers(doc, parts):
+    """Reverse host index {part id (int): [hangers]} for the hangers hosted on parts.
+
+    Only hangers whose bounding box touches one of the parts are read, so the
+    cost follows the parts being changed rather than the size of the model.
+    Build it before the parts move.
+    """
+    candidates = collect_parts_near(doc, BuiltInCategory.OST_FabricationHangers, parts)
+    part_ids = set(part.Id.IntegerValue for part in parts)
+    return dict((host, hangers) for host, hangers in map_hangers_to_hosts(candidates).items()
+                if host in part_ids)
+
+
+def follow_host_moves(doc, hangers_by_host, moves):
+    """Keeps rod tops where they were after their host parts moved vertically.
+
+    hangers_by_host: from index_hosted_hangers(), built before the move
+    moves:           {part id (int): dz in ft} of the parts that moved
+    Runs inside the caller's transaction, after the moves. Attached rods get
+    their structure extension re-applied so Revit re-measures them; free rods
+    are shortened by dz (lengthened when the part moved down).
+    Returns (rods_updated, failures).
+    """
+    rods_updated = 0
+    failures = []
+    moved = [(hangers_by_host[host], dz) for host, dz in moves.items()
+             if host in hangers_by_host and abs(dz) >= LENGTH_TOLERANCE]
+    if not moved:
+        return rods_updated, failures
+
+    doc.Regenerate()
+    for hangers, dz in moved:
+        for hanger in hangers:
+            rod_info = get_rod_info(hanger)
+            if rod_info is None:
+                continue
+            for rod_index in range(rod_info.RodCount):
+                try:
+                    if rod_info.IsAttachedToStructure:
+                        rod_info.SetRodStructureExtension(rod_index, rod_info.GetRodStructureExtension(rod_index))
+                    else:
+                        rod_info.SetRodLength(rod_index, rod_info.GetRodLength(rod_index) - dz)
+                    rods_updated += 1
+                except Exception as e:
+                    failures.append((hanger, "rod {0}: {1}".format(rod_index, e)))
+    return rods_updated, failures
+
+
+def get_hanger_type_name(hanger):
+    """Name used to group hangers in reports: product name, alias, then element name."""
+    return hanger.ProductName or hanger.Alias or hanger.Name
+
+
+def get_rod_diameter(hanger):
+    """Rod diameter (ft) from the hanger's support rod ancillary, or None."""
+    for usage in hanger.GetPartAncillaryUsage():
+        if usage.Type == FabricationAncillaryType.SupportRod:
+            return usage.AncillaryWidthOrDiameter
+    return None
+
+
+def snapshot_rods(hangers):
+    """Yields one RodSnapshot per hanger, reading RodCount and each rod length once.
+
+    Hangers that cannot be read are skipped; everything downstream works on the
+    snapshots, never on the elements.
+    """
+    for hanger in hangers:
+        rod_info = get_rod_info(hanger)
+        if rod_info is None:
+            continue
+        lengths = tuple(rod_info.GetRodLength(i) for i in range(rod_info.RodCount))
+        yield RodSnapshot(hanger.Id.IntegerValue, get_hanger_type_name(hanger),
+                          get_rod_diameter(hanger), lengths, rod_info.IsAttachedToStructure)
+
+
+def aggregate_cut_list(snapshots, rounding=CUT_ROUNDING):
+    """Counts rods by (hanger type, rod diameter, length rounded up to rounding)."""
+    counts = Counter()
+    for snap in snapshots:
+        for length in snap.lengths:
+            # Round up: a rod cut short is scrap, a long one gets trimmed on site
+            steps = int(math.ceil(length / rounding - 1e-6))
+            counts[(snap.type_name, snap.rod_diameter, steps * rounding)] += 1
+    return counts
+
+
+def _fraction_text(whole, fraction, denominator, keep_zero=False):
+    """(1, 6, 16) -> '1 3/8', (0, 6, 16) -> '3/8' ('0 3/8' with keep_zero), (2, 0, 16) -> '2'."""
+    if not fraction:
+        return str(whole)
+    while fraction % 2 == 0:
+        fraction //= 2
+        denominator //= 2
+    if whole or keep_zero:
+        return "{0} {1}/{2}".format(whole, fraction, denominator)
+    return "{0}/{1}".format(fraction, denominator)
+
+
+def format_inches(feet, denominator=16):
+    """0.03125 -> 3/8\" (rounded to 1/denominator inch)."""
+    inches, fraction = divmod(int(round(feet * 12.0 * denominator)), denominator)
+    return _fraction_text(inches, fraction, denominator) + '"'
+
+
+def format_feet_inches(feet, denominator=8):
+    """1.53125 -> 1' - 6 3/8\" (rounded to 1/denominator inch)."""
+    whole_feet, remainder = divmod(int(round(feet * 12.0 * denominator)), 12 * denominator)
+    inches, fraction = divmod(remainder, denominator)
+    return "{0}' - {1}\"".format(whole_feet, _fraction_text(inches, fraction, denominator, True))
+
+
+def validate_rods(snapshots, min_length, max_length, max_trapeze_difference):
+    """Checks rod snapshots against length limits. Returns a list of RodIssue.
+
+    Flags hangers without rods, rods shorter than min_length or longer than
+    max_length, and multi-rod hangers (trapezes) whose longest and shortest
+    rods differ by more than max_trapeze_difference. Lengths are in feet.
+    """
+    issues = []
+    for snap in snapshots:
+        if not snap.lengths:
+            issues.append(RodIssue(snap.hanger_id, snap.type_name, "No rods", ""))
+            continue
+        for rod_index, length in enumerate(snap.lengths):
+            if length < min_length:
+                issues.append(RodIssue(snap.hanger_id, snap.type_name, "Rod too short",
+                                       "rod {0}: {1}".format(rod_index, format_feet_inches(length))))
+            elif length > max_length:
+                issues.append(RodIssue(snap.hanger_id, snap.type_name, "Rod too long",
+                                       "rod {0}: {1}".format(rod_index, format_feet_inches(length))))
+        if len(snap.lengths) > 1:
+            difference = max(snap.lengths) - min(snap.lengths)
+            if difference > max_trapeze_difference:
+                issues.append(RodIssue(snap.hanger_id, snap.type_name, "Uneven trapeze rods",
+                                       "difference {0}".format(format_feet_inches(difference))))
+    return issues
+
+
+def write_cut_list_csv(file_path, counts):
+    """Writes the cut list sorted by type, diameter and length. Returns the row count."""
+    rows = sorted(counts.items(), key=lambda item: (item[0][0], item[0][1] or 0.0, item[0][2]))
+    with open(file_path, 'w') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(["Hanger Type", "Rod Diameter", "Cut Length", "Cut Length (ft)", "Quantity"])
+        for (type_name, diameter, length), quantity in rows:
+            writer.writerow([type_name,
+                             format_inches(diameter) if diameter else "",
+                             format_feet_inches(length),
+                             "{0:.4f}".format(length),
+                             quantity])
+    return len(rows)
+
+#CLASSES
+#==================================================
+class StructureHitCache(object):
+    """Underside elevations of structure above points, cached per structural element.
+
+    The structure index (see build_structure_index) tells which element is
+    above a point without touching the model. When a ray cast hits the very
+    element the index named, the face it hit is kept; later points under the
+    same element are answered from that face, which also covers sloped decks,
+    but only where the point projects inside it and no other structure box
+    over the point starts below the face. Openings, drop panels, steps and
+    the ends of skewed beams fall outside the face and get a ray cast of
+    their own, whose face is kept as well. Faces that are not planar, or live
+    in linked models, are not cached.
+    """
+
+    def __init__(self, doc, view3d):
+        self.doc   = doc
+        self.index = build_structure_index(doc)[0]
+        categories = List[BuiltInCategory](list(STRUCTURE_CATEGORIES))
+        self.intersector = ReferenceIntersector(ElementMulticategoryFilter(categories),
+                                                FindReferenceTarget.Face, view3d)
+        self.intersector.FindReferencesInRevitLinks = True
+        self.faces     = {}     # index key -> [PlanarFace] hit under that element
+        self.ray_casts = 0
+        self.hits      = 0
+
+    def underside_above(self, point):
+        """Elevation of the first structure face straight above point, or None."""
+        key, _ = self.index.first_above((point.X, point.Y, point.Z))
+        for face in self.faces.get(key, ()):
+            hit_z = self._face_z(face, point)
+            if hit_z is not None:
+                # A beam under a sloped deck can sit below the cached face
+                if self.index.others_below((point.X, point.Y, point.Z), hit_z, key):
+                    break
+                self.hits += 1
+                return hit_z
+
+        self.ray_casts += 1
+        context = self.intersector.FindNearest(point, XYZ.BasisZ)
+        if context is None:
+            return None
+        hit_z = point.Z + context.Proximity
+        reference = context.GetReference()
+        # Only host model faces of the element the index expects are kept
+        if reference.LinkedElementId == ElementId.InvalidElementId and \
+           key == (None, reference.ElementId.IntegerValue):
+            element = self.doc.GetElement(reference.ElementId)
+            face = element.GetGeometryObjectFromReference(reference) if element else None
+            if isinstance(face, PlanarFace) and abs(face.FaceNormal.Z) > 1e-6:
+                # Family geometry can come back in family coordinates; only keep
+                # faces that reproduce the hit we just measured
+                face_z = self._face_z(face, point)
+                if face_z is not None and abs(face_z - hit_z) < 1e-4:
+                    self.faces.setdefault(key, []).append(face)
+        return hit_z
+
+    @staticmethod
+    def _face_z(face, point, tolerance=1e-4):
+        """Elevation of face's plane straight above point, or None when point is not under the face."""
+        origin, normal = face.Origin, face.FaceNormal
+        z = origin.Z - (normal.X * (point.X - origin.X) + normal.Y * (point.Y - origin.Y)) / normal.Z
+        result = face.Project(XYZ(point.X, point.Y, z))
+        if result is None or result.Distance > tolerance or not face.IsInside(result.UVPoint):
+            return None
+        return z
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""Timings of heavy Revit commands and the fabrication parts changed between syncs.
+
+Used by the extension's hooks:
+
+    doc-changed                 record_changes(doc, args)
+    doc-syncing / doc-saving    start_command(SYNC, doc)
+    doc-synced / doc-saved      finish_command(SYNC, doc, status_of(args))
+
+Every command run is appended to the telemetry log as a record of its own
+(tool = the command name, the whole command in the 'commit' phase, and
+'fabrication_parts' = parts added or modified since the last successful
+sync), so the Telemetry Report lists sync, save and reload cost next to the
+tools that changed the model. Parts changed while Reload Latest runs are
+other people's edits and are not counted. Each hook runs in a fresh
+engine, so the state is kept in the AppDomain. Nothing here raises: a hook
+must never get in the way of the command it times.
+"""
+#IMPORTS
+#==================================================
+import time
+
+from Snippets._settings import TELEMETRY, is_enabled
+from Snippets._telemetry import append_record, document_info
+
+#VARIABLES
+#==================================================
+SYNC   = "Synchronize with Central"
+SAVE   = "Save"
+RELOAD = "Reload Latest"
+
+STATE_KEY = "pyVolve.session"
+
+_local_state = {}           # outside Revit (benchmarks, tests)
+
+#FUNCTIONS
+#==================================================
+def _state():
+    """{'started': {(command, doc key): time}, 'changed': {doc key: set of ids}}, shared by all hooks."""
+    try:
+        from System import AppDomain
+        domain = AppDomain.CurrentDomain
+        state = domain.GetData(STATE_KEY)
+        if state is None:
+            state = {}
+            domain.SetData(STATE_KEY, state)
+    except ImportError:
+        state = _local_state
+    state.setdefault("started", {})
+    state.setdefault("changed", {})
+    return state
+
+
+def document_key(doc):
+    return doc.PathName or doc.Title
+
+
+def status_of(args):
+    """'ok', 'cancelled' or 'failed' from a Revit event's Status."""
+    status = str(getattr(args, "Status", "Succeeded"))
+    if status == "Succeeded":
+        return "ok"
+    return "cancelled" if status == "Cancelled" else "failed"
+
+
+def record_changes(doc, args):
+    """Adds the fabrication parts added or modified by one DocumentChanged event.
+
+    Changes made while Reload Latest runs (from its before-exec hook until
+    Revit is idle again) came from other users and are ignored.
+    """
+    if not is_enabled(TELEMETRY, True):
+        return
+    try:
+        state = _state()
+        key = document_key(doc)
+        if (RELOAD, key) in state["started"]:
+            return
+        from Autodesk.Revit.DB import ElementClassFilter, FabricationPart
+        parts = ElementClassFilter(FabricationPart)
+        ids = list(args.GetAddedElementIds(parts)) + list(args.GetModifiedElementIds(parts))
+        if ids:
+            changed = state["changed"].setdefault(key, set())
+            changed.update(element_id.IntegerValue for element_id in ids)
+    except Exception:
+        pass
+
+
+def changed_ids(doc):
+    """Ids (ints) of the fabrication parts added or modified since the last successful sync."""
+    return sorted(_state()["changed"].get(document_key(doc), ()))
+
+
+def changed_parts(doc):
+    """Number of fabrication parts added or modified since the last successful sync."""
+    return len(_state()["changed"].get(document_key(doc), ()))
+
+
+def start_command(command, doc):
+    try:
+        _state()["started"][(command, document_key(doc))] = time.time()
+    except Exception:
+        pass
+
+
+def finish_command(command, doc, status="ok"):
+    """Logs how long command took on doc. A successful sync starts a new change count."""
+    try:
+        state = _state()
+        key = document_key(doc)
+        # Popped even with telemetry off: a pending Reload Latest mutes record_changes
+        started = state["started"].pop((command, key), None)
+        if started is None or not is_enabled(TELEMETRY, True):
+            return
+        seconds = round(time.time() - started, 4)
+        record = {
+            "time":    time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "tool":    command,
+            "status":  status,
+            "total":   seconds,
+            "phases":  {"commit": seconds},
+            "counts":  {"fabrication_parts": changed_parts(doc)},
+            "profiled": False,
+        }
+        record.update(document_info(doc))
+        if command == SYNC and status == "ok":
+            state["changed"].pop(key, None)
+        append_record(record)
+    except Exception:
+        pass
+
+
+def finish_on_idling(uiapp, command, doc):
+    """Finishes command at the next Idling event, for commands without an 'after' event."""
+    def on_idling(sender, args):
+        sender.Idling -= on_idling
+        finish_command(command, doc)
+    try:
+        uiapp.Idling += on_idling
+    except Exception:
+        pass
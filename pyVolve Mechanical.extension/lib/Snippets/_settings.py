@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""Opt-in switches for pyVolve's diagnostics.
+
+A switch is on when the environment variable PYVOLVE_<NAME> is set to
+1/true/yes/on, or when the [pyVolve] section of the pyRevit config has
+<name> = true; 0/false/no/off turn it off. The environment wins, so a
+switch can be flipped for one Revit session without touching the config.
+"""
+#IMPORTS
+#==================================================
+import os
+
+try:
+    from pyrevit.userconfig import user_config
+except Exception:           # outside pyRevit (benchmarks, tests)
+    user_config = None
+
+#VARIABLES
+#==================================================
+SECTION    = "pyVolve"
+ENV_PREFIX = "PYVOLVE_"
+
+INSTRUMENT     = "instrument"        # count API calls per tool run, see _instrument
+TELEMETRY      = "telemetry"         # log phase timings of every run (on by default), see _telemetry
+TELEMETRY_DIR  = "telemetry_dir"     # folder of the telemetry log
+PROFILE        = "profile"           # run tools under the profiler (as on shift-click), see _profiler
+PRESYNC        = "presync_checks"    # check the parts changed since the last sync before syncing (on by default), see _validation
+PRESYNC_BUDGET = "presync_budget"    # seconds those checks may take
+CACHE          = "cache"             # keep part indexes between clicks (on by default), see _cache
+CACHE_LIMIT    = "cache_max_records" # records kept per document
+WARMUP         = "warmup"            # build the cached indexes while Revit is idle after opening a model (on by default), see _warmup
+SIDECAR        = "sidecar"           # keep the cached indexes in a file next to the telemetry log between sessions (on by default), see _sidecar
+
+_TRUE  = ("1", "true", "yes", "on")
+_FALSE = ("0", "false", "no", "off")
+
+#FUNCTIONS
+#==================================================
+def get_setting(name, default=None):
+    """Raw value of a setting from the environment or the pyRevit config."""
+    value = os.environ.get(ENV_PREFIX + name.upper())
+    if value is not None:
+        return value
+    if user_config is not None:
+        try:
+            return user_config.get_section(SECTION).get_option(name, default_value=default)
+        except Exception:
+            pass
+    return default
+
+
+def is_enabled(name, default=False):
+    """True when the setting is switched on, default when it is not set."""
+    value = get_setting(name)
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower() if value is not None else ""
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    return default
@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+"""Cached part indexes saved to a binary sidecar file, so reopening a model skips rebuilding them.
+
+    load_sidecar(doc)       # doc-opened, before the warmup: True when the indexes came from disk
+    save_sidecar(doc)       # when the cached indexes match a saved version of the model
+
+One file per model in sidecar_dir() (next to the telemetry log), named after a
+hash of the model path and its central GUID. After the header come packed
+little-endian arrays, one entry per fabrication part, at 8-byte aligned
+offsets, each read back in one array.array call:
+
+    id        int64     element id
+    host      int64     host id of a hanger, -1 unhosted, HOST_NONE for other parts
+    service   uint16    code into the service table, NO_CODE when unknown
+    size      uint16    code into the size table, NO_CODE when unknown
+    bbox      float64   min x, min y, min z, max x, max y, max z (ft), NaN without a box
+
+then the service and size tables as UTF-8 JSON. The header stamps the file
+with the model's document version (Document.GetDocumentVersion). When the
+model is at that version the indexes load as they are. When it moved on and
+Revit can list what changed since then (Document.GetChangedElements), only
+those parts are queued for re-reading; otherwise the file is ignored and the
+warmup builds from the model. The indexes themselves are the cache's
+dictionaries, filled from the arrays on load.
+
+A save only rewrites the file when the cached indexes changed since it was
+last written or loaded; otherwise just the header is restamped with the new
+version.
+"""
+#IMPORTS
+#==================================================
+import array
+import hashlib
+import json
+import os
+import struct
+import sys
+
+from Snippets._cache import (PartsByService, PartsBySize, HangerHosts, SpatialBuckets, GeometryRecords,
+                             document_cache)
+from Snippets._settings import CACHE, SIDECAR, is_enabled
+from Snippets._telemetry import log_dir
+
+#VARIABLES
+#==================================================
+MAGIC          = b"PVX1"
+FORMAT_VERSION = 1
+EXTENSION      = ".pvx"
+
+# magic, format, reserved, count, saves, version GUID, central GUID
+HEADER = struct.Struct("<4sHHIq36s36s")
+
+HOST_NONE = -2
+NO_CODE   = 0xFFFF
+NO_BOX    = (float("nan"),) * 6
+
+SIDECAR_INDEXES = (PartsByService, PartsBySize, HangerHosts, GeometryRecords, SpatialBuckets)
+
+#FUNCTIONS
+#==================================================
+def is_on():
+    return is_enabled(CACHE, True) and is_enabled(SIDECAR, True)
+
+
+def sidecar_dir():
+    return os.path.join(log_dir(), "sidecar")
+
+
+def _guid_text(guid):
+    return str(guid) if guid is not None else ""
+
+
+def central_guid(doc):
+    try:
+        return _guid_text(doc.WorksharingCentralGUID) if doc.IsWorkshared else ""
+    except Exception:
+        return ""
+
+
+def document_version(doc):
+    """(version GUID, number of saves) of doc, or None when Revit cannot tell."""
+    try:
+        from Autodesk.Revit.DB import Document
+        version = Document.GetDocumentVersion(doc)
+        return _guid_text(version.VersionGUID), int(version.NumberOfSaves)
+    except Exception:
+        return None
+
+
+def sidecar_path(doc, directory=None):
+    """Sidecar file of doc, keyed by its path and central GUID; None for unsaved models."""
+    if not doc.PathName:
+        return None
+    key = u"{0}|{1}".format(doc.PathName.lower(), central_guid(doc)).encode("utf-8")
+    return os.path.join(directory or sidecar_dir(), hashlib.sha1(key).hexdigest() + EXTENSION)
+
+
+def _pad(length):
+    return (-length) % 8
+
+
+def _has_typecode(typecode):
+    try:
+        array.array(typecode)
+        return True
+    except ValueError:
+        return False
+
+
+def _itemsize(typecode):
+    return struct.calcsize("<" + typecode)
+
+
+def _to_bytes(typecode, values):
+    if not _has_typecode(typecode):
+        # IronPython's array has no 'q'
+        return struct.pack("<{0}{1}".format(len(values), typecode), *values)
+    values = array.array(typecode, values)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values.tobytes() if hasattr(values, "tobytes") else values.tostring()
+
+
+def _from_bytes(typecode, data):
+    if not _has_typecode(typecode):
+        return struct.unpack("<{0}{1}".format(len(data) // _itemsize(typecode), typecode), bytes(data))
+    values = array.array(typecode)
+    if hasattr(values, "frombytes"):
+        values.frombytes(data)
+    else:
+        values.fromstring(bytes(data))
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+def pack(records, services, sizes, version, central):
+    """Bytes of a sidecar file. records: [(id, host, service code, size code, bbox 6-tuple)]."""
+    count = len(records)
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, 0, count, version[1],
+                         version[0].encode("ascii"), central.encode("ascii"))
+    chunks = [header, b"\0" * _pad(len(header))]
+    chunks.append(_to_bytes("q", [r[0] for r in records]))
+    chunks.append(_to_bytes("q", [r[1] for r in records]))
+    codes = _to_bytes("H", [r[2] for r in records]) + _to_bytes("H", [r[3] for r in records])
+    chunks += [codes, b"\0" * _pad(len(codes))]
+    chunks.append(_to_bytes("d", [v for r in records for v in r[4]]))
+    chunks.append(json.dumps({"services": services, "sizes": sizes}).encode("utf-8"))
+    return b"".join(chunks)
+
+
+def unpack(data):
+    """(header dict, ids, hosts, service codes, size codes, bboxes, services, sizes) of sidecar bytes.
+
+    Raises ValueError for anything that is not a sidecar of this format.
+    """
+    if len(data) < HEADER.size:
+        raise ValueError("sidecar too short")
+    magic, fmt, _, count, saves, version, central = HEADER.unpack(data[:HEADER.size])
+    if magic != MAGIC or fmt != FORMAT_VERSION:
+        raise ValueError("not a pyVolve sidecar of format {0}".format(FORMAT_VERSION))
+
+    offset = HEADER.size + _pad(HEADER.size)
+
+    def take(typecode, length):
+        size = _itemsize(typecode) * length
+        values = _from_bytes(typecode, data[take.offset:take.offset + size])
+        if len(values) != length:
+            raise ValueError("sidecar truncated")
+        take.offset += size
+        return values
+    take.offset = offset
+
+    ids   = take("q", count)
+    hosts = take("q", count)
+    service_codes = take("H", count)
+    size_codes    = take("H", count)
+    take.offset += _pad(4 * count)
+    bboxes = take("d", 6 * count)
+    tables = json.loads(bytes(data[take.offset:]).decode("utf-8"))
+    header = {"count": count, "saves": saves, "version": version.decode("ascii").rstrip("\0"),
+              "central": central.decode("ascii").rstrip("\0")}
+    return header, ids, hosts, service_codes, size_codes, bboxes, tables["services"], tables["sizes"]
+
+
+def read_sidecar(path):
+    """Unpacked contents of the file at path."""
+    with open(path, "rb") as f:
+        return unpack(f.read())
+
+
+def restamp(path, version, central):
+    """Rewrites only the header of the sidecar at path with version. Raises ValueError for a foreign file."""
+    with open(path, "r+b") as f:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError("sidecar too short")
+        magic, fmt, reserved, count, _, _, _ = HEADER.unpack(header)
+        if magic != MAGIC or fmt != FORMAT_VERSION:
+            raise ValueError("not a pyVolve sidecar of format {0}".format(FORMAT_VERSION))
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, reserved, count, version[1],
+                            version[0].encode("ascii"), central.encode("ascii")))
+
+
+def warn(message):
+    """Reports a sidecar failure in pyRevit's log (stderr outside pyRevit)."""
+    try:
+        from pyrevit.coreutils.logger import get_logger
+        get_logger(__name__).warning(message)
+    except ImportError:
+        sys.stderr.write(message + "\n")
+
+
+def _coder(table):
+    codes = dict((name, i) for i, name in enumerate(table))
+
+    def code(name):
+        if name is None:
+            return NO_CODE
+        if name not in codes:
+            if len(table) >= NO_CODE:
+                return NO_CODE
+            codes[name] = len(table)
+            table.append(name)
+        return codes[name]
+    return code
+
+
+def save_sidecar(doc, directory=None):
+    """Writes doc's cached indexes to its sidecar. Returns the path, or None when they were not saved.
+
+    Call it only while the indexes match the model as saved (after a save,
+    or a warmup that saw no change): the file is stamped with the saved
+    version. Every index in SIDECAR_INDEXES must be cached. When the indexes
+    have not changed since the file was written or loaded, only its header
+    is restamped. Failures to write are reported with warn().
+    """
+    if not is_on():
+        return None
+    path = sidecar_path(doc, directory)
+    version = document_version(doc)
+    cache = document_cache(doc)
+    if path is None or version is None or cache.warmup is not None:
+        return None
+    cache.apply_changes(doc)
+    indexes = cache.indexes
+    if any(cls.name not in indexes for cls in SIDECAR_INDEXES):
+        return None
+    if getattr(cache, "saved", None) == cache.generation and os.path.exists(path):
+        try:
+            restamp(path, version, central_guid(doc))
+            return path
+        except (IOError, OSError, ValueError) as e:
+            warn("Could not restamp sidecar {0}: {1}".format(path, e))
+
+    service, size = indexes[PartsByService.name], indexes[PartsBySize.name]
+    hosts, geometry = indexes[HangerHosts.name], indexes[GeometryRecords.name]
+    services, sizes = [], []
+    service_code, size_code = _coder(services), _coder(sizes)
+    records = []
+    for element_id in sorted(set(service.values) | set(size.values) | set(hosts.values) | set(geometry.values)):
+        records.append((element_id, hosts.values.get(element_id, HOST_NONE),
+                        service_code(service.value_of(element_id)), size_code(size.value_of(element_id)),
+                        geometry.values.get(element_id, NO_BOX)))
+
+    # Written aside and swapped in, so a reader never sees half a file
+    temp = path + ".tmp"
+    try:
+        folder = os.path.dirname(path)
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+        with open(temp, "wb") as f:
+            f.write(pack(records, services, sizes, version, central_guid(doc)))
+        if os.path.exists(path):
+            os.remove(path)
+        os.rename(temp, path)
+    except (IOError, OSError) as e:
+        warn("Could not write sidecar {0}: {1}".format(path, e))
+        return None
+    cache.saved = cache.generation
+    return path
+
+
+def changed_since(doc, version_guid):
+    """(changed ids, deleted ids) since version_guid, or None when Revit cannot say."""
+    try:
+        from System import Guid
+        changes = doc.GetChangedElements(Guid(version_guid))
+        changed = [i.IntegerValue for i in changes.GetCreatedElementIds()]
+        changed += [i.IntegerValue for i in changes.GetModifiedElementIds()]
+        deleted = [i.IntegerValue for i in changes.GetDeletedElementIds()]
+        return changed, deleted
+    except Exception:
+        return None
+
+
+def load_sidecar(doc, directory=None):
+    """Fills doc's cache from its sidecar. Returns True when the indexes were loaded.
+
+    A sidecar of an older version of the model is patched with the parts
+    changed since (see changed_since); when that is not possible, or the
+    file is missing or damaged, nothing is loaded.
+    """
+    if not is_on():
+        return False
+    path = sidecar_path(doc, directory)
+    version = document_version(doc)
+    if path is None or version is None or not os.path.exists(path):
+        return False
+    try:
+        header, ids, hosts, service_codes, size_codes, bboxes, services, sizes = read_sidecar(path)
+    except (IOError, OSError, ValueError, KeyError):
+        return False
+    if header["central"] != central_guid(doc):
+        return False
+
+    changes = None
+    if (header["version"], header["saves"]) != version:
+        changes = changed_since(doc, header["version"])
+        if changes is None:
+            return False
+
+    def decode(table, codes):
+        return [table[c] if c != NO_CODE else None for c in codes]
+
+    # NaN != NaN marks the parts without a box
+    boxed = [(i, tuple(bboxes[6 * n:6 * n + 6])) for n, i in enumerate(ids) if bboxes[6 * n] == bboxes[6 * n]]
+    cache = document_cache(doc)
+    # Least used first, so the cache limit evicts those
+    cache.install(GeometryRecords.name, GeometryRecords().load(boxed))
+    cache.install(SpatialBuckets.name, SpatialBuckets().load(
+        (i, SpatialBuckets.cell((b[0] + b[3]) / 2.0, (b[1] + b[4]) / 2.0)) for i, b in boxed))
+    cache.install(PartsBySize.name, PartsBySize().load(zip(ids, decode(sizes, size_codes))))
+    cache.install(PartsByService.name, PartsByService().load(zip(ids, decode(services, service_codes))))
+    cache.install(HangerHosts.name, HangerHosts().load((i, h) for i, h in zip(ids, hosts) if h != HOST_NONE))
+    cache.saved = cache.generation
+    if changes is not None:
+        cache.invalidate(*changes)
+    return True
@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+"""Hanger spacing rules and pipe-run geometry for the hanger spacing tools."""
+#IMPORTS
+#==================================================
+import csv
+import math
+from bisect import bisect_left
+from collections import namedtuple
+
+from Autodesk.Revit.DB import FabricationPart, FabricationConfiguration, Transaction, TransactionGroup
+
+from Snippets._fabparts import parse_size_to_inches, get_line, get_point
+from Snippets._hangers import map_hangers_to_hosts
+from Snippets._spatial import canonical_direction
+
+#VARIABLES
+#==================================================
+RUN_GAP_TOLERANCE = 2.0     # ft - collinear pipes closer than this (inline fittings) form one run
+OFFSET_PRECISION  = 2       # decimals (ft) used to decide two pipes share an axis
+FITTING_CLEARANCE = 0.5     # ft - new hangers keep this far from pipe ends (fittings, couplings)
+EXISTING_TOLERANCE = 0.25   # ft - a planned station this close to an existing hanger is dropped
+
+SpacingRule = namedtuple("SpacingRule", "material min_size max_size max_spacing max_end")
+Violation   = namedtuple("Violation", "run kind value limit hanger_ids")
+Station     = namedtuple("Station", "pipe t")
+
+#FUNCTIONS
+#==================================================
+def load_spacing_table(csv_path):
+    """Reads the spacing table. Sizes are inches, distances are feet.
+
+    Material is matched case-insensitively as a substring of the fabrication
+    material name; "*" matches any material.
+    """
+    rules = []
+    with open(csv_path, 'r') as f:
+        for row in csv.DictReader(f):
+            rules.append(SpacingRule(
+                row['Material'].strip().lower(),
+                float(row['Min Size']) if row['Min Size'].strip() else 0.0,
+                float(row['Max Size']) if row['Max Size'].strip() else float('inf'),
+                float(row['Max Spacing']),
+                float(row['Max End Distance']),
+            ))
+    return rules
+
+
+def find_rule(rules, material_name, size_inches):
+    """First rule whose material and size range match, or None."""
+    material_name = (material_name or "").lower()
+    for rule in rules:
+        if rule.material != "*" and rule.material not in material_name:
+            continue
+        if rule.min_size <= size_inches <= rule.max_size:
+            return rule
+    return None
+
+
+def _axis_key(line):
+    """(direction, perpendicular offset) rounded so collinear lines share a key."""
+    start = line.GetEndPoint(0)
+    end   = line.GetEndPoint(1)
+    dx, dy, dz = end.X - start.X, end.Y - start.Y, end.Z - start.Z
+    length = math.sqrt(dx * dx + dy * dy + dz * dz)
+    # One sense per axis so A->B and B->A pipes land together
+    dx, dy, dz = canonical_direction((dx / length, dy / length, dz / length))
+    t = start.X * dx + start.Y * dy + start.Z * dz
+    ox, oy, oz = start.X - t * dx, start.Y - t * dy, start.Z - t * dz
+    p = OFFSET_PRECISION
+    return (round(dx, 3), round(dy, 3), round(dz, 3), round(ox, p), round(oy, p), round(oz, p)), (dx, dy, dz)
+
+
+def build_runs(pipes):
+    """Groups straight pipes into runs: same axis, same size, touching end to end."""
+    groups = {}
+    for pipe in pipes:
+        line = get_line(pipe)
+        if line is None or line.Length < 1e-6:
+            continue
+        key, direction = _axis_key(line)
+        group_key = key + (pipe.Size,)
+        groups.setdefault(group_key, (direction, []))[1].append((pipe, line))
+
+    runs = []
+    for direction, members in groups.values():
+        spans = []
+        for pipe, line in members:
+            a = _dot(line.GetEndPoint(0), direction)
+            b = _dot(line.GetEndPoint(1), direction)
+            spans.append((min(a, b), max(a, b), pipe))
+        spans.sort(key=lambda s: s[0])
+
+        current = None
+        for start, end, pipe in spans:
+            if current is not None and start - current.end <= RUN_GAP_TOLERANCE:
+                current.add(pipe, start, end)
+            else:
+                current = PipeRun(direction, pipe, start, end)
+                runs.append(current)
+    return runs
+
+
+def check_run_spacing(run, stations, rule):
+    """Compares sorted hanger stations on one run against rule.
+
+    stations: sorted list of (t, hanger_id) along the run axis.
+    Returns a list of Violation.
+    """
+    violations = []
+    if not stations:
+        if run.length > rule.max_end:
+            violations.append(Violation(run, "no hangers", run.length, rule.max_end, []))
+        return violations
+
+    first_t, first_id = stations[0]
+    last_t, last_id = stations[-1]
+    if first_t - run.start > rule.max_end:
+        violations.append(Violation(run, "start distance", first_t - run.start, rule.max_end, [first_id]))
+    if run.end - last_t > rule.max_end:
+        violations.append(Violation(run, "end distance", run.end - last_t, rule.max_end, [last_id]))
+    for (t0, id0), (t1, id1) in zip(stations, stations[1:]):
+        if t1 - t0 > rule.max_spacing:
+            violations.append(Violation(run, "spacing", t1 - t0, rule.max_spacing, [id0, id1]))
+    return violations
+
+
+def check_hanger_spacing(pipes, hangers, rules, material_names):
+    """Checks every run built from pipes against the spacing table.
+
+    material_names: callable part -> material name (see _fabparts.MaterialNames).
+    Returns (violations, unmatched_runs) where unmatched_runs had no rule.
+    Cost is one pass over hangers, one over pipes and a sort per run.
+    """
+    by_host = map_hangers_to_hosts(hangers)
+    violations = []
+    unmatched = []
+    rule_cache = {}
+    for run in build_runs(pipes):
+        first = run.pipes[0]
+        rule_key = (first.Material, first.Size)
+        if rule_key not in rule_cache:
+            rule_cache[rule_key] = find_rule(rules, material_names(first), parse_size_to_inches(first.Size))
+        rule = rule_cache[rule_key]
+        if rule is None:
+            unmatched.append(run)
+            continue
+        violations.extend(check_run_spacing(run, run.stations(by_host), rule))
+    return violations, unmatched
+
+
+def _fill(a, b, max_spacing):
+    """Evenly spaced points strictly between a and b so no interval exceeds max_spacing."""
+    count = int(math.ceil((b - a) / max_spacing - 1e-9))
+    return [a + i * (b - a) / count for i in range(1, count)]
+
+
+def plan_stations(run, existing, rule):
+    """Hanger stations needed on run to satisfy rule, around the hangers it already has.
+
+    existing: sorted projections (t) of hangers already on the run.
+    Stations go where spacing or end distance would otherwise be exceeded,
+    are kept FITTING_CLEARANCE away from pipe ends, and are dropped when an
+    existing hanger (looked up by bisection) is already there. Keeping clear
+    of the ends can stretch an interval again, so the result is checked
+    once more (see _close_gaps).
+    Returns a list of Station, in order along the run.
+    """
+    if run.length <= 2.0 * FITTING_CLEARANCE:
+        return []
+
+    wanted = []
+    if not existing:
+        first = run.start + min(rule.max_end, run.length / 2.0)
+        last  = run.end - min(rule.max_end, run.length / 2.0)
+        wanted.append(first)
+        if last - first > 1e-6:
+            wanted.extend(_fill(first, last, rule.max_spacing))
+            wanted.append(last)
+    else:
+        if existing[0] - run.start > rule.max_end:
+            lead = run.start + rule.max_end
+            wanted.append(lead)
+            wanted.extend(_fill(lead, existing[0], rule.max_spacing))
+        for a, b in zip(existing, existing[1:]):
+            if b - a > rule.max_spacing:
+                wanted.extend(_fill(a, b, rule.max_spacing))
+        if run.end - existing[-1] > rule.max_end:
+            tail = run.end - rule.max_end
+            wanted.extend(_fill(existing[-1], tail, rule.max_spacing))
+            wanted.append(tail)
+
+    stations = []
+    for t in wanted:
+        station = run.place(t)
+        if station is None:
+            continue
+        i = bisect_left(existing, station.t)
+        near = [existing[j] for j in (i - 1, i) if 0 <= j < len(existing)]
+        if any(abs(e - station.t) < EXISTING_TOLERANCE for e in near):
+            continue
+        stations.append(station)
+    return sorted(_close_gaps(run, existing, stations, rule), key=lambda s: s.t)
+
+
+def _close_gaps(run, existing, stations, rule):
+    """stations plus one more wherever an interval along run still exceeds rule.
+
+    Each gap that is too long (end distances against max_end, the rest against
+    max_spacing) gets a station near where it needs one, placed with
+    run.place() like the others, and the two halves are checked again. A gap
+    with no pipe room inside it is left as it is.
+    """
+    stations = list(stations)
+    points = sorted(list(existing) + [station.t for station in stations])
+    if not points:
+        return stations
+
+    gaps = [(run.start, points[0], "lead")]
+    gaps += [(a, b, "spacing") for a, b in zip(points, points[1:])]
+    gaps.append((points[-1], run.end, "tail"))
+    while gaps:
+        a, b, kind = gaps.pop()
+        limit = rule.max_spacing if kind == "spacing" else rule.max_end
+        if b - a <= limit + 1e-9:
+            continue
+        # Inside the gap and clear of the hangers at its ends
+        low, high = a + EXISTING_TOLERANCE, b - EXISTING_TOLERANCE
+        if kind == "lead":
+            station = run.place(a + limit, low, min(high, a + limit))
+        elif kind == "tail":
+            station = run.place(b - limit, max(low, b - limit), high)
+        else:
+            station = run.place((a + b) / 2.0, low, high)
+        if station is None:
+            continue
+        stations.append(station)
+        gaps.append((a, station.t, "lead" if kind == "lead" else "spacing"))
+        gaps.append((station.t, b, "tail" if kind == "tail" else "spacing"))
+    return stations
+
+
+def get_hanger_buttons(doc, part):
+    """Hanger buttons (name -> FabricationServiceButton) of the part's service."""
+    config = FabricationConfiguration.GetFabricationConfiguration(doc)
+    buttons = {}
+    for service in config.GetAllLoadedServices():
+        if service.ServiceId != part.ServiceId:
+            continue
+        for palette in range(service.PaletteCount):
+            for index in range(service.GetButtonCount(palette)):
+                button = service.GetButton(palette, index)
+                if button.IsAHanger:
+                    buttons[button.Name] = button
+    return buttons
+
+
+def _start_connector(pipe, direction):
+    """The pipe connector furthest back along direction (distances are measured from it)."""
+    connectors = [c for c in pipe.ConnectorManager.Connectors]
+    return min(connectors, key=lambda c: _dot(c.Origin, direction))
+
+
+def place_hangers(doc, stations_by_run, button, attach_to_structure=True,
+                  batch_size=200, progress=None):
+    """Creates hangers at the planned stations in batched transactions.
+
+    stations_by_run: list of (run, [Station]).
+    All batches sit in one TransactionGroup, so the placement is a single undo
+    step. progress(done, total) is called after each batch; returning False
+    cancels the remaining batches (completed ones are kept).
+    Returns (created, failures, cancelled).
+    """
+    work = [(run, station) for run, stations in stations_by_run for station in stations]
+    created = 0
+    failures = []
+    cancelled = False
+
+    group = TransactionGroup(doc, "Place Hangers")
+    group.Start()
+    try:
+        for batch_start in range(0, len(work), batch_size):
+            batch = work[batch_start:batch_start + batch_size]
+            with Transaction(doc, "Place Hangers {0}-{1}".format(batch_start + 1, batch_start + len(batch))) as t:
+                t.Start()
+                for run, station in batch:
+                    try:
+                        connector = _start_connector(station.pipe, run.direction)
+                        distance = station.t - _dot(connector.Origin, run.direction)
+                        FabricationPart.CreateHanger(doc, button, station.pipe.Id, connector,
+                                                     distance, attach_to_structure)
+                        created += 1
+                    except Exception as e:
+                        failures.append((station.pipe, str(e)))
+                t.Commit()
+            if progress is not None and progress(batch_start + len(batch), len(work)) is False:
+                cancelled = True
+                break
+    finally:
+        # Committed batches are kept even when progress or the UI raises
+        group.Assimilate()
+    return created, failures, cancelled
+
+
+def _dot(point, direction):
+    return point.X * direction[0] + point.Y * direction[1] + point.Z * direction[2]
+
+#CLASSES
+#==================================================
+class PipeRun(object):
+    """Straight, collinear pipes of one size treated as a single run for spacing."""
+
+    def __init__(self, direction, pipe, start, end):
+        self.direction = direction
+        self.pipes = [pipe]
+        self.spans = [(start, end, pipe)]
+        self.start = start      # distance along direction, ft
+        self.end   = end
+
+    def add(self, pipe, start, end):
+        self.pipes.append(pipe)
+        self.spans.append((start, end, pipe))
+        self.end = max(self.end, end)
+
+    def place(self, t, low=None, high=None):
+        """Nearest Station to t that lies on a pipe, clear of its ends; None if none fits.
+
+        low / high, when given, bound where the station may go.
+        """
+        best = None
+        for start, end, pipe in self.spans:
+            lo, hi = start + FITTING_CLEARANCE, end - FITTING_CLEARANCE
+            if low is not None:
+                lo = max(lo, low)
+            if high is not None:
+                hi = min(hi, high)
+            if lo > hi:
+                continue
+            clamped = min(max(t, lo), hi)
+            if best is None or abs(clamped - t) < abs(best.t - t):
+                best = Station(pipe, clamped)
+        return best
+
+    @property
+    def length(self):
+        return self.end - self.start
+
+    def project(self, point):
+        return _dot(point, self.direction)
+
+    def stations(self, by_host):
+        """Sorted (t, hanger id) of hangers hosted on this run's pipes."""
+        result = []
+        for pipe in self.pipes:
+            for hanger in by_host.get(pipe.Id.IntegerValue, ()):
+                point = get_point(hanger)
+                if point is not None:
+                    result.append((self.project(point), hanger.Id.IntegerValue))
+        result.sort()
+        return result
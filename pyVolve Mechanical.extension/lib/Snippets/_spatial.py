@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""Plan (XY) spatial indexes shared by the Modeling panel tools.
+
+Everything in here is plain Python (no Revit API), so the indexes can be
+built from any element data the calling script has already read.
+"""
+#IMPORTS
+#==================================================
+import math
+from bisect import bisect_left
+
+#VARIABLES
+#==================================================
+PARALLEL_TOLERANCE  = 1e-3   # |sin(angle)| below which two axes count as parallel
+DIRECTION_TOLERANCE = 1e-6   # unit direction components smaller than this are taken as 0
+
+#FUNCTIONS
+#==================================================
+def unit_direction_2d(start, end):
+    """Returns the normalized (dx, dy) of a segment, or None if it has no length in plan."""
+    dx = end[0] - start[0]
+    dy = end[1] - start[1]
+    length = math.sqrt(dx * dx + dy * dy)
+    if length < 1e-9:
+        return None
+    return dx / length, dy / length
+
+
+def canonical_direction(direction, tolerance=DIRECTION_TOLERANCE):
+    """One sense per axis for a unit direction (2D or 3D), so A->B and B->A lines agree.
+
+    Components within tolerance of 0 are set to 0 first: the sign of float
+    noise must not pick the sense. The first non-zero component is made
+    positive.
+    """
+    snapped = [0.0 if abs(c) < tolerance else c for c in direction]
+    for c in snapped:
+        if c != 0.0:
+            if c < 0.0:
+                snapped = [-v if v else 0.0 for v in snapped]
+            break
+    return tuple(snapped)
+
+
+def is_parallel_2d(dir_a, dir_b, tolerance=PARALLEL_TOLERANCE):
+    """True when two unit directions are parallel (either sense)."""
+    if dir_a is None or dir_b is None:
+        return False
+    return abs(dir_a[0] * dir_b[1] - dir_a[1] * dir_b[0]) <= tolerance
+
+
+def point_segment_distance_2d(point, start, end):
+    """Plan distance from point to the closest point of segment start-end."""
+    px, py = point[0], point[1]
+    ax, ay = start[0], start[1]
+    dx = end[0] - ax
+    dy = end[1] - ay
+    length_sq = dx * dx + dy * dy
+    if length_sq < 1e-18:
+        t = 0.0
+    else:
+        t = ((px - ax) * dx + (py - ay) * dy) / length_sq
+        t = max(0.0, min(1.0, t))
+    cx = ax + t * dx - px
+    cy = ay + t * dy - py
+    return math.sqrt(cx * cx + cy * cy)
+
+
+def point_line_distance_2d(point, start, end):
+    """Plan distance from point to the infinite line through start and end."""
+    direction = unit_direction_2d(start, end)
+    if direction is None:
+        return point_segment_distance_2d(point, start, end)
+    return abs((point[0] - start[0]) * direction[1] - (point[1] - start[1]) * direction[0])
+
+#CLASSES
+#==================================================
+class SegmentGrid(object):
+    """Uniform grid over plan segments for nearest-segment lookups.
+
+    Each segment is registered in every cell its bounding box touches.
+    A query walks outward ring by ring from the query cell and stops as soon
+    as the best distance found is closer than anything the next ring could
+    hold, so a lookup only touches the few cells around the point instead of
+    every segment.
+    """
+
+    def __init__(self, segments, cell_size=None):
+        """segments: iterable of (key, (x0, y0), (x1, y1))."""
+        self.segments  = []
+        self.cells     = {}
+        self.cell_size = 1.0
+        self.bounds    = None
+        self.cells_visited = 0
+
+        segments = [(key, (s[0], s[1]), (e[0], e[1])) for key, s, e in segments]
+        if not segments:
+            return
+
+        min_x = min(min(s[0], e[0]) for _, s, e in segments)
+        min_y = min(min(s[1], e[1]) for _, s, e in segments)
+        max_x = max(max(s[0], e[0]) for _, s, e in segments)
+        max_y = max(max(s[1], e[1]) for _, s, e in segments)
+        self.bounds = (min_x, min_y, max_x, max_y)
+
+        if cell_size is None:
+            # Aim for roughly one segment per cell across the occupied extent
+            extent = max(max_x - min_x, max_y - min_y)
+            cell_size = extent / max(1.0, math.sqrt(len(segments)))
+        self.cell_size = max(float(cell_size), 1.0)
+
+        for key, start, end in segments:
+            index = len(self.segments)
+            self.segments.append((key, start, end, unit_direction_2d(start, end)))
+            i0, j0 = self._cell(min(start[0], end[0]), min(start[1], end[1]))
+            i1, j1 = self._cell(max(start[0], end[0]), max(start[1], end[1]))
+            for i in range(i0, i1 + 1):
+                for j in range(j0, j1 + 1):
+                    self.cells.setdefault((i, j), []).append(index)
+
+    def __len__(self):
+        return len(self.segments)
+
+    def _cell(self, x, y):
+        return int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size))
+
+    def _max_ring(self, ci, cj):
+        """Ring count that is guaranteed to cover the whole occupied grid."""
+        min_x, min_y, max_x, max_y = self.bounds
+        i0, j0 = self._cell(min_x, min_y)
+        i1, j1 = self._cell(max_x, max_y)
+        return max(abs(ci - i0), abs(ci - i1), abs(cj - j0), abs(cj - j1))
+
+    def nearest(self, point, direction=None, max_distance=None, max_offset=None):
+        """Returns (key, distance) of the closest segment to point, or (None, None).
+
+        When direction is given only segments parallel to it are considered.
+        max_offset keeps only segments whose infinite line passes that close
+        to point, however far along it they are; with no max_distance the
+        walk then goes on until one is found or the grid is covered.
+        """
+        if not self.segments:
+            return None, None
+
+        ci, cj = self._cell(point[0], point[1])
+        max_ring = self._max_ring(ci, cj)
+        best_key, best_dist = None, None
+        seen = set()
+
+        ring = 0
+        while ring <= max_ring:
+            for cell in self._ring_cells(ci, cj, ring):
+                self.cells_visited += 1
+                for index in self.cells.get(cell, ()):
+                    if index in seen:
+                        continue
+                    seen.add(index)
+                    key, start, end, seg_dir = self.segments[index]
+                    if direction is not None and not is_parallel_2d(direction, seg_dir):
+                        continue
+                    if max_offset is not None and point_line_distance_2d(point, start, end) > max_offset:
+                        continue
+                    dist = point_segment_distance_2d(point, start, end)
+                    if best_dist is None or dist < best_dist:
+                        best_key, best_dist = key, dist
+
+            # Anything in ring + 1 is at least ring * cell_size away
+            if best_dist is not None and best_dist <= ring * self.cell_size:
+                break
+            if max_distance is not None and ring * self.cell_size > max_distance:
+                break
+            ring += 1
+
+        if best_dist is not None and max_distance is not None and best_dist > max_distance:
+            return None, None
+        return best_key, best_dist
+
+    @staticmethod
+    def _ring_cells(ci, cj, ring):
+        if ring == 0:
+            yield (ci, cj)
+            return
+        for i in range(ci - ring, ci + ring + 1):
+            yield (i, cj - ring)
+            yield (i, cj + ring)
+        for j in range(cj - ring + 1, cj + ring):
+            yield (ci - ring, j)
+            yield (ci + ring, j)
+
+
+class BoxColumnIndex(object):
+    """Plan grid over 3D boxes for "what is directly above this point" lookups.
+
+    Every box (typically a beam or slab bounding box) is registered in the
+    plan cells its XY footprint covers. Each cell keeps its boxes sorted by
+    bottom elevation, along with the height of its tallest box. A query
+    bisects to the lowest bottom that could still reach the point (the point
+    minus that height) and scans upward from there: O(log k) per query for
+    k boxes stacked over the cell, plus the boxes level with the point.
+
+    A box that spans the point's elevation (a sloped deck or a deep beam
+    whose box bottom is below the point) counts as above it: the element's
+    underside there can be anywhere up to the box top.
+    """
+
+    def __init__(self, boxes, cell_size=None):
+        """boxes: iterable of (key, (min_x, min_y, min_z), (max_x, max_y, max_z))."""
+        self.boxes     = []
+        self.cells     = {}
+        self.cell_size = 1.0
+        self.candidates_tested = 0
+
+        boxes = list(boxes)
+        if not boxes:
+            return
+
+        if cell_size is None:
+            # Median footprint span keeps most boxes in a handful of cells
+            spans = sorted(max(mx[0] - mn[0], mx[1] - mn[1]) for _, mn, mx in boxes)
+            cell_size = spans[len(spans) // 2]
+        self.cell_size = max(float(cell_size), 1.0)
+
+        buckets = {}
+        for key, box_min, box_max in boxes:
+            index = len(self.boxes)
+            self.boxes.append((key, box_min, box_max))
+            i0, j0 = self._cell(box_min[0], box_min[1])
+            i1, j1 = self._cell(box_max[0], box_max[1])
+            for i in range(i0, i1 + 1):
+                for j in range(j0, j1 + 1):
+                    buckets.setdefault((i, j), []).append((box_min[2], index))
+
+        for cell, entries in buckets.items():
+            entries.sort()
+            height = max(self.boxes[i][2][2] - z for z, i in entries)
+            self.cells[cell] = ([z for z, _ in entries], [i for _, i in entries], height)
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def _cell(self, x, y):
+        return int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size))
+
+    def _reaching(self, point, tolerance):
+        """(bottom z, key, box top z) of the boxes over point that reach above it, lowest bottom first."""
+        x, y, z = point[0], point[1], point[2]
+        cell = self.cells.get(self._cell(x, y))
+        if not cell:
+            return
+        bottoms, indexes, height = cell
+        for position in range(bisect_left(bottoms, z - height - tolerance), len(bottoms)):
+            self.candidates_tested += 1
+            key, box_min, box_max = self.boxes[indexes[position]]
+            if box_max[2] > z + tolerance and \
+               box_min[0] - tolerance <= x <= box_max[0] + tolerance and \
+               box_min[1] - tolerance <= y <= box_max[1] + tolerance:
+                yield bottoms[position], key, box_max[2]
+
+    def first_above(self, point, tolerance=1e-6):
+        """Returns (key, bottom_z) of the lowest box above point whose footprint covers it.
+
+        A box spanning the point's elevation comes first, with bottom_z at the
+        point; of several, the one with the lowest top. Returns (None, None)
+        when nothing is above.
+        """
+        z = point[2]
+        spanning = None
+        for bottom, key, top in self._reaching(point, tolerance):
+            if bottom >= z - tolerance:
+                if spanning is not None:
+                    break
+                return key, bottom
+            if spanning is None or top < spanning[1]:
+                spanning = (key, top)
+        if spanning is None:
+            return None, None
+        return spanning[0], z
+
+    def others_below(self, point, z_limit, key, tolerance=1e-6):
+        """True when a box other than key covers point and reaches above it with its bottom below z_limit."""
+        for bottom, other, _ in self._reaching(point, tolerance):
+            if bottom >= z_limit:
+                return False
+            if other != key:
+                return True
+        return False
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""Gap spreading shared by Spread by Gap and Align BOI + Adjust Spread."""
+#IMPORTS
+#==================================================
+import math
+
+from Autodesk.Revit.DB import FabricationPart, LocationCurve, BuiltInParameter, StorageType, XYZ
+
+#FUNCTIONS
+#==================================================
+def get_bottom_elevation(element):
+    """FABRICATION_BOTTOM_OF_PART in feet, or None if missing or read-only."""
+    if not element:
+        return None
+    param = element.LookupParameter("FABRICATION_BOTTOM_OF_PART")
+    if not (param and not param.IsReadOnly and param.StorageType == StorageType.Double):
+        param = element.get_Parameter(BuiltInParameter.FABRICATION_BOTTOM_OF_PART)
+        if not (param and not param.IsReadOnly and param.StorageType == StorageType.Double):
+            return None
+    return param.AsDouble()
+
+
+def _round(value, digits):
+    return value if digits is None else round(value, digits)
+
+
+def _plan_start(element, digits=None):
+    loc = element.Location
+    if not loc or not hasattr(loc, "Curve"):
+        return None
+    curve = loc.Curve
+    if not curve:
+        return None
+    start = curve.GetEndPoint(0)
+    return _round(start.X, digits), _round(start.Y, digits)
+
+
+def calculate_gap_between(pipe_a, pipe_b, half_od, digits=None, fabrication_only=False):
+    """(axis, gap) between two pipes in plan, measured from their start points.
+
+    half_od: callable part -> insulated half OD (see _fabparts.HalfOdProvider).
+    axis is ("x", dx) or ("y", dy) for orthogonal pipes, (dx, dy) for
+    diagonal ones, or None when either pipe has no location curve.
+    digits rounds the start points and their offset, as Spread by Gap has
+    always done. With fabrication_only, a pipe that is not a FabricationPart
+    also gives None instead of counting with a zero half OD.
+    """
+    if fabrication_only and not (isinstance(pipe_a, FabricationPart)
+                                 and isinstance(pipe_b, FabricationPart)):
+        return None, 0.0
+    start_a = _plan_start(pipe_a, digits)
+    start_b = _plan_start(pipe_b, digits)
+    if not start_a or not start_b:
+        return None, 0.0
+
+    dx = _round(start_b[0] - start_a[0], digits)
+    dy = _round(start_b[1] - start_a[1], digits)
+    if abs(dx) > 1e-6 and abs(dy) > 1e-6:
+        c2c = math.sqrt(dx * dx + dy * dy)
+        axis = (dx, dy)
+    elif abs(dx) > 1e-6:
+        c2c = abs(dx)
+        axis = ("x", dx)
+    else:
+        c2c = abs(dy)
+        axis = ("y", dy)
+
+    half_a = half_od(pipe_a) if isinstance(pipe_a, FabricationPart) else 0.0
+    half_b = half_od(pipe_b) if isinstance(pipe_b, FabricationPart) else 0.0
+    return axis, c2c - (half_a + half_b)
+
+
+def build_xy_translation(axis, distance_to_move):
+    """XYZ in the plan that moves a pipe distance_to_move further along axis."""
+    if axis is None:
+        return XYZ(0, 0, 0)
+    if isinstance(axis[0], str):
+        direction, value = axis
+        step = distance_to_move if value >= 0 else -distance_to_move
+        return XYZ(step, 0, 0) if direction.lower() == 'x' else XYZ(0, step, 0)
+    dx, dy = axis
+    length = math.sqrt(dx * dx + dy * dy)
+    if length <= 1e-9:
+        return XYZ(0, 0, 0)
+    scale = distance_to_move / length
+    return XYZ(dx * scale, dy * scale, 0)
+
+
+def move_fabrication_part(part, translation):
+    """Moves the part's location curve. Returns False for parts without one."""
+    loc = part.Location
+    if isinstance(loc, LocationCurve):
+        loc.Move(translation)
+        return True
+    return False
+
+
+def spread_by_gap(reference, pipes, gap, half_od, bottom_elevation=None,
+                  digits=None, fabrication_only=False):
+    """Moves pipes, in pick order, so each sits gap (ft) from the one before it.
+
+    The first pipe is spaced from reference, every next pipe from the last
+    pipe that could be measured or moved; pipes that could be neither are
+    skipped. With bottom_elevation, each pipe is also moved up or down so
+    its bottom matches it, in the same move. digits and fabrication_only
+    are passed to calculate_gap_between.
+    Runs inside the caller's transaction.
+    Returns a list of (pipe, translation) for the pipes that moved.
+    """
+    moved = []
+    previous = reference
+    for pipe in pipes:
+        axis, existing_gap = calculate_gap_between(previous, pipe, half_od,
+                                                   digits, fabrication_only)
+        if axis is None and bottom_elevation is None:
+            continue
+        xy = build_xy_translation(axis, gap - existing_gap)
+
+        z_move = 0.0
+        if bottom_elevation is not None:
+            pipe_bottom = get_bottom_elevation(pipe)
+            if pipe_bottom is not None:
+                z_move = bottom_elevation - pipe_bottom
+
+        translation = XYZ(xy.X, xy.Y, z_move)
+        if move_fabrication_part(pipe, translation):
+            moved.append((pipe, translation))
+            previous = pipe
+        elif axis is not None:
+            previous = pipe
+    return moved
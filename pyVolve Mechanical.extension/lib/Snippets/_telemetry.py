@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""Per-run timings of pyVolve tools, appended to a local JSONL log.
+
+    TELEMETRY = ToolRun(__title__, doc)
+    with TELEMETRY:
+        ...                          # starts in the "selection" phase
+        TELEMETRY.phase("read")
+        ...
+        TELEMETRY.count("parts", len(parts))
+
+Phases run back to back: phase() ends the current one and starts the next,
+so a script only marks where each phase begins. Anything after the work
+(result dialogs) goes in a 'report' phase, which is logged but not counted. One line per run is written
+to telemetry.jsonl in LOG_DIR (or the 'telemetry_dir' setting); the log is
+rotated at MAX_BYTES, keeping BACKUPS old files. Set 'telemetry' to 0 to
+turn it off. Writing the log never fails a tool.
+"""
+#IMPORTS
+#==================================================
+import json
+import os
+import time
+
+from Snippets._settings import TELEMETRY, TELEMETRY_DIR, is_enabled, get_setting
+
+#VARIABLES
+#==================================================
+PHASES   = ("selection", "read", "compute", "transaction", "commit")
+LOG_DIR  = os.path.join(os.environ.get("APPDATA") or os.path.expanduser("~"), "pyVolve")
+LOG_NAME = "telemetry.jsonl"
+MAX_BYTES = 1024 * 1024
+BACKUPS   = 3
+
+clock = getattr(time, "perf_counter", None) or time.clock
+
+#FUNCTIONS
+#==================================================
+def log_dir():
+    return get_setting(TELEMETRY_DIR) or LOG_DIR
+
+
+def log_paths(directory=None):
+    """The log and its backups, oldest first."""
+    directory = directory or log_dir()
+    root, ext = os.path.splitext(LOG_NAME)
+    backups = [os.path.join(directory, "{0}.{1}{2}".format(root, i, ext)) for i in range(BACKUPS, 0, -1)]
+    return backups + [os.path.join(directory, LOG_NAME)]
+
+
+def _rotate(paths):
+    current = paths[-1]
+    if not os.path.exists(current) or os.path.getsize(current) < MAX_BYTES:
+        return
+    if os.path.exists(paths[0]):
+        os.remove(paths[0])
+    for older, newer in zip(paths, paths[1:]):
+        if os.path.exists(newer):
+            os.rename(newer, older)
+
+
+def append_record(record, directory=None):
+    """Appends one JSON line to the log, rotating it first when it is full."""
+    paths = log_paths(directory)
+    folder = os.path.dirname(paths[-1])
+    if not os.path.isdir(folder):
+        os.makedirs(folder)
+    _rotate(paths)
+    with open(paths[-1], 'a') as f:
+        f.write(json.dumps(record, sort_keys=True) + "\n")
+
+
+def read_records(directory=None):
+    """Every record in the log and its backups, oldest first; bad lines are skipped."""
+    records = []
+    for path in log_paths(directory):
+        if not os.path.exists(path):
+            continue
+        with open(path, 'r') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    return records
+
+
+def document_info(doc):
+    """Model name, path and file size. Workshared models are named after their central."""
+    info = {"model": "", "path": "", "file_bytes": 0}
+    if doc is None:
+        return info
+    try:
+        info["model"] = doc.Title
+        info["path"] = doc.PathName or ""
+        if doc.IsWorkshared:
+            from Autodesk.Revit.DB import ModelPathUtils
+            central = ModelPathUtils.ConvertModelPathToUserVisiblePath(doc.GetWorksharingCentralModelPath())
+            info["model"] = os.path.splitext(os.path.basename(central))[0]
+        if info["path"] and os.path.exists(info["path"]):
+            info["file_bytes"] = os.path.getsize(info["path"])
+    except Exception:
+        pass
+    return info
+
+
+def percentile(values, p):
+    """p-th percentile (0-100) of values, interpolated between ranks."""
+    values = sorted(values)
+    if not values:
+        return 0.0
+    rank = (len(values) - 1) * p / 100.0
+    low = int(rank)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+def work_seconds(record):
+    """Time spent in the work phases: read, compute, transaction and commit.
+
+    Selection is mostly the user picking, and phases outside PHASES (such as
+    'report', the result dialogs) wait on the user too, so neither counts.
+    """
+    phases = record.get("phases", {})
+    return sum(phases.get(name, 0.0) for name in PHASES[1:])
+
+
+def summarize(records, by_model=True):
+    """p50/p95 of work time per (tool, model), or per tool, slowest p95 first.
+
+    Only completed runs count, and not profiled ones. Returns a list of dicts with tool, model, runs,
+    p50, p95, elements (median of the largest count) and slowest_phase.
+    """
+    groups = {}
+    for record in records:
+        if record.get("status") != "ok" or record.get("profiled"):
+            continue
+        model = record.get("model", "") if by_model else ""
+        groups.setdefault((record.get("tool", ""), model), []).append(record)
+
+    rows = []
+    for (tool, model), runs in groups.items():
+        times = [work_seconds(r) for r in runs]
+        phase_p95 = {}
+        for name in PHASES[1:]:
+            values = [r["phases"][name] for r in runs if name in r.get("phases", {})]
+            if values:
+                phase_p95[name] = percentile(values, 95)
+        sizes = [max(r.get("counts", {}).values() or [0]) for r in runs]
+        rows.append({
+            "tool":          tool,
+            "model":         model,
+            "runs":          len(runs),
+            "p50":           percentile(times, 50),
+            "p95":           percentile(times, 95),
+            "elements":      int(percentile(sizes, 50)),
+            "slowest_phase": max(phase_p95, key=phase_p95.get) if phase_p95 else "",
+        })
+    rows.sort(key=lambda r: r["p95"], reverse=True)
+    return rows
+
+#CLASSES
+#==================================================
+class ToolRun(object):
+    """Phase timings and element counts of one tool run."""
+
+    def __init__(self, tool, doc=None, enabled=None):
+        self.tool    = tool
+        self.doc     = doc
+        self.enabled = is_enabled(TELEMETRY, True) if enabled is None else enabled
+        self.phases  = {}
+        self.counts  = {}
+        self.status  = None
+        self.profiled = False
+        self._phase  = PHASES[0]
+        self._start  = clock()
+        self._lap    = self._start
+
+    def phase(self, name):
+        """Ends the current phase and starts name."""
+        now = clock()
+        self.phases[self._phase] = self.phases.get(self._phase, 0.0) + now - self._lap
+        self._phase, self._lap = name, now
+
+    def count(self, name, value):
+        self.counts[name] = value
+
+    def finish(self, status="ok"):
+        """Closes the last phase and writes the record once."""
+        if self.status is not None:
+            return
+        self.phase(None)
+        # Runs that never got past selection were cancelled by the user
+        if status == "ok" and set(self.phases) <= set([PHASES[0]]):
+            status = "cancelled"
+        self.status = status
+        if not self.enabled:
+            return
+        record = {
+            "time":    time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "tool":    self.tool,
+            "status":  status,
+            "total":   round(clock() - self._start, 4),
+            "phases":  dict((k, round(v, 4)) for k, v in self.phases.items() if k),
+            "counts":  self.counts,
+            "profiled": self.profiled,
+        }
+        record.update(document_info(self.doc))
+        try:
+            append_record(record)
+        except Exception:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None or issubclass(exc_type, SystemExit):
+            self.finish()
+        else:
+            self.finish("error")
+        return False
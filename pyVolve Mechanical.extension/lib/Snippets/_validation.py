@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+"""Quick checks on the fabrication parts changed since the last sync, within a time budget.
+
+Run by the doc-syncing hook on the ids collected by Snippets._session:
+
+    - Insulation:  pipework of a service listed in InsulationSpecs.csv carries
+                   the specification its size calls for
+    - Hanger host: hangers are hosted, and their host still exists
+    - Elevation:   pipes sit within ELEVATION_TOLERANCE of the nearest
+                   parallel pipe tagged REFERENCE_TAG in Comments
+
+Everything, reading the changed parts included, is done in chunks that
+stop at the budget; whatever was not reached is reported as not checked
+instead of holding up the sync. A part that raises is reported as not
+checked (error) and the checks go on with the next one.
+"""
+#IMPORTS
+#==================================================
+import math
+import time
+from collections import Counter
+
+from Autodesk.Revit.DB import (FilteredElementCollector, BuiltInCategory, BoundingBoxIntersectsFilter,
+                               ElementId, FabricationPart, Outline, XYZ)
+
+from Snippets._alignment import ELEVATION_PARAMS, get_elevation, align_to_nearest_reference
+from Snippets._fabparts import parse_size_to_inches
+from Snippets._hangers import FLAG_PARAM, audit_hosts
+from Snippets._insulation import load_insulation_specs, find_insulation_spec
+from Snippets._session import changed_ids
+from Snippets._settings import PRESYNC, PRESYNC_BUDGET, is_enabled, get_setting
+from Snippets._telemetry import ToolRun
+
+#VARIABLES
+#==================================================
+BUDGET_SECONDS = 2.0
+
+REFERENCE_TAG       = "Elevation Reference"
+REFERENCE_PARAM     = ELEVATION_PARAMS["Bottom of Insulation (BOI)"]
+REFERENCE_DISTANCE  = 10.0          # ft, how far in plan a reference is looked for
+ELEVATION_TOLERANCE = 0.5 / 12.0    # 1/2"
+
+CHECK_READ       = "Read"
+CHECK_INSULATION = "Insulation"
+CHECK_HOST       = "Hanger host"
+CHECK_ELEVATION  = "Elevation"
+
+# Parts checked between two looks at the clock
+CHUNK = 50
+
+clock = getattr(time, "perf_counter", None) or time.clock
+
+#FUNCTIONS
+#==================================================
+def _chunks(items):
+    for i in range(0, len(items), CHUNK):
+        yield items[i:i + CHUNK]
+
+
+def is_reference(part):
+    param = part.LookupParameter(FLAG_PARAM)
+    return bool(param) and param.AsString() == REFERENCE_TAG
+
+
+def plan_cell(part):
+    """REFERENCE_DISTANCE plan cell of part's bounding box center; () without a box."""
+    bbox = part.get_BoundingBox(None)
+    if bbox is None:
+        return ()
+    return (int(math.floor((bbox.Min.X + bbox.Max.X) / 2.0 / REFERENCE_DISTANCE)),
+            int(math.floor((bbox.Min.Y + bbox.Max.Y) / 2.0 / REFERENCE_DISTANCE)))
+
+
+def references_near(doc, parts, tested):
+    """Tagged reference pipes within REFERENCE_DISTANCE of the box around parts.
+
+    One bounding box filter per call, so the cost stays small and the clock
+    can be checked between calls. parts should be close together (see
+    check_elevations), or the box takes in half the building. tested maps ids already looked at to the
+    part (or None) so each pipe's Comments are read once.
+    """
+    boxes = [b for b in (p.get_BoundingBox(None) for p in parts) if b is not None]
+    if not boxes:
+        return []
+    grow = XYZ(REFERENCE_DISTANCE, REFERENCE_DISTANCE, REFERENCE_DISTANCE)
+    low  = XYZ(min(b.Min.X for b in boxes), min(b.Min.Y for b in boxes), min(b.Min.Z for b in boxes))
+    high = XYZ(max(b.Max.X for b in boxes), max(b.Max.Y for b in boxes), max(b.Max.Z for b in boxes))
+    collector = (FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_FabricationPipework)
+                 .WhereElementIsNotElementType()
+                 .WherePasses(BoundingBoxIntersectsFilter(Outline(low - grow, high + grow))))
+    references = []
+    for part in collector:
+        key = part.Id.IntegerValue
+        if key not in tested:
+            tested[key] = part if isinstance(part, FabricationPart) and is_reference(part) else None
+        if tested[key] is not None:
+            references.append(tested[key])
+    return references
+
+
+def check_insulation(parts, specs, report):
+    services = set(spec['Service'] for spec in specs)
+    for chunk in _chunks(parts):
+        if report.out_of_time(CHECK_INSULATION, chunk):
+            continue
+        for part in chunk:
+            try:
+                if part.ServiceName in services:
+                    expected = find_insulation_spec(specs, part.ServiceName, parse_size_to_inches(part.Size))
+                    if part.InsulationSpecification != expected:
+                        report.add(part, CHECK_INSULATION, "specification {0}, rules call for {1}".format(
+                            part.InsulationSpecification, expected))
+            except Exception as e:
+                report.fail(part.Id.IntegerValue, CHECK_INSULATION, e)
+                continue
+            report.checked[CHECK_INSULATION] += 1
+
+
+def check_hosts(doc, hangers, report):
+    for chunk in _chunks(hangers):
+        if report.out_of_time(CHECK_HOST, chunk):
+            continue
+        audit = audit_hosts(doc, chunk)
+        report.checked[CHECK_HOST] += len(chunk) - len(audit.errors)
+        for hanger, message in audit.errors:
+            report.fail(hanger.Id.IntegerValue, CHECK_HOST, message)
+        for hanger in audit.unhosted:
+            report.add(hanger, CHECK_HOST, "not hosted")
+        for hanger in audit.host_missing:
+            report.add(hanger, CHECK_HOST, "host missing")
+
+
+def _plan_chunks(pipes):
+    """Chunks of pipes from one plan cell each; pipes is a list of (plan cell, pipe)."""
+    cells = {}
+    for cell, pipe in pipes:
+        cells.setdefault(cell, []).append(pipe)
+    for cell in sorted(cells):
+        for chunk in _chunks(cells[cell]):
+            yield chunk
+
+
+def _elevation_issues(doc, chunk, tested):
+    """(part, detail) for the pipes of chunk off their reference; raises on the first unreadable part."""
+    references = references_near(doc, chunk, tested)
+    if not references:
+        return []
+    issues = []
+    assignments, _ = align_to_nearest_reference(references, chunk, REFERENCE_PARAM, REFERENCE_DISTANCE)
+    for part, ref, target in assignments:
+        elevation = get_elevation(part, REFERENCE_PARAM)
+        if elevation is not None and abs(elevation - target) > ELEVATION_TOLERANCE:
+            issues.append((part, "{0:+.2f}\" from reference {1}".format(
+                (elevation - target) * 12.0, ref.Id.IntegerValue)))
+    return issues
+
+
+def check_elevations(doc, pipes, report):
+    """pipes: (plan cell, pipe) pairs, as read by read_changed_parts."""
+    tested = {}
+    # Pipes of one cell share references and keep the boxes tight
+    for chunk in _plan_chunks(pipes):
+        if report.out_of_time(CHECK_ELEVATION, chunk):
+            continue
+        try:
+            issues = _elevation_issues(doc, chunk, tested)
+        except Exception:
+            # Check the chunk's pipes one at a time to find the ones at fault
+            issues = []
+            for part in chunk:
+                try:
+                    issues += _elevation_issues(doc, [part], tested)
+                except Exception as e:
+                    report.fail(part.Id.IntegerValue, CHECK_ELEVATION, e)
+                    continue
+                report.checked[CHECK_ELEVATION] += 1
+        else:
+            report.checked[CHECK_ELEVATION] += len(chunk)
+        for part, detail in issues:
+            report.add(part, CHECK_ELEVATION, detail)
+
+
+def read_changed_parts(doc, element_ids, report):
+    """(pipes as (plan cell, pipe) pairs, hangers) behind element_ids, read a chunk at a time.
+
+    Deleted elements are skipped; ids not reached within the budget are
+    counted as not read.
+    """
+    pipework = ElementId(BuiltInCategory.OST_FabricationPipework)
+    pipes, hangers = [], []
+    for chunk in _chunks(list(element_ids)):
+        if report.out_of_time(CHECK_READ, chunk):
+            continue
+        report.checked[CHECK_READ] += len(chunk)
+        for element_id in chunk:
+            try:
+                part = doc.GetElement(ElementId(element_id))
+                if not isinstance(part, FabricationPart) or part.Category is None:
+                    continue
+                if part.IsAHanger():
+                    hangers.append(part)
+                elif part.Category.Id == pipework:
+                    pipes.append((plan_cell(part), part))
+            except Exception as e:
+                report.fail(element_id, CHECK_READ, e)
+    return pipes, hangers
+
+
+def run_presync_checks(doc, element_ids, specs, budget=BUDGET_SECONDS):
+    """Checks the parts behind element_ids (ints). Returns a PresyncReport.
+
+    specs are the rows of InsulationSpecs.csv (see load_insulation_specs).
+    Deleted elements are skipped.
+    """
+    report = PresyncReport(budget)
+    pipes, hangers = read_changed_parts(doc, element_ids, report)
+
+    check_hosts(doc, hangers, report)
+    check_insulation([pipe for _, pipe in pipes], specs, report)
+    check_elevations(doc, pipes, report)
+    report.seconds = clock() - report.started
+    return report
+
+
+def check_before_sync(doc, specs_csv):
+    """Runs the checks on the parts changed since the last sync, unless switched off.
+
+    Reads the budget from the 'presync_budget' setting and logs the run to
+    the telemetry log. Returns the PresyncReport, or None when the checks
+    are off or failed: a check must never stop the sync.
+    """
+    if not is_enabled(PRESYNC, True):
+        return None
+    try:
+        budget = float(get_setting(PRESYNC_BUDGET, BUDGET_SECONDS))
+    except (TypeError, ValueError):
+        budget = BUDGET_SECONDS
+    try:
+        specs = load_insulation_specs(specs_csv)
+    except Exception:
+        specs = []
+
+    run = ToolRun("Pre-sync Checks", doc)
+    try:
+        with run:
+            run.phase("compute")
+            ids = changed_ids(doc)
+            report = run_presync_checks(doc, ids, specs, budget)
+            run.count("parts", len(ids))
+            run.count("issues", len(report.issues))
+            run.count("unchecked", sum(report.unchecked.values()))
+            run.count("errors", len(report.errors))
+    except Exception:
+        return None
+    return report
+
+#CLASSES
+#==================================================
+class PresyncReport(object):
+    """Issues found, and parts checked or left unchecked, per check."""
+
+    def __init__(self, budget):
+        self.started   = clock()
+        self.deadline  = self.started + budget
+        self.issues    = []        # (element id, check, detail)
+        self.errors    = []        # (element id, check, message) of parts that could not be checked
+        self.checked   = Counter()
+        self.unchecked = Counter()
+        self.failed    = Counter()
+        self.seconds   = 0.0
+
+    def out_of_time(self, check, parts):
+        """True, counting parts as unchecked, once the budget is spent."""
+        if clock() < self.deadline:
+            return False
+        self.unchecked[check] += len(parts)
+        return True
+
+    def add(self, part, check, detail):
+        self.issues.append((part.Id.IntegerValue, check, detail))
+
+    def fail(self, element_id, check, error):
+        """Records element_id as not checked (error)."""
+        self.failed[check] += 1
+        self.errors.append((element_id, check, str(error)))
+
+    @property
+    def clean(self):
+        return not self.issues and not self.unchecked and not self.errors
+
+    def summary(self):
+        lines = ["Pre-sync checks: {0} issue(s) in {1:.2f} s".format(len(self.issues), self.seconds)]
+        if self.unchecked[CHECK_READ] or self.failed[CHECK_READ]:
+            line = "  Changed parts: {0} read".format(self.checked[CHECK_READ] - self.failed[CHECK_READ])
+            if self.unchecked[CHECK_READ]:
+                line += ", {0} not read (time budget)".format(self.unchecked[CHECK_READ])
+            if self.failed[CHECK_READ]:
+                line += ", {0} not read (error)".format(self.failed[CHECK_READ])
+            lines.append(line)
+        for check in (CHECK_INSULATION, CHECK_HOST, CHECK_ELEVATION):
+            line = "  {0}: {1} checked".format(check, self.checked[check])
+            if self.unchecked[check]:
+                line += ", {0} not checked (time budget)".format(self.unchecked[check])
+            if self.failed[check]:
+                line += ", {0} not checked (error)".format(self.failed[check])
+            lines.append(line)
+        for element_id, check, detail in self.issues:
+            lines.append("  {0} - {1}: {2}".format(element_id, check, detail))
+        for element_id, check, message in self.errors:
+            lines.append("  {0} - {1}: not checked (error: {2})".format(element_id, check, message))
+        return "\n".join(lines)
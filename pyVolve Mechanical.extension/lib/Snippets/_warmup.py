@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""Builds the cached part indexes of a document a few milliseconds at a time while Revit is idle.
+
+    start_warmup(uiapp, doc)        # from the doc-opened hook
+
+Every Idling tick takes the next fabrication parts from one element
+collector, reads each of them once into all the indexes being built, stops
+after about SLICE_SECONDS and asks Revit to raise Idling again straight
+away, so the UI stays responsive while the work keeps going. A collector
+that fails because the model changed in between is started again, skipping
+the parts already read. Finished indexes are handed to
+Snippets._cache, where the first click finds them warm. Indexes saved in
+the model's sidecar file (Snippets._sidecar) are loaded first and not
+built at all; a job that saw no change to the model saves its indexes
+there for the next session. The job is
+resumable: its place survives between ticks, model changes made
+meanwhile are patched in by the cache, and a button asking for an index
+that is not done yet completes just that one (complete()). Closing or
+syncing the document, or cancel_warmup(), cancels it.
+"""
+#IMPORTS
+#==================================================
+import time
+
+from Autodesk.Revit.DB import FilteredElementCollector, FabricationPart
+
+from Snippets._cache import (PartsByService, PartsBySize, HangerHosts, SpatialBuckets, GeometryRecords,
+                             document_cache, is_cached, feed)
+from Snippets._settings import CACHE, WARMUP, is_enabled
+from Snippets._sidecar import load_sidecar, save_sidecar
+
+#VARIABLES
+#==================================================
+WARM_INDEXES  = (PartsByService, PartsBySize, HangerHosts, SpatialBuckets, GeometryRecords)
+SLICE_SECONDS = 0.005
+BATCH         = 25          # parts read between two looks at the clock
+MAX_RESTARTS  = 20          # collectors started over before the job gives up
+
+clock = getattr(time, "perf_counter", None) or time.clock
+
+#FUNCTIONS
+#==================================================
+def start_warmup(uiapp, doc, index_classes=WARM_INDEXES):
+    """Starts warming doc's indexes on uiapp's Idling event. Returns the WarmupJob, or None.
+
+    Family documents, linked models, documents already warming and documents
+    whose indexes are all cached, or loaded from the sidecar, are skipped.
+    """
+    if not (is_enabled(CACHE, True) and is_enabled(WARMUP, True)):
+        return None
+    if doc.IsFamilyDocument or doc.IsLinked:
+        return None
+    cache = document_cache(doc)
+    if cache.warmup is not None:
+        return cache.warmup
+    if not cache.indexes:
+        load_sidecar(doc)
+
+    job = WarmupJob(doc, cache, index_classes)
+    if job.done:
+        return None
+    cache.warmup = job
+
+    def on_idling(sender, args):
+        try:
+            more = job.step()
+        except Exception:
+            job.cancel()
+            more = False
+        if more:
+            args.SetRaiseWithoutDelay()
+        else:
+            sender.Idling -= on_idling
+
+    uiapp.Idling += on_idling
+    return job
+
+
+def cancel_warmup(doc):
+    cache = document_cache(doc)
+    if cache.warmup is not None:
+        cache.warmup.cancel()
+
+#CLASSES
+#==================================================
+class WarmupJob(object):
+    """Resumable build of several indexes of one document."""
+
+    def __init__(self, doc, cache, index_classes=WARM_INDEXES):
+        self.doc       = doc
+        self.cache     = cache
+        self.pending   = dict((cls.name, cls()) for cls in index_classes if cls.name not in cache.indexes)
+        self.parts     = None       # iterator over the fabrication parts, None until the first tick
+        self.seen      = set()      # ids of the parts read so far
+        self.finished  = False      # every part has been read
+        self.restarts  = 0
+        self.cancelled = False
+        self.busy      = 0.0        # seconds spent in ticks so far
+        self.generation = cache.generation
+
+    @property
+    def done(self):
+        return not self.pending
+
+    @property
+    def read(self):
+        """Number of parts read so far."""
+        return len(self.seen)
+
+    def step(self, seconds=SLICE_SECONDS):
+        """Works for about seconds. Returns True while there is more to do."""
+        if self.cancelled or self.done:
+            return False
+        if not is_cached(self.doc, self.cache):
+            # Dropped or evicted: there is nowhere to put the indexes
+            self.cancel()
+            return False
+
+        start = clock()
+        indexes = list(self.pending.values())
+        while not self.finished and clock() - start < seconds:
+            for part in self._next_parts(BATCH):
+                feed(part, indexes)
+        if self.finished:
+            for name in list(self.pending):
+                self._install(name)
+        self.busy += clock() - start
+        return not self.done
+
+    def complete(self, name):
+        """Finishes one index now, for a button that needs it before the job gets there."""
+        if not self.seen:
+            # Nothing read yet: a plain build is just as quick
+            self.pending.pop(name)
+            self._finish_if_done()
+            return
+        index = self.pending[name]
+        # A collector of its own, so the job's place is kept for the other indexes
+        for part in FilteredElementCollector(self.doc).OfClass(FabricationPart):
+            if part.Id.IntegerValue not in self.seen:
+                feed(part, [index])
+        self._install(name)
+
+    def cancel(self):
+        self.cancelled = True
+        self.pending = {}
+        self._finish_if_done()
+
+    def _next_parts(self, count):
+        """Up to count parts not read yet; sets finished once the collector runs out."""
+        if self.parts is None:
+            self.parts = iter(FilteredElementCollector(self.doc).OfClass(FabricationPart))
+        batch = []
+        try:
+            for part in self.parts:
+                element_id = part.Id.IntegerValue
+                if element_id in self.seen:
+                    continue
+                self.seen.add(element_id)
+                batch.append(part)
+                if len(batch) >= count:
+                    return batch
+        except Exception:
+            # The model changed under the collector: start over next time, skipping what was read
+            self.restarts += 1
+            if self.restarts > MAX_RESTARTS:
+                raise
+            self.parts = None
+            return batch
+        self.finished = True
+        return batch
+
+    def _install(self, name):
+        self.cache.install(name, self.pending.pop(name))
+        self._finish_if_done()
+
+    def _finish_if_done(self):
+        if not (self.done and self.cache.warmup is self):
+            return
+        self.cache.warmup = None
+        if not self.cancelled and self.cache.generation == self.generation:
+            # Built from the model as saved: worth keeping for the next session
+            save_sidecar(self.doc)
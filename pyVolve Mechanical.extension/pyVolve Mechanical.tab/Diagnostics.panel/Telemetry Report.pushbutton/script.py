@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+__title__   = "Telemetry Report"
+__doc__     = """Version = 1.1
+Date    = 10.19.2026
+________________________________________________________________
+Description:
+Summarizes the local pyVolve telemetry log: how long each tool takes,
+per tool and per model. Times exclude the selection phase (the user
+picking elements); p50 is the typical run, p95 the slow ones.
+Cancelled and failed runs are left out. Synchronize with Central,
+Save and Reload Latest are listed too, with the fabrication parts
+changed since the last sync as their element count.
+________________________________________________________________
+How-To:
+Click Pushbutton. The log lives in %APPDATA%\\pyVolve unless the
+'telemetry_dir' setting points elsewhere.
+________________________________________________________________
+Last Updates:
+- [10.19.2026] - 1.0 - RELEASE
+- [10.19.2026] - 1.1 - Sync, save and reload timings from the extension hooks
+________________________________________________________________
+Author: Sam Robles
+"""
+__author__ = "Sam Robles"
+__helpurl__ = "https://github.com/SRobles512/pyVolve-Mechanical/wiki"
+__min_revit_ver__ = 2022
+__max_revit_ver__ = 2024
+
+#IMPORTS
+#==================================================
+from pyrevit import forms, script
+
+from Snippets._telemetry import read_records, summarize, log_paths
+
+#VARIABLES
+#==================================================
+output = script.get_output()
+
+#FUNCTIONS
+#==================================================
+def print_summary(rows, by_model, title):
+    table = []
+    for row in rows:
+        line = [row["tool"]]
+        if by_model:
+            line.append(row["model"] or "-")
+        line += [row["runs"], "{0:.2f}".format(row["p50"]), "{0:.2f}".format(row["p95"]),
+                 row["elements"], row["slowest_phase"] or "-"]
+        table.append(line)
+    columns = ["Tool"] + (["Model"] if by_model else []) + ["Runs", "p50 (s)", "p95 (s)", "Elements", "Slowest Phase"]
+    output.print_table(table, columns=columns, title=title)
+
+#MAIN
+#==================================================
+records = read_records()
+completed = [r for r in records if r.get("status") == "ok"]
+
+if not completed:
+    forms.alert("No completed tool runs in the telemetry log yet.\n{0}".format(log_paths()[-1]),
+                title="Telemetry Report")
+else:
+    print("{0} runs logged, {1} completed, from {2} to {3}.".format(
+        len(records), len(completed), records[0].get("time", "?"), records[-1].get("time", "?")))
+    print_summary(summarize(records, by_model=False), False, "Per Tool")
+    print_summary(summarize(records, by_model=True), True, "Per Tool and Model")
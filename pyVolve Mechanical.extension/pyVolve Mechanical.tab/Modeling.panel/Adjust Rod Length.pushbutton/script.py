@@ -1,21 +1,31 @@
 # -*- coding: utf-8 -*-
 __title__ = "Adjust Rod Length"  
-__doc__ = """Version = 1.0
-Date    = 12.30.2024
+__doc__ = """Version = 1.7
+Date    = 10.19.2026
 _____________________________________________________________________
 Description:
 This tool modifies the rod length on MEP Fabrication Hangers that are attached to structure.
+All rods of all hangers are set in a single transaction (one undo step).
+"Measure To Structure Above" also sizes rods that are not attached:
+each rod is measured up to the beam or deck above it, so sloped decks
+and varying beam depths get their own length.
 _____________________________________________________________________
 Instructions:
--> Select the hanger you want to modify.
+-> Select the hangers you want to modify
+   (or select nothing and pick Active View / Entire Model).
+-> Choose "Same Extension For All Rods" or "Measure To Structure Above".
 -> Input desired distance from structure you want the top of the rod. 
 -> Click enter. 
 _____________________________________________________________________
 Last update:
 - [12.30.2024] - 1.0 - Release
-_____________________________________________________________________
-To-Do:
-- Allow selection of multiple hangers
+- [10.19.2026] - 1.1 - Multiple hangers, single transaction
+- [10.19.2026] - 1.2 - Measure To Structure Above mode
+- [10.19.2026] - 1.3 - Phase timings logged to the pyVolve telemetry log
+- [10.19.2026] - 1.4 - Shift-click runs it under the profiler (see Snippets._profiler)
+- [10.19.2026] - 1.5 - Collecting the hangers is timed as "read", not as "selection"
+- [10.19.2026] - 1.6 - Runs with failures are not reported as successful; errors are logged as such
+- [10.19.2026] - 1.7 - Hangers are picked with the shared Snippets._hangers.get_hangers
 _____________________________________________________________________
 Author: Sam Robles"""                                           
 
@@ -36,11 +46,16 @@ from System.Windows.Forms import (
     FormStartPosition, MessageBox
 )
 from System.Drawing import Point, Size, Font
-import re
 import traceback
 
 #Revit & pyRevit Imports
-from pyrevit import DB, revit
+from pyrevit import DB, revit, forms
+
+#Custom Imports
+from Snippets._hangers import get_hangers
+from Snippets._rods import set_rod_extensions, set_rod_lengths_to_structure, get_3d_view, parse_distance
+from Snippets._profiler import profiled
+from Snippets._telemetry import ToolRun
 
 # VARIABLES
 # ==================================================
@@ -50,6 +65,10 @@ uidoc     = __revit__.ActiveUIDocument            #type: Document       # UIDocu
 selection = uidoc.Selection                       #type: Selection
 app       = __revit__.Application                 #type: UIApplication  # Represents the Autodesk Revit Application, providing access to documents, options and other application wide data and settings.
 rvt_year  = int(app.VersionNumber)                # e.g. 2023
+TELEMETRY = ToolRun(__title__, doc)
+
+MODE_EXTENSION = "Same Extension For All Rods"
+MODE_MEASURE   = "Measure To Structure Above"
 
 # MAIN
 # ==================================================
@@ -126,98 +145,50 @@ class DistanceInputForm(Form):
             self.Close()
 
     def validate_input(self, input_text):
-        # Regex for valid formats
-        pattern = (
-            r"^(\d+' \d+-\d+/\d+\")|"  # e.g. 0' 0-1/2"
-            r"(\d+-\d+/\d+\")|"        # e.g. 1-1/2"
-            r"(\d+/\d+\")|"            # e.g. 1/2"
-            r"(\d+' \d+\")|"           # e.g. 1' 1"
-            r"(\d+\")|"                # e.g. 1"
-            r"(\d+')$"                 # e.g. 1'
-        )
-        return bool(re.match(pattern, input_text))
+        # Same formats as the rod extension presets
+        return parse_distance(input_text) is not None
 
     def convert_to_decimal_feet(self, input_text):
-        # Handle conversion based on input format
-
-        # 1) Feet + Inches + Fraction, e.g. "0' 0-1/2"
-        if "'" in input_text and "-" in input_text:  
-            feet, rest = input_text.split("'")
-            feet = int(feet.strip())
-            inches, fraction = rest.split("-")
-            inches = int(inches.strip())
-            num, denom = map(int, fraction[:-1].split("/"))  # remove the trailing "
-            fraction_val = float(num) / float(denom)
-            return float(feet) + float(inches + fraction_val) / 12.0
-
-        # 2) Inches + Fraction only, e.g. "1-1/2"
-        elif "-" in input_text:  
-            inches, fraction = input_text.split("-")
-            inches = int(inches.strip())
-            num, denom = map(int, fraction[:-1].split("/"))  # remove "
-            fraction_val = float(num) / float(denom)
-            return float(inches + fraction_val) / 12.0
-
-        # 3) Fraction only, e.g. "1/2"
-        elif "/" in input_text:  
-            num, denom = map(int, input_text[:-1].split("/"))  # remove "
-            fraction_val = float(num) / float(denom)
-            return float(fraction_val) / 12.0
-
-        # 4) Feet + Inches, e.g. "1' 6""
-        elif "'" in input_text and '"' in input_text:  
-            feet, inches = input_text.split("'")
-            feet = int(feet.strip())
-            inches = int(inches[:-1].strip())  # remove "
-            return float(feet) + float(inches) / 12.0
-
-        # 5) Inches only, e.g. "6""
-        elif '"' in input_text:  
-            inches = int(input_text[:-1].strip())  # remove "
-            return float(inches) / 12.0
-
-        # 6) Feet only, e.g. "1'"
-        elif "'" in input_text:  
-            feet = int(input_text[:-1].strip())  # remove '
-            return float(feet)
-
-        # Fallback
-        return 0.0
+        return parse_distance(input_text) or 0.0
 
 
 # ---------------------------------------------------------
 # MAIN SCRIPT 
 # ---------------------------------------------------------
+@profiled(TELEMETRY)
 def main():
     
     try:
-        # Get the currently selected element(s)
-        selection = revit.get_selection()
-        if not selection:
-            MessageBox.Show("No elements selected. Please select an element and run the script again.",
+        hangers, skipped = get_hangers(doc, selection.GetElementIds(), "No hangers selected. Adjust hangers in:",
+                                       TELEMETRY)
+        if skipped:
+            print("Skipped {0} selected element(s) that are not hangers.".format(len(skipped)))
+        if hangers is None:
+            return  # Exit script
+        if not hangers:
+            MessageBox.Show("No hangers with FabricationRodInfo found. Please select hangers and run the script again.",
                             "Selection Error")
             return  # Exit script
 
-        # Work with the first selected element (single-element workflow)
-        selected_element = selection.first
-
-        # Check if the selected element has FabricationRodInfo
-        if not hasattr(selected_element, "GetRodInfo"):
-            MessageBox.Show("The selected element does not have FabricationRodInfo.",
-                            "Invalid Element")
+        TELEMETRY.phase("selection")
+        mode = forms.CommandSwitchWindow.show([MODE_EXTENSION, MODE_MEASURE], message="Adjust rods by:")
+        if not mode:
+            TELEMETRY.finish("cancelled")
             return  # Exit script
 
-        fabrication_rod_info = selected_element.GetRodInfo()
-        if fabrication_rod_info is None:
-            MessageBox.Show("The selected element's FabricationRodInfo is unavailable.",
-                            "Invalid Element")
-            return  # Exit script
+        view3d = None
+        if mode == MODE_MEASURE:
+            view3d = get_3d_view(doc)
+            if view3d is None:
+                MessageBox.Show("A 3D view is needed to measure to structure.", "No 3D View")
+                return  # Exit script
 
         # Show the user input form to get distance in decimal feet
         form = DistanceInputForm()
         result = form.ShowDialog()
         if result != DialogResult.OK:
             # If the user cancels or closes form, exit without changes
+            TELEMETRY.finish("cancelled")
             return
 
         decimal_feet_value = float(form.decimal_feet)  # Make sure it's float
@@ -225,22 +196,36 @@ def main():
         # Convert to negative (distance below structure)
         negative_decimal_feet = -decimal_feet_value
         
-        # Loop through rods, set extension in a single transaction per rod
-        for rod_index in range(fabrication_rod_info.RodCount):
-
-            # Start a new transaction for each rod
-            with revit.Transaction("Set Rod Extension for Rod {}".format(rod_index)):
-                initial_length = fabrication_rod_info.GetRodLength(rod_index)
-
-                # Set the rod extension to negative_decimal_feet
-                result_extension = fabrication_rod_info.SetRodStructureExtension(rod_index, negative_decimal_feet)
-                
-                updated_length = fabrication_rod_info.GetRodLength(rod_index)
-
-        # Final success message
-        MessageBox.Show("Script completed successfully.", "Success")
+        # Set every rod of every hanger in one transaction
+        TELEMETRY.count("hangers", len(hangers))
+        TELEMETRY.phase("transaction")
+        if mode == MODE_MEASURE:
+            report, failures = set_rod_lengths_to_structure(doc, hangers, negative_decimal_feet, view3d)
+            message = (
+                "Attached rods set to extension: {attached}\n"
+                "Free rods sized to structure: {measured}\n"
+                "Already at length: {unchanged}\n"
+                "No structure above: {no_structure}\n"
+                "Ray casts: {ray_casts} (cache hits: {cache_hits})"
+            ).format(**report)
+        else:
+            rods_set, failures = set_rod_extensions(doc, hangers, negative_decimal_feet)
+            message = "{0} rod(s) on {1} hanger(s) adjusted.".format(rods_set, len(hangers))
+
+        TELEMETRY.phase("report")
+        for hanger, error in failures:
+            print("Hanger {0}: {1}".format(hanger.Id, error))
+
+        # Final message, only titled a success when every rod was adjusted
+        if failures:
+            message = "Script completed with errors.\n{0}\n{1} rod(s) could not be adjusted, see output window.".format(
+                message, len(failures))
+            MessageBox.Show(message, "Completed With Errors")
+        else:
+            MessageBox.Show("Script completed successfully.\n" + message, "Success")
 
     except Exception as e:
+        TELEMETRY.finish("error")
         # Catch and display any exceptions
         error_msg = "An error occurred:\n{}\n\nTraceback:\n{}".format(str(e), traceback.format_exc())
         MessageBox.Show(error_msg, "Error")
@@ -251,4 +236,5 @@ def main():
 # RUN MAIN
 # ---------------------------------------------------------
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with TELEMETRY:
+        main()
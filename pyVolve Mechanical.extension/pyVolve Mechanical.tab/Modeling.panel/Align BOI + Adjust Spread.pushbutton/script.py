@@ -7,7 +7,7 @@
 #
 
 __title__   = "Align BOI / Spread by Gap"
-__doc__     = """Version = 1.0
+__doc__     = """Version = 1.5
 Date    = 01.24.2025
  --------------------------------------------------------------------------
  Description:
@@ -18,6 +18,16 @@ Date    = 01.24.2025
     of pipes to achieve a user-specified gap.
 
  The script will prompt you to choose which operation you want to run.
+
+ Rods of hangers hosted on the moved pipes are updated in the same
+ transaction, so their tops stay at the structure.
+ --------------------------------------------------------------------------
+ Last Updates:
+ - [10.19.2026] 1.1 - Hanger rods follow the Z move
+ - [10.19.2026] 1.2 - Insulated ODs are read once per size and insulation
+ - [10.19.2026] 1.3 - Spreading moved to Snippets._spread, shared with Spread by Gap
+ - [10.19.2026] 1.4 - Phase timings logged to the pyVolve telemetry log
+ - [10.19.2026] 1.5 - Shift-click runs it under the profiler (see Snippets._profiler)
  --------------------------------------------------------------------------
  Author: Sam Robles
  """
@@ -55,6 +65,13 @@ clr.AddReference("System.Windows.Forms")
 import System.Windows.Forms as WinForms
 from System.Windows.Forms import MessageBox
 
+# Custom imports
+from Snippets._rods import index_hosted_hangers, follow_host_moves
+from Snippets._fabparts import HalfOdProvider
+from Snippets._spread import spread_by_gap, get_bottom_elevation
+from Snippets._profiler import profiled
+from Snippets._telemetry import ToolRun
+
 #   ____ _     ___  ____    _    _      __     ___    ____  ___    _    ____  _     _____ ____  
 #  / ___| |   / _ \| __ )  / \  | |     \ \   / / \  |  _ \|_ _|  / \  | __ )| |   | ____/ ___| 
 # | |  _| |  | | | |  _ \ / _ \ | |      \ \ / / _ \ | |_) || |  / _ \ |  _ \| |   |  _| \___ \ 
@@ -63,36 +80,10 @@ from System.Windows.Forms import MessageBox
 
 doc  = __revit__.ActiveUIDocument.Document
 uidoc = __revit__.ActiveUIDocument
+TELEMETRY = ToolRun(__title__, doc)
 
-
-#  _____ _   _ _   _  ____ _____ ___ ___  _   _ ____  
-# |  ___| | | | \ | |/ ___|_   _|_ _/ _ \| \ | / ___| 
-# | |_  | | | |  \| | |     | |  | | | | |  \| \___ \ 
-# |  _| | |_| | |\  | |___  | |  | | |_| | |\  |___) |
-# |_|    \___/|_| \_|\____| |_| |___\___/|_| \_|____/                                                     
-# ====================================================
-
-def get_fabrication_bop_param_value(element):
-    """
-    Retrieve the 'FABRICATION_BOTTOM_OF_PART' parameter value in feet (float).
-    Returns None if not valid or not found.
-    """
-    if not element:
-        return None
-    
-    # Named parameter:
-    param = element.LookupParameter("FABRICATION_BOTTOM_OF_PART")
-    if not (param and not param.IsReadOnly and param.StorageType == StorageType.Double):
-        # Built-in
-        bip_param = element.get_Parameter(BuiltInParameter.FABRICATION_BOTTOM_OF_PART)
-        if bip_param and not bip_param.IsReadOnly and bip_param.StorageType == StorageType.Double:
-            param = bip_param
-        else:
-            param = None
-    
-    if param:
-        return param.AsDouble()
-    return None
+# Insulated half ODs, read from the model once per (material, size, insulation)
+HALF_ODS = HalfOdProvider()
 
 
 #  _____ _   _ _   _  ____ _____ ___ ___  _   _ ____  
@@ -135,116 +126,6 @@ def parse_fractional_inches_to_feet(input_str):
     return total_inches / 12.0
 
 
-def get_location_curve_data(element):
-    """
-    Returns (start_x, start_y) and (end_x, end_y) in feet as floats, if it's a LocationCurve.
-    """
-    loc = element.Location
-    if not loc or not hasattr(loc, "Curve"):
-        return None
-    
-    curve = loc.Curve
-    if not curve:
-        return None
-    
-    start = curve.GetEndPoint(0)
-    end   = curve.GetEndPoint(1)
-    return (start.X, start.Y), (end.X, end.Y)
-
-
-def get_fabrication_half_od(element):
-    """
-    half_od = (OutsideDiameter/2 + InsulationThickness) in feet.
-    """
-    if not isinstance(element, FabricationPart):
-        return 0.0
-    
-    # Outside Diameter param
-    od_param = element.LookupParameter("Outside Diameter")
-    od_val = od_param.AsDouble() if od_param else 0.0
-    
-    # Insulation Thickness
-    ins_thk = element.InsulationThickness  # also in feet
-    return (od_val / 2.0) + ins_thk
-
-
-def calculate_gap_between(pipeA, pipeB):
-    """
-    For XY:
-    - Get center-to-center distance (based on start points).
-    - Subtract both half ODs => gap in feet.
-    - Also return the 'axis' to help figure out direction for movement.
-      axis can be ("x", dist) or ("y", dist) or (dx, dy).
-    """
-    dataA = get_location_curve_data(pipeA)
-    dataB = get_location_curve_data(pipeB)
-    if not dataA or not dataB:
-        return None, 0.0
-
-    (ax, ay), _ = dataA
-    (bx, by), _ = dataB
-    dx = bx - ax
-    dy = by - ay
-
-    # If both dx & dy are non-negligible, it's diagonal
-    if abs(dx) > 1e-6 and abs(dy) > 1e-6:
-        c2c = math.sqrt(dx*dx + dy*dy)
-        axis = (dx, dy)
-    elif abs(dx) > 1e-6:
-        c2c = abs(dx)
-        axis = ("x", dx)
-    else:
-        c2c = abs(dy)
-        axis = ("y", dy)
-
-    halfA = get_fabrication_half_od(pipeA)
-    halfB = get_fabrication_half_od(pipeB)
-    gap = c2c - (halfA + halfB)
-    return axis, gap
-
-
-def build_xy_translation(axis, distance_to_move):
-    """
-    Given 'axis' from calculate_gap_between() and the additional distance_to_move,
-    return an XYZ vector for XY plane.
-    """
-    if axis is None:
-        return XYZ(0, 0, 0)
-
-    if isinstance(axis, tuple):
-        # axis can be ("x", dist) or ("y", dist) or (dx, dy)
-        if isinstance(axis[0], str):
-            # e.g. ("x", dx_val) => purely horizontal
-            direction_str, axis_val = axis
-            if direction_str.lower() == 'x':
-                # If axis_val >= 0, move +distance, else -distance
-                return XYZ(distance_to_move if axis_val >= 0 else -distance_to_move, 0, 0)
-            else:
-                return XYZ(0, distance_to_move if axis_val >= 0 else -distance_to_move, 0)
-        else:
-            # (dx, dy)
-            dx, dy = axis
-            length_2d = math.sqrt(dx*dx + dy*dy)
-            if length_2d > 1e-9:
-                scale = distance_to_move / length_2d
-                return XYZ(dx * scale, dy * scale, 0)
-            else:
-                return XYZ(0, 0, 0)
-    else:
-        # Just in case
-        return XYZ(0, 0, 0)
-
-
-def move_fabrication_part(part, translation_vec):
-    """
-    Applies the move to the FabricationPart's location curve if valid.
-    """
-    loc = part.Location
-    if isinstance(loc, LocationCurve):
-        loc.Move(translation_vec)
-        return True
-    return False
-
 #  __  __    _    ___ _   _ 
 # |  \/  |  / \  |_ _| \ | |
 # | |\/| | / _ \  | ||  \| |
@@ -252,6 +133,7 @@ def move_fabrication_part(part, translation_vec):
 # |_|  |_/_/   \_\___|_| \_|
 #===========================
 
+@profiled(TELEMETRY)
 def spread_and_align_bop():
     """
     1) Prompt user for gap in fractional inches -> convert to feet
@@ -312,7 +194,7 @@ def spread_and_align_bop():
         MessageBox.Show("No reference pipe selected. Exiting.")
         return
 
-    ref_bop = get_fabrication_bop_param_value(ref_pipe)
+    ref_bop = get_bottom_elevation(ref_pipe)
     if ref_bop is None:
         MessageBox.Show("Couldn't read BOP from reference pipe. Exiting.")
         return
@@ -337,34 +219,27 @@ def spread_and_align_bop():
 
     # (D) Move them in XY to get spacing from the previous pipe,
     #     and also move them in Z to match reference pipe's BOP.
-    moved_count = 0
+    #     Hangers on these pipes are looked up before anything moves.
+    TELEMETRY.count("pipes", len(pipes_to_move))
+    TELEMETRY.phase("read")
+    hangers_by_host = index_hosted_hangers(doc, pipes_to_move)
+    TELEMETRY.count("hangers", sum(len(h) for h in hangers_by_host.values()))
+    TELEMETRY.phase("transaction")
     with revit.Transaction("Spread + Align BOP"):
-        # We'll keep the "current_reference_for_XY" as the last pipe we moved,
-        # so each subsequent pipe is spaced from the last. Initially it's the ref pipe.
-        refXY = ref_pipe
-        for p in pipes_to_move:
-            # (1) Calculate XY offset
-            axis, existing_gap = calculate_gap_between(refXY, p)
-            delta_gap = desired_gap_feet - existing_gap
-            xy_vec = build_xy_translation(axis, delta_gap)
-
-            # (2) Calculate Z offset to match reference's BOP
-            pipe_bop = get_fabrication_bop_param_value(p)
-            if pipe_bop is None:
-                z_move = 0.0
-            else:
-                z_move = ref_bop - pipe_bop  # in feet
-
-            # (3) Combine XY + Z
-            translation_vec = XYZ(xy_vec.X, xy_vec.Y, z_move)
+        # Each pipe is spaced from the last one moved, starting at the reference,
+        # and dropped or raised to the reference's BOP in the same move.
+        moved = spread_by_gap(ref_pipe, pipes_to_move, desired_gap_feet, HALF_ODS.get,
+                              bottom_elevation=ref_bop)
+        moved_count = len(moved)
+        z_moves = dict((p.Id.IntegerValue, vec.Z) for p, vec in moved)
 
-            # (4) Move the pipe
-            if move_fabrication_part(p, translation_vec):
-                moved_count += 1
-                # Now, for the next pipe, we want to measure XY from the *newly moved* pipe
-                refXY = p
+        # Keep the rods of hangers on moved pipes reaching the structure
+        rods_updated, rod_failures = follow_host_moves(doc, hangers_by_host, z_moves)
+        TELEMETRY.phase("commit")
+    TELEMETRY.phase("report")
 
-    MessageBox.Show("Done.\nSuccessfully moved {} pipe(s).".format(moved_count))
+    MessageBox.Show("Done.\nSuccessfully moved {} pipe(s).\nHanger rods updated: {} ({} failed).\n{}"
+                    .format(moved_count, rods_updated, len(rod_failures), HALF_ODS.summary()))
 
 
 
@@ -372,4 +247,5 @@ def spread_and_align_bop():
 #   4) Execute
 # --------------------------------------------------------------
 if __name__ == "__main__":
-    spread_and_align_bop()
\ No newline at end of file
+    with TELEMETRY:
+        spread_and_align_bop()
\ No newline at end of file
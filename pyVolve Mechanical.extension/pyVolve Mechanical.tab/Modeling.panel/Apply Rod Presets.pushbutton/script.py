@@ -0,0 +1,144 @@
+#  ______   ____     _____  _ __     _______   __  __ _____ ____ _   _    _    _   _ ___ ____    _    _
+# |  _ \ \ / /\ \   / / _ \| |\ \   / / ____| |  \/  | ____/ ___| | | |  / \  | \ | |_ _/ ___|  / \  | |
+# | |_) \ V /  \ \ / / | | | | \ \ / /|  _|   | |\/| |  _|| |   | |_| | / _ \ |  \| || | |     / _ \ | |
+# |  __/ | |    \ V /| |_| | |__\ V / | |___  | |  | | |__| |___|  _  |/ ___ \| |\  || | |___ / ___ \| |___
+# |_|    |_|     \_/  \___/|_____\_/  |_____| |_|  |_|_____\____|_| |_/_/   \_\_| \_|___\____/_/   \_\_____|
+
+# -*- coding: utf-8 -*-
+__title__   = "Apply Rod Presets"
+__doc__     = """Version = 1.4
+Date    = 10.19.2026
+________________________________________________________________
+Description:
+Applies the rod extension presets in RodExtensionPresets.csv.
+Each row gives a Level and the Distance Below Structure for rods of
+hangers on that level; a '*' row is used for levels without their own.
+Hangers are grouped by level in one pass and every rod is set in a
+single transaction. Rods already at their preset are left untouched.
+________________________________________________________________
+How-To:
+Edit RodExtensionPresets.csv next to this script, then
+select the hangers to update and click Pushbutton
+or
+Click Pushbutton with nothing selected and choose Active View or Entire Model
+________________________________________________________________
+Last Updates:
+- [10.19.2026] - 1.0 - RELEASE
+- [10.19.2026] - 1.1 - Phase timings logged to the pyVolve telemetry log
+- [10.19.2026] - 1.2 - Shift-click runs it under the profiler (see Snippets._profiler)
+- [10.19.2026] - 1.3 - Collecting the hangers is timed as "read", not as "selection"
+- [10.19.2026] - 1.4 - Selected parts that are not hangers are skipped
+________________________________________________________________
+Author: Sam Robles
+"""
+__author__ = "Sam Robles"
+__helpurl__ = "https://github.com/SRobles512/pyVolve-Mechanical/wiki"
+__min_revit_ver__ = 2022
+__max_revit_ver__ = 2024
+
+# ___ __  __ ____   ___  ____ _____ ____
+#|_ _|  \/  |  _ \ / _ \|  _ \_   _/ ___|
+# | || |\/| | |_) | | | | |_) || | \___ \
+# | || |  | |  __/| |_| |  _ < | |  ___) |
+#|___|_|  |_|_|    \___/|_| \_\|_| |____/
+#=========================================
+# SYSTEM IMPORTS
+import os
+import clr
+
+# AUTODESK IMPORTS
+clr.AddReference("RevitAPI")
+clr.AddReference("RevitAPIUI")
+from Autodesk.Revit.DB import *
+from Autodesk.Revit.UI import *
+
+# PYREVIT IMPORTS
+from pyrevit import forms, script
+# .NET IMPORTS
+    #None
+# CUSTOM IMPORTS
+from Snippets._hangers import get_hangers
+from Snippets._rods import (load_extension_presets, partition_by_level,
+                            set_rod_extensions_by_group, format_feet_inches)
+from Snippets._profiler import profiled
+from Snippets._telemetry import ToolRun
+
+#   ____ _     ___  ____    _    _      __     ___    ____  ___    _    ____  _     _____ ____
+#  / ___| |   / _ \| __ )  / \  | |     \ \   / / \  |  _ \|_ _|  / \  | __ )| |   | ____/ ___|
+# | |  _| |  | | | |  _ \ / _ \ | |      \ \ / / _ \ | |_) || |  / _ \ |  _ \| |   |  _| \___ \
+# | |_| | |__| |_| | |_) / ___ \| |___    \ V / ___ \|  _ < | | / ___ \| |_) | |___| |___ ___) |
+#  \____|_____\___/|____/_/   \_\_____|    \_/_/   \_\_| \_\___/_/   \_\____/|_____|_____|____/
+
+app = __revit__.Application
+uidoc = __revit__.ActiveUIDocument
+doc = uidoc.Document
+TELEMETRY = ToolRun(__title__, doc)
+selection = uidoc.Selection.GetElementIds()
+output = script.get_output()
+
+PRESETS_PATH = os.path.join(os.path.dirname(__file__), "RodExtensionPresets.csv")
+DEFAULT_LEVEL = "*"
+
+#  _____ _   _ _   _  ____ _____ ___ ___  _   _ ____  
+# |  ___| | | | \ | |/ ___|_   _|_ _/ _ \| \ | / ___| 
+# | |_  | | | |  \| | |     | |  | | | | |  \| \___ \ 
+# |  _| | |_| | |\  | |___  | |  | | |_| | |\  |___) |
+# |_|    \___/|_| \_|\____| |_| |___\___/|_| \_|____/                                                     
+# ====================================================
+def resolve_extensions(groups, presets):
+    """Level name -> extension for every level in groups; levels with no preset are left out."""
+    extensions = {}
+    for level_name in groups:
+        extension = presets.get(level_name, presets.get(DEFAULT_LEVEL))
+        if extension is not None:
+            extensions[level_name] = extension
+    return extensions
+
+
+#  __  __    _    ___ _   _
+# |  \/  |  / \  |_ _| \ | |
+# | |\/| | / _ \  | ||  \| |
+# | |  | |/ ___ \ | || |\  |
+# |_|  |_/_/   \_\___|_| \_|
+#===========================
+@profiled(TELEMETRY)
+def main():
+    try:
+        presets = load_extension_presets(PRESETS_PATH)
+    except (IOError, KeyError, ValueError) as e:
+        forms.alert("Could not read rod presets:\n{0}\n\n{1}".format(PRESETS_PATH, e),
+                    title="Apply Rod Presets", exitscript=True)
+
+    hangers, skipped = get_hangers(doc, selection, "No hangers selected. Apply presets to hangers in:", TELEMETRY)
+    if skipped:
+        print("Skipped {0} selected element(s) that are not hangers.".format(len(skipped)))
+
+    if hangers:
+        TELEMETRY.count("hangers", len(hangers))
+        groups = partition_by_level(doc, hangers)
+        extensions = resolve_extensions(groups, presets)
+        TELEMETRY.phase("transaction")
+        rods_set, rods_skipped, failures = set_rod_extensions_by_group(doc, groups, extensions,
+                                                                       "Apply Rod Presets")
+        TELEMETRY.phase("report")
+
+        rows = [[level_name or "<No Level>", len(groups[level_name]),
+                 format_feet_inches(-extensions[level_name]) if level_name in extensions else "No preset"]
+                for level_name in sorted(groups)]
+        output.print_table(rows, columns=["Level", "Hangers", "Distance Below Structure"],
+                           title="Rod Extension Presets")
+        for hanger, message in failures:
+            print("{0}: {1}".format(output.linkify(hanger.Id), message))
+
+        unmatched = [name or "<No Level>" for name in groups if name not in extensions]
+        message = "Rods set: {0}\nAlready at preset: {1}\nFailed: {2}".format(rods_set, rods_skipped, len(failures))
+        if unmatched:
+            message += "\n\nNo preset for: {0}".format(", ".join(sorted(unmatched)))
+        forms.alert(message, title="Apply Rod Presets")
+    elif hangers is not None:
+        forms.alert("No hangers found.", title="Apply Rod Presets")
+
+
+if __name__ == '__main__':
+    with TELEMETRY:
+        main()
@@ -0,0 +1,162 @@
+#  ______   ____     _____  _ __     _______   __  __ _____ ____ _   _    _    _   _ ___ ____    _    _     
+# |  _ \ \ / /\ \   / / _ \| |\ \   / / ____| |  \/  | ____/ ___| | | |  / \  | \ | |_ _/ ___|  / \  | |    
+# | |_) \ V /  \ \ / / | | | | \ \ / /|  _|   | |\/| |  _|| |   | |_| | / _ \ |  \| || | |     / _ \ | |    
+# |  __/ | |    \ V /| |_| | |__\ V / | |___  | |  | | |__| |___|  _  |/ ___ \| |\  || | |___ / ___ \| |___ 
+# |_|    |_|     \_/  \___/|_____\_/  |_____| |_|  |_|_____\____|_| |_/_/   \_\_| \_|___\____/_/   \_\_____|
+                                                                                                           
+# -*- coding: utf-8 -*-
+__title__   = "Check Hanger Spacing"
+__doc__     = """Version = 1.4
+Date    = 10.19.2026
+________________________________________________________________
+Description:
+Checks hanger spacing along straight fabrication pipe runs.
+Collinear pipes of the same size (including short inline fittings)
+are treated as one run. Hangers hosted on the run are projected onto
+its axis, sorted, and the spacing between hangers and the distance
+from each run end are compared against HangerSpacing.csv
+(max spacing and max end distance by material and size).
+Violations are listed in the output window with clickable Ids.
+The check is read-only.
+________________________________________________________________
+How-To:
+Select the pipes (and hangers) to check and click Pushbutton
+or
+Click Pushbutton with nothing selected and choose Active View or Entire Model
+Edit HangerSpacing.csv next to this script to change the limits.
+________________________________________________________________
+Last Updates:
+- [10.19.2026] - 1.0 - RELEASE
+- [10.19.2026] - 1.1 - Phase timings logged to the pyVolve telemetry log
+- [10.19.2026] - 1.2 - Shift-click runs it under the profiler (see Snippets._profiler)
+- [10.19.2026] - 1.3 - Hangers on the pipes come from the cached host index (Snippets._cache)
+- [10.19.2026] - 1.4 - Collecting the pipes and hangers is timed as "read", not as "selection"
+________________________________________________________________
+Author: Sam Robles
+"""
+__author__ = "Sam Robles"
+__helpurl__ = "https://github.com/SRobles512/pyVolve-Mechanical/wiki"
+__min_revit_ver__ = 2022
+__max_revit_ver__ = 2024
+
+# ___ __  __ ____   ___  ____ _____ ____  
+#|_ _|  \/  |  _ \ / _ \|  _ \_   _/ ___| 
+# | || |\/| | |_) | | | | |_) || | \___ \ 
+# | || |  | |  __/| |_| |  _ < | |  ___) |
+#|___|_|  |_|_|    \___/|_| \_\|_| |____/
+#=========================================
+# SYSTEM IMPORTS
+import os
+import clr
+
+# AUTODESK IMPORTS
+clr.AddReference("RevitAPI")
+clr.AddReference("RevitAPIUI")
+from Autodesk.Revit.DB import *
+from Autodesk.Revit.UI import *
+
+# PYREVIT IMPORTS
+from pyrevit import forms, script
+# .NET IMPORTS
+    #None
+# CUSTOM IMPORTS
+from Snippets._fabparts import collect_parts, MaterialNames
+from Snippets._cache import hangers_on
+from Snippets._hangers import collect_hangers
+from Snippets._spacing import load_spacing_table, check_hanger_spacing
+from Snippets._profiler import profiled
+from Snippets._telemetry import ToolRun
+
+#   ____ _     ___  ____    _    _      __     ___    ____  ___    _    ____  _     _____ ____  
+#  / ___| |   / _ \| __ )  / \  | |     \ \   / / \  |  _ \|_ _|  / \  | __ )| |   | ____/ ___| 
+# | |  _| |  | | | |  _ \ / _ \ | |      \ \ / / _ \ | |_) || |  / _ \ |  _ \| |   |  _| \___ \ 
+# | |_| | |__| |_| | |_) / ___ \| |___    \ V / ___ \|  _ < | | / ___ \| |_) | |___| |___ ___) |
+#  \____|_____\___/|____/_/   \_\_____|    \_/_/   \_\_| \_\___/_/   \_\____/|_____|_____|____/ 
+                                                                                              
+app = __revit__.Application
+uidoc = __revit__.ActiveUIDocument
+doc = uidoc.Document
+TELEMETRY = ToolRun(__title__, doc)
+selection = uidoc.Selection.GetElementIds()
+output = script.get_output()
+
+SCOPE_VIEW  = "Active View"
+SCOPE_MODEL = "Entire Model"
+
+SPACING_CSV = os.path.join(os.path.dirname(__file__), "HangerSpacing.csv")
+
+#  _____ _   _ _   _  ____ _____ ___ ___  _   _ ____  
+# |  ___| | | | \ | |/ ___|_   _|_ _/ _ \| \ | / ___| 
+# | |_  | | | |  \| | |     | |  | | | | |  \| \___ \ 
+# |  _| | |_| | |\  | |___  | |  | | |_| | |\  |___) |
+# |_|    \___/|_| \_|\____| |_| |___\___/|_| \_|____/                                                     
+# ====================================================
+def get_pipes_and_hangers():
+    """(pipes, hangers) from the selection, or from the chosen scope when nothing is selected.
+
+    With a selection, the hangers hosted on the selected pipes are looked up in
+    the cached host index, so they are found even when they were not selected.
+    """
+    pipe_cat = ElementId(BuiltInCategory.OST_FabricationPipework)
+    if selection:
+        TELEMETRY.phase("read")
+        elements = [doc.GetElement(element_id) for element_id in selection]
+        pipes = [e for e in elements if isinstance(e, FabricationPart) and e.Category.Id == pipe_cat]
+        return pipes, hangers_on(doc, [pipe.Id.IntegerValue for pipe in pipes])
+
+    scope = forms.CommandSwitchWindow.show([SCOPE_VIEW, SCOPE_MODEL],
+                                           message="No pipes selected. Check hanger spacing in:")
+    if scope not in (SCOPE_VIEW, SCOPE_MODEL):
+        return None, None
+    # The collector passes grow with the model, so they are timed as "read"
+    TELEMETRY.phase("read")
+    view_id = doc.ActiveView.Id if scope == SCOPE_VIEW else None
+    return collect_parts(doc, BuiltInCategory.OST_FabricationPipework, view_id), collect_hangers(doc, view_id)
+
+
+def print_violations(violations):
+    rows = []
+    for v in violations:
+        ids = v.hanger_ids or [p.Id.IntegerValue for p in v.run.pipes]
+        rows.append([
+            output.linkify([ElementId(i) for i in ids]),
+            v.run.pipes[0].Size,
+            v.kind,
+            "{0:.2f}".format(v.value),
+            "{0:.2f}".format(v.limit),
+        ])
+    output.print_table(rows, columns=["Elements", "Size", "Check", "Actual (ft)", "Limit (ft)"],
+                       title="Hanger Spacing Violations")
+
+
+#  __  __    _    ___ _   _ 
+# |  \/  |  / \  |_ _| \ | |
+# | |\/| | / _ \  | ||  \| |
+# | |  | |/ ___ \ | || |\  |
+# |_|  |_/_/   \_\___|_| \_|
+#===========================
+@profiled(TELEMETRY)
+def main():
+    pipes, hangers = get_pipes_and_hangers()
+
+    if pipes:
+        TELEMETRY.count("pipes", len(pipes))
+        TELEMETRY.count("hangers", len(hangers))
+        TELEMETRY.phase("compute")
+        rules = load_spacing_table(SPACING_CSV)
+        violations, unmatched = check_hanger_spacing(pipes, hangers, rules, MaterialNames(doc).get)
+        TELEMETRY.phase("report")
+
+        if violations:
+            print_violations(violations)
+        if unmatched:
+            print("{0} run(s) have no matching row in HangerSpacing.csv and were not checked.".format(len(unmatched)))
+        forms.alert("Checked {0} pipes against {1} hangers.\n{2} violation(s) found."
+                    .format(len(pipes), len(hangers), len(violations)), title="Check Hanger Spacing")
+    elif pipes is not None:
+        forms.alert("No fabrication pipes found.", title="Check Hanger Spacing")
+
+
+if __name__ == '__main__':
+    with TELEMETRY:
+        main()
@@ -6,16 +6,30 @@
                                                                                                            
 # -*- coding: utf-8 -*-
 __title__   = "Check Hanger Host"
-__doc__     = """Version = 1.0
-Date    = 01.28.2025
+__doc__     = """Version = 1.6
+Date    = 10.19.2026
 ________________________________________________________________
 Description:
 Verifies if Hangers are hosted
-If Hangers are not hosted "Not Hosted" is added to the Comment Property for filtering purposes
+The audit itself is read-only. Problem hangers can then be selected,
+isolated in the active view or exported as an Id list.
+Optionally "Not Hosted" / "Host Missing" is written to the Comment Property
+for filtering purposes - only on hangers whose flag changed, and flags are
+cleared from hangers that have since been fixed.
 ________________________________________________________________
 How-To:
-Select the hangers that need verification
-Click Pushbutton
+Select the hangers that need verification and click Pushbutton
+or
+Click Pushbutton with nothing selected and choose Active View or Entire Model
+________________________________________________________________
+Last Updates:
+- [01.28.2025] - 1.0 - RELEASE
+- [10.19.2026] - 1.1 - Whole view / whole model audit, reports host-missing hangers
+- [10.19.2026] - 1.2 - Read-only results, Comments flags written on changes only
+- [10.19.2026] - 1.3 - Phase timings logged to the pyVolve telemetry log
+- [10.19.2026] - 1.4 - Shift-click runs it under the profiler (see Snippets._profiler)
+- [10.19.2026] - 1.5 - Collecting the hangers is timed as "read", not as "selection"
+- [10.19.2026] - 1.6 - Selected parts that are not hangers are skipped, not audited
 ________________________________________________________________
 Author: Sam Robles
 """
@@ -23,7 +37,6 @@ __author__ = "Sam Robles"
 __helpurl__ = "https://github.com/SRobles512/pyVolve-Mechanical/wiki"
 __min_revit_ver__ = 2022
 __max_revit_ver = 2024
-__context__     = ['MEP Fabrication Hangers']
 
 # ___ __  __ ____   ___  ____ _____ ____  
 #|_ _|  \/  |  _ \ / _ \|  _ \_   _/ ___| 
@@ -41,11 +54,13 @@ from Autodesk.Revit.DB import *
 from Autodesk.Revit.UI import *
 
 # PYREVIT IMPORTS
-    #None
+from pyrevit import forms
 # .NET IMPORTS
-    #None
+from System.Collections.Generic import List
 # CUSTOM IMPORTS
-    #None
+from Snippets._hangers import get_hangers, audit_hosts, sync_comment_flags
+from Snippets._profiler import profiled
+from Snippets._telemetry import ToolRun
 
 #   ____ _     ___  ____    _    _      __     ___    ____  ___    _    ____  _     _____ ____  
 #  / ___| |   / _ \| __ )  / \  | |     \ \   / / \  |  _ \|_ _|  / \  | __ )| |   | ____/ ___| 
@@ -56,14 +71,32 @@ from Autodesk.Revit.UI import *
 app = __revit__.Application
 uidoc = __revit__.ActiveUIDocument
 doc = uidoc.Document
+TELEMETRY = ToolRun(__title__, doc)
 selection = uidoc.Selection.GetElementIds()
 
+RESULT_SELECT  = "Select Problem Hangers"
+RESULT_ISOLATE = "Isolate in Active View"
+RESULT_EXPORT  = "Export Id List"
+RESULT_FLAGS   = "Write Comment Flags (changes only)"
+
 #  _____ _   _ _   _  ____ _____ ___ ___  _   _ ____  
 # |  ___| | | | \ | |/ ___|_   _|_ _/ _ \| \ | / ___| 
 # | |_  | | | |  \| | |     | |  | | | | |  \| \___ \ 
 # |  _| | |_| | |\  | |___  | |  | | |_| | |\  |___) |
 # |_|    \___/|_| \_|\____| |_| |___\___/|_| \_|____/                                                     
 # ====================================================
+def export_id_list(audit):
+    """Writes one line per problem hanger (Id, status) to a user-chosen CSV."""
+    file_path = forms.save_file(file_ext='csv', default_name='Unhosted Hangers')
+    if not file_path:
+        return None
+    with open(file_path, 'w') as f:
+        f.write("ElementId,Status\n")
+        for hanger in audit.unhosted:
+            f.write("{0},Not Hosted\n".format(hanger.Id.IntegerValue))
+        for hanger in audit.host_missing:
+            f.write("{0},Host Missing\n".format(hanger.Id.IntegerValue))
+    return file_path
 
 
 #   ____ _        _    ____ ____  _____ ____  
@@ -80,57 +113,59 @@ selection = uidoc.Selection.GetElementIds()
 # | |  | |/ ___ \ | || |\  |
 # |_|  |_/_/   \_\___|_| \_|
 #===========================
-# Check if any elements are selected
-if not selection:
-    print("No elements selected.")
-else:
-    #print("Number of elements selected: {0}".format(len(selection)))
-    fabrication_part_count = 0  # Counter for FabricationPart elements
-    host_id_negative_count = 0  # Counter for HostId = -1
-
-    # Start a transaction to modify the document
-    with Transaction(doc, "Update Comments for Not Hosted") as t:
-        t.Start()
-
-        for element_id in selection:
-            element = doc.GetElement(element_id)
-            
-            # Check if the element is a FabricationPart
-            if isinstance(element, FabricationPart):
-                fabrication_part_count += 1
-                try:
-                    # Get Hosted Info
-                    hosted_info = element.GetHostedInfo()
-
-                    if hosted_info:
-                        host_id = hosted_info.HostId.IntegerValue  # Extract integer value from ElementId
-                        #print("Debug: HostId for element {0} is {1}".format(element.Id, host_id))
-
-                        # Check if HostId is -1
-                        if host_id == -1:
-                            host_id_negative_count += 1
-                            
-                            # Modify the Comments property
-                            param = element.LookupParameter("Comments")
-                            if param and param.StorageType == StorageType.String:
-                                param.Set("Not Hosted")
-                                #print("Updated Comments for element {0} to 'Not Hosted'.".format(element.Id))
-
-                except Exception as e:
-                    print("Error accessing properties for element {0}: {1}".format(element.Id, e))
-            else:
-                print("Element {0} is not a FabricationPart.".format(element.Id))
-
-        # Commit the transaction
-        t.Commit()
-
-    message = (
-    "Number of Hangers selected: {0}\n"
-    "Number of Hangers with HostId = -1: {1}"
-).format(fabrication_part_count, host_id_negative_count)
-
-# Create and show a TaskDialog
-dialog = TaskDialog("Hanger Information")
-dialog.MainInstruction = "Hanger Count Details"
-dialog.MainContent = message
-dialog.Show()
+@profiled(TELEMETRY)
+def main():
+    hangers, skipped = get_hangers(doc, selection, "No hangers selected. Check hangers in:", TELEMETRY)
+    for element_id in skipped:
+        print("Element {0} is not a hanger, skipped.".format(element_id))
+
+    if not hangers:
+        if hangers is not None:
+            print("No hangers found.")
+    else:
+        TELEMETRY.count("hangers", len(hangers))
+        audit = audit_hosts(doc, hangers)
+        for element, error in audit.errors:
+            print("Error accessing properties for element {0}: {1}".format(element.Id, error))
+
+        message = audit.summary()
+        if skipped:
+            message += "\nSkipped (not a hanger): {0}".format(len(skipped))
+        problem_ids = List[ElementId]([h.Id for h in audit.problems])
+
+        TELEMETRY.phase("selection")
+        result = None
+        if audit.problems or audit.hosted:
+            options = [RESULT_SELECT, RESULT_ISOLATE, RESULT_EXPORT, RESULT_FLAGS] if audit.problems else [RESULT_FLAGS]
+            result = forms.CommandSwitchWindow.show(options, message=message.replace("\n", " | "))
+
+        if result == RESULT_SELECT:
+            uidoc.Selection.SetElementIds(problem_ids)
+        elif result == RESULT_ISOLATE:
+            # Temporary isolation only, nothing is saved with the view
+            with Transaction(doc, "Isolate Problem Hangers") as t:
+                t.Start()
+                doc.ActiveView.IsolateElementsTemporary(problem_ids)
+                t.Commit()
+        elif result == RESULT_EXPORT:
+            file_path = export_id_list(audit)
+            if file_path:
+                message += "\n\nId list saved to:\n{0}".format(file_path)
+        elif result == RESULT_FLAGS:
+            TELEMETRY.phase("transaction")
+            flagged, cleared, not_owned = sync_comment_flags(doc, audit)
+            message += "\n\nComments flagged: {0}\nComments cleared: {1}".format(flagged, cleared)
+            if not_owned:
+                message += "\nSkipped (owned by another user): {0}".format(not_owned)
+
+        # Create and show a TaskDialog
+        TELEMETRY.phase("report")
+        dialog = TaskDialog("Hanger Information")
+        dialog.MainInstruction = "Hanger Count Details"
+        dialog.MainContent = message
+        dialog.Show()
+
+
+if __name__ == '__main__':
+    with TELEMETRY:
+        main()
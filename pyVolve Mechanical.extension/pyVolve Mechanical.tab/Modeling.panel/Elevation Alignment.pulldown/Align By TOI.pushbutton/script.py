@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 __title__   = "Align by TOI"
-__doc__     = """Version = 1.0
+__doc__     = """Version = 1.6
 Date    = 01.04.2025
 ________________________________________________________________
 Description:
@@ -18,6 +18,12 @@ TODO:
 ________________________________________________________________
 Last Updates:
 - [01.03.2025] RELEASE
+- [10.19.2026] 1.1 - Hanger rods on moved pipes keep their tops in place
+- [10.19.2026] 1.2 - DEBUG_MODE replaced by API call counts (pyVolve 'instrument' setting)
+- [10.19.2026] 1.3 - Phase timings logged to the pyVolve telemetry log
+- [10.19.2026] 1.4 - Shift-click runs it under the profiler (see Snippets._profiler)
+- [10.19.2026] 1.5 - Rod update failures and errors are always reported
+- [10.19.2026] 1.6 - Failed and cancelled runs are logged as such in the telemetry log
 ________________________________________________________________
 Author: Sam Robles"""
 
@@ -28,12 +34,19 @@ from Autodesk.Revit.DB import *
 from Autodesk.Revit.DB.Fabrication import *
 from Autodesk.Revit.UI import *
 from Autodesk.Revit.UI.Selection import ObjectType, ISelectionFilter
+from Autodesk.Revit.Exceptions import OperationCanceledException
 
 #pyRevit Imports
 from pyrevit import revit, DB
 from pyrevit import script
 from pyrevit import forms
 
+#Custom Imports
+from Snippets._alignment import get_elevation, apply_elevations
+from Snippets._instrument import Instrument
+from Snippets._profiler import profiled
+from Snippets._telemetry import ToolRun
+
 #.NET Imports
 import clr
 clr.AddReference('RevitAPI')
@@ -45,9 +58,7 @@ import System
 app = __revit__.Application
 uidoc = __revit__.ActiveUIDocument
 doc = __revit__.ActiveUIDocument.Document
-
-# Debug mode flag
-DEBUG_MODE = False  # Set to True to enable debug prints
+TELEMETRY = ToolRun(__title__, doc)
 
 # Parameter name we're working with
 PARAM_NAME = "Upper End Top of Insulation Elevation"
@@ -64,44 +75,14 @@ class FabricationPartFilter(ISelectionFilter):
     def AllowReference(self, reference, point):
         return True
 
-#FUNCTIONS
-#==================================================
-def debug_print(message):
-    """Print debug messages if DEBUG_MODE is True"""
-    if DEBUG_MODE:
-        print("DEBUG: %s" % str(message))
-
-def get_parameter_value(element, param_name):
-    """Gets the value of a parameter from an element"""
-    param = element.LookupParameter(param_name)
-    if param and param.StorageType == StorageType.Double:
-        try:
-            value = param.AsDouble()
-            debug_print("Parameter value: {0}".format(value))
-            return value
-        except Exception as ex:
-            debug_print("Error getting elevation: %s" % str(ex))
-            return None
-    else:
-        debug_print("Parameter {0} not found or invalid type".format(param_name))
-        return None
-
-def set_parameter_value(element, param_name, value):
-    """Sets the value of a parameter for an element"""
-    param = element.LookupParameter(param_name)
-    if param and param.StorageType == StorageType.Double and not param.IsReadOnly:
-        try:
-            param.Set(value)
-            debug_print("Set parameter {0} to {1}".format(param_name, value))
-            return True
-        except Exception as ex:
-            debug_print("Error setting parameter: %s" % str(ex))
-            return False
-    return False
-
 #MAIN SCRIPT
 #==================================================
+@profiled(TELEMETRY)
 def main():
+    # API call counts, printed at the end when the 'instrument' setting is on
+    instrument = Instrument.from_settings()
+    idoc = instrument.wrap(doc)
+
     # Create selection filter
     fab_filter = FabricationPartFilter()
     
@@ -113,10 +94,10 @@ def main():
             fab_filter,
             "Select reference pipe"
         )
-        ref_part = doc.GetElement(ref_element.ElementId)
+        ref_part = idoc.GetElement(ref_element.ElementId)
         
         # Get reference elevation
-        ref_elevation = get_parameter_value(ref_part, PARAM_NAME)
+        ref_elevation = get_elevation(ref_part, PARAM_NAME)
         if ref_elevation is None:
             forms.alert("Failed to get reference elevation.", title="Error")
             return
@@ -129,25 +110,37 @@ def main():
             "select the pipes you wish to align"
         )
         
-        # Process selected parts
+        TELEMETRY.phase("read")
+        # Process selected parts; rods of hangers on moved pipes are updated in the same transaction
+        targets = [(idoc.GetElement(part_ref.ElementId), ref_elevation) for part_ref in parts_to_move]
+        TELEMETRY.count("parts", len(targets))
+        TELEMETRY.phase("transaction")
         with revit.Transaction("Align Parts by BOI"):
-            success_count = 0
-            for part_ref in parts_to_move:
-                part = doc.GetElement(part_ref.ElementId)
-                if set_parameter_value(part, PARAM_NAME, ref_elevation):
-                    success_count += 1
-        
+            success_count, rods_updated, rod_failures = apply_elevations(doc, targets, PARAM_NAME)
+            TELEMETRY.phase("commit")
+        TELEMETRY.phase("report")
+        for hanger, message in rod_failures:
+            print("Rod update failed on {0}: {1}".format(hanger.Id, message))
+        if instrument.enabled:
+            print(instrument.report(__title__))
+
         # Report results
-        forms.alert(
-            "Successfully aligned {0} of {1} pipes.".format(success_count, len(parts_to_move)),
-            title="Operation Complete"
-        )
-            
+        message = "Successfully aligned {0} of {1} pipes.\nHanger rods updated: {2}".format(
+            success_count, len(parts_to_move), rods_updated)
+        if rod_failures:
+            message += " ({0} failed, see output window)".format(len(rod_failures))
+        forms.alert(message, title="Operation Complete")
+
+    except OperationCanceledException:
+        TELEMETRY.finish("cancelled")
+        forms.alert("Operation cancelled.", title="Cancelled")
     except Exception as e:
-        debug_print("Error in main: %s" % str(e))
-        forms.alert("Operation cancelled or failed.", title="Error")
+        TELEMETRY.finish("error")
+        print("Error in main: %s" % str(e))
+        forms.alert("Operation failed:\n{0}".format(e), title="Error")
 
 # Run main script
 if __name__ == '__main__':
-    main()
-#==================================================
\ No newline at end of file
+    with TELEMETRY:
+        main()
+#==================================================
\ No newline at end of file
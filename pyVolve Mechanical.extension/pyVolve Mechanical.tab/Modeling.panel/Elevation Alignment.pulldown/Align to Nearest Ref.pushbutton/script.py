@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+__title__   = "Align to Nearest Ref"
+__doc__     = """Version = 1.6
+Date    = 10.19.2026
+________________________________________________________________
+Description:
+Aligns many pipes at once against several reference pipes.
+Each selected pipe takes the elevation of the nearest reference
+pipe that runs parallel to it in plan, so a whole floor of racks
+can be aligned in one pass.
+________________________________________________________________
+How-To:
+1. Run the script
+2. Choose the elevation to align by (BOI, BOP, Center, TOP, TOI)
+3. Select the reference pipes (one or more per rack)
+4. Window-select the pipes to align
+________________________________________________________________
+Last Updates:
+- [10.19.2026] RELEASE
+- [10.19.2026] 1.1 - Hanger rods on moved pipes keep their tops in place
+- [10.19.2026] 1.2 - API call counts (pyVolve 'instrument' setting)
+- [10.19.2026] 1.3 - Phase timings logged to the pyVolve telemetry log
+- [10.19.2026] 1.4 - Shift-click runs it under the profiler (see Snippets._profiler)
+- [10.19.2026] 1.5 - References are looked for within 10 ft in plan only
+- [10.19.2026] 1.6 - The 10 ft reach is the offset from the reference's axis, however far along it; rod update failures are listed
+________________________________________________________________
+Author: Sam Robles"""
+
+#IMPORTS
+#==================================================
+# Autodesk Imports
+from Autodesk.Revit.DB import *
+from Autodesk.Revit.DB.Fabrication import *
+from Autodesk.Revit.UI import *
+from Autodesk.Revit.UI.Selection import ObjectType, ISelectionFilter
+from Autodesk.Revit.Exceptions import OperationCanceledException
+
+#pyRevit Imports
+from pyrevit import revit, DB
+from pyrevit import script
+from pyrevit import forms
+
+#Custom Imports
+from Snippets._alignment import ELEVATION_PARAMS, REFERENCE_REACH, apply_elevations, align_to_nearest_reference
+from Snippets._instrument import Instrument
+from Snippets._profiler import profiled
+from Snippets._telemetry import ToolRun
+
+#VARIABLES
+#==================================================
+app = __revit__.Application
+uidoc = __revit__.ActiveUIDocument
+doc = __revit__.ActiveUIDocument.Document
+TELEMETRY = ToolRun(__title__, doc)
+
+#CLASSES
+#==================================================
+# Custom Filter Class
+class FabricationPartFilter(ISelectionFilter):
+    def AllowElement(self, element):
+        if isinstance(element, FabricationPart):
+            return True
+        return False
+
+    def AllowReference(self, reference, point):
+        return True
+
+#MAIN SCRIPT
+#==================================================
+@profiled(TELEMETRY)
+def main():
+    mode = forms.CommandSwitchWindow.show(ELEVATION_PARAMS.keys(), message="Align by:")
+    if not mode:
+        return
+    param_name = ELEVATION_PARAMS[mode]
+
+    # API call counts, printed at the end when the 'instrument' setting is on
+    instrument = Instrument.from_settings()
+    idoc = instrument.wrap(doc)
+
+    fab_filter = FabricationPartFilter()
+    try:
+        forms.alert("Please select the reference pipes.", title="Select Reference Pipes")
+        ref_refs = uidoc.Selection.PickObjects(ObjectType.Element, fab_filter, "Select reference pipes")
+        references = [idoc.GetElement(r.ElementId) for r in ref_refs]
+
+        forms.alert("Please select the pipes you wish to align.", title="Select Pipes")
+        part_refs = uidoc.Selection.PickObjects(ObjectType.Element, fab_filter, "Select the pipes you wish to align")
+        parts = [idoc.GetElement(r.ElementId) for r in part_refs]
+    except OperationCanceledException:
+        return
+
+    if not references or not parts:
+        forms.alert("Nothing selected.", title="Error")
+        return
+
+    TELEMETRY.count("references", len(references))
+    TELEMETRY.count("parts", len(parts))
+    TELEMETRY.phase("compute")
+    assignments, skipped = align_to_nearest_reference(references, parts, param_name, max_offset=REFERENCE_REACH)
+
+    targets = [(part, elevation) for part, ref, elevation in assignments]
+    TELEMETRY.phase("transaction")
+    with revit.Transaction("Align Parts to Nearest Reference"):
+        success_count, rods_updated, rod_failures = apply_elevations(doc, targets, param_name)
+        TELEMETRY.phase("commit")
+    TELEMETRY.phase("report")
+    for hanger, message in rod_failures:
+        print("Rod update failed on {0}: {1}".format(hanger.Id, message))
+    if instrument.enabled:
+        print(instrument.report(__title__))
+
+    message = "Successfully aligned {0} of {1} pipes.".format(success_count, len(parts))
+    message += "\nHanger rods updated: {0}".format(rods_updated)
+    if rod_failures:
+        message += " ({0} failed, see output window)".format(len(rod_failures))
+    if skipped:
+        message += "\n{0} pipe(s) skipped (no parallel reference axis within {1:g} ft, or no location curve).".format(
+            len(skipped), REFERENCE_REACH)
+    forms.alert(message, title="Operation Complete")
+
+# Run main script
+if __name__ == '__main__':
+    with TELEMETRY:
+        main()
+#==================================================
@@ -1,11 +1,14 @@
 
 # -*- coding: utf-8 -*-
 __title__   = "Place Insulation"
-__doc__     = """Version = 1.0
+__doc__     = """Version = 1.4
 Date    = 12.28.2024
 ________________________________________________________________
 Description:
 Places Insulation based on user-defined specification.
+When a part's insulation thickness changes, the racks it belongs to
+are re-spread so the gaps between neighbouring pipes stay as they were.
+Only those racks are checked; the moved neighbours are reported.
 
 ________________________________________________________________
 How-To:
@@ -16,119 +19,44 @@ ________________________________________________________________
 ________________________________________________________________
 Last Updates:
 - [12.28.2024] - RELEASE
+- [10.19.2026] - 1.1 - Re-spread affected racks after insulation changes
+- [10.19.2026] - 1.2 - Specs CSV read once per run instead of once per part
+- [10.19.2026] - 1.3 - Phase timings logged to the pyVolve telemetry log
+- [10.19.2026] - 1.4 - Shift-click runs it under the profiler (see Snippets._profiler)
 ________________________________________________________________
 Author: Sam Robles"""
 
 import clr
 clr.AddReference('System.Windows.Forms')
 clr.AddReference('System.Drawing')
-import csv
 import os
 
-from System.Windows.Forms import Form, ComboBox, Button, Label, DialogResult, ComboBoxStyle
+from System.Windows.Forms import (Form, ComboBox, Button, Label, DialogResult, ComboBoxStyle,
+                                  MessageBox, MessageBoxButtons)
 from System.Drawing import Point, Size as DrawingSize
 
-from Autodesk.Revit.DB import FilteredElementCollector, BuiltInCategory, Transaction, ElementId, FabricationPart
+from Autodesk.Revit.DB import (FilteredElementCollector, BuiltInCategory, Transaction, TransactionGroup,
+                               ElementId, FabricationPart)
 from Autodesk.Revit.UI import UIDocument
 
-def load_insulation_specs():
-    """Load insulation specifications from CSV file."""
-    specs = []
-    script_dir = os.path.dirname(__file__)
-    csv_path = os.path.join(script_dir, "InsulationSpecs.csv")
-    
+from Snippets._insulation import load_insulation_specs, InsulationChange
+from Snippets._profiler import profiled
+from Snippets._telemetry import ToolRun
+
+SPECS_CSV = os.path.join(os.path.dirname(__file__), "InsulationSpecs.csv")
+
+uidoc = __revit__.ActiveUIDocument
+doc = uidoc.Document
+TELEMETRY = ToolRun(__title__, doc)
+
+def read_insulation_specs():
+    """InsulationSpecs.csv next to this script, or an empty list if it cannot be read."""
     try:
-        with open(csv_path, 'rb') as f:  # Use 'rb' for IronPython
-            reader = csv.DictReader(f)
-            for row in reader:
-                # Handle empty values for Min OD and Max OD
-                min_od = float(row['Min OD']) if row['Min OD'].strip() else 0.0
-                max_od = float(row['Max OD']) if row['Max OD'].strip() else float('inf')
-                
-                specs.append({
-                    'Service': row['Service'].strip(),
-                    'Min_OD': min_od,
-                    'Max_OD': max_od,
-                    'Insulation_Specification': int(row['Insulation Specification'])
-                })
-        return specs
+        return load_insulation_specs(SPECS_CSV)
     except Exception as e:
         print("Error loading CSV: {}".format(e))
         return []
 
-def parse_size_to_inches(size_str):
-    """
-    Parse size string to inches.
-    
-    Args:
-        size_str (str): Size string to parse
-        
-    Returns:
-        float: Size in inches
-    """
-    # Remove double quotes and strip whitespace
-    size_str = size_str.replace('"', '').strip()
-
-    if not size_str:
-        return 0.0
-
-    # Check if there's a dash in the size_str
-    if '-' in size_str:
-        # If there's a dash, only parse the first token
-        parts = size_str.split()
-        if not parts:
-            return 0.0
-        first_token = parts[0]
-
-        # If the first token contains a dash, split and take the first part
-        if '-' in first_token:
-            first_token = first_token.split('-')[0]
-
-        # Parse the cleaned first_token
-        if '/' in first_token:
-            num, den = first_token.split('/')
-            return float(num) / float(den)
-        else:
-            return float(first_token)
-    else:
-        # No dash: parse the entire size_str
-        # Combine all tokens to get a total in inches
-        parts = size_str.split()
-        total = 0.0
-        for p in parts:
-            if '/' in p:
-                num, den = p.split('/')
-                total += float(num) / float(den)
-            else:
-                total += float(p)
-        return total
-
-def get_new_insulation_spec(service, size_inches):
-    """
-    Determine insulation specification based on service and size.
-    
-    Args:
-        service (str): Service type
-        size_inches (float): Size in inches
-        
-    Returns:
-        float: Insulation specification number
-    """
-    specs = load_insulation_specs()
-    
-    # Find matching specifications for the service
-    service_specs = [spec for spec in specs if spec['Service'] == service]
-    
-    if not service_specs:
-        return 0  # Default to no insulation if service not found
-        
-    # Find the appropriate specification based on size
-    for spec in service_specs:
-        if spec['Min_OD'] <= size_inches <= spec['Max_OD']:
-            return spec['Insulation_Specification']
-    
-    return 0  # Default to no insulation if no size range matches
-
 class ServiceSelectionForm(Form):
     """Form for selecting service type."""
     def __init__(self):
@@ -147,7 +75,7 @@ class ServiceSelectionForm(Form):
         self.combo.DropDownStyle = ComboBoxStyle.DropDownList
         
         # Load services from CSV
-        specs = load_insulation_specs()
+        specs = read_insulation_specs()
         if specs:
             # Get unique services using a set comprehension and add to combo box
             unique_services = {spec['Service'] for spec in specs}
@@ -172,7 +100,8 @@ class ServiceSelectionForm(Form):
             pass
 
 # Main execution
-if __name__ == '__main__':
+@profiled(TELEMETRY)
+def main():
     # Display the form
     form = ServiceSelectionForm()
     dialog_result = form.ShowDialog()
@@ -182,16 +111,12 @@ if __name__ == '__main__':
 
     selected_service = form.combo.SelectedItem
 
-    uidoc = __revit__.ActiveUIDocument
-    doc = uidoc.Document
-
     fabricationPipeworkCatId = ElementId(BuiltInCategory.OST_FabricationPipework)
 
     # Get the currently selected element IDs
     selected_ids = uidoc.Selection.GetElementIds()
 
     selected_fabrication_parts = []
-    failed_elements = []  # Track elements that couldn't be modified
 
     for elem_id in selected_ids:
         elem = doc.GetElement(elem_id)
@@ -201,29 +126,58 @@ if __name__ == '__main__':
                 if fab_part:
                     selected_fabrication_parts.append(fab_part)
 
-    # Start a transaction to modify the model
-    t = Transaction(doc, "Change Insulation Specification")
-    t.Start()
-
-    for part in selected_fabrication_parts:
-        try:
-            # Get current properties
-            current_insulation = part.InsulationSpecification
-            size_str = part.Size
-            size_inches = parse_size_to_inches(size_str)
+    TELEMETRY.phase("read")
+    TELEMETRY.count("parts", len(selected_fabrication_parts))
 
-            # Determine new_insulation_spec based on selected service and size_inches
-            new_insulation_spec = get_new_insulation_spec(selected_service, size_inches)
+    # Racks are indexed before anything changes, from the pipes around the selection only
+    change = InsulationChange(doc, selected_fabrication_parts)
+    specs = read_insulation_specs()
 
-            # Set the insulation spec accordingly
-            part.InsulationSpecification = new_insulation_spec
-            
-        except Exception as e:
-            # Add failed element to the list
-            failed_elements.append(part.Id)
+    TELEMETRY.phase("transaction")
+    group = TransactionGroup(doc, "Place Insulation")
+    group.Start()
 
+    # Start a transaction to modify the model
+    t = Transaction(doc, "Change Insulation Specification")
+    t.Start()
+    failed_elements = change.apply(specs, selected_service)
+    TELEMETRY.phase("commit")
     t.Commit()
 
+    # Parts whose insulated size actually changed, and the racks they sit in
+    TELEMETRY.phase("compute")
+    shifts = change.shifts()
+    TELEMETRY.count("shifts", len(shifts))
+
+    if shifts:
+        TELEMETRY.phase("report")
+        print("Insulation changed on {0} part(s) in {1} rack(s).".format(len(change.changed), len(change.racks)))
+        for rack, part_id, shift in shifts:
+            note = "" if part_id in change.changed else " (neighbour)"
+            print("  {0}: shift {1:.3f}\"{2}".format(part_id, shift * 12.0, note))
+
+        answer = MessageBox.Show(
+            "Insulation changed the gaps in {0} rack(s).\n"
+            "Re-spread them? {1} pipe(s) would move to restore the previous gaps."
+            .format(len(change.racks), len(shifts)),
+            "Re-spread Racks", MessageBoxButtons.YesNo)
+        if answer == DialogResult.Yes:
+            TELEMETRY.phase("transaction")
+            t = Transaction(doc, "Re-spread Racks")
+            t.Start()
+            change.respread(shifts)
+            TELEMETRY.phase("commit")
+            t.Commit()
+
+    TELEMETRY.phase("commit")
+    group.Assimilate()
+    TELEMETRY.phase("report")
+
     # Report failed elements if any
     if failed_elements:
-        print("Could not place insulation on elements: {}".format(", ".join(str(id.IntegerValue) for id in failed_elements)))
\ No newline at end of file
+        print("Could not place insulation on elements: {}".format(", ".join(str(id.IntegerValue) for id in failed_elements)))
+
+
+if __name__ == '__main__':
+    with TELEMETRY:
+        main()
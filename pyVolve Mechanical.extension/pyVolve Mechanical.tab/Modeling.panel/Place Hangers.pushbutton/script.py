@@ -0,0 +1,170 @@
+#  ______   ____     _____  _ __     _______   __  __ _____ ____ _   _    _    _   _ ___ ____    _    _     
+# |  _ \ \ / /\ \   / / _ \| |\ \   / / ____| |  \/  | ____/ ___| | | |  / \  | \ | |_ _/ ___|  / \  | |    
+# | |_) \ V /  \ \ / / | | | | \ \ / /|  _|   | |\/| |  _|| |   | |_| | / _ \ |  \| || | |     / _ \ | |    
+# |  __/ | |    \ V /| |_| | |__\ V / | |___  | |  | | |__| |___|  _  |/ ___ \| |\  || | |___ / ___ \| |___ 
+# |_|    |_|     \_/  \___/|_____\_/  |_____| |_|  |_|_____\____|_| |_/_/   \_\_| \_|___\____/_/   \_\_____|
+                                                                                                           
+# -*- coding: utf-8 -*-
+__title__   = "Place Hangers"
+__doc__     = """Version = 1.3
+Date    = 10.19.2026
+________________________________________________________________
+Description:
+Places hangers along the selected fabrication pipe runs at the
+maximum spacing allowed for their material and size
+(see HangerSpacing.csv in Check Hanger Spacing).
+Existing hangers are kept and only the gaps are filled.
+New hangers stay clear of pipe ends so they do not land on fittings.
+Hangers are created in batches with a progress bar that can be
+cancelled; the whole placement is a single undo step.
+________________________________________________________________
+How-To:
+1. Select the fabrication pipes to hang
+2. Click Pushbutton
+3. Choose the hanger button from the pipes' service
+4. Choose whether hangers attach to structure
+________________________________________________________________
+Last Updates:
+- [10.19.2026] - 1.0 - RELEASE
+- [10.19.2026] - 1.1 - Phase timings logged to the pyVolve telemetry log
+- [10.19.2026] - 1.2 - Shift-click runs it under the profiler (see Snippets._profiler)
+- [10.19.2026] - 1.3 - Hangers on the pipes come from the cached host index (Snippets._cache)
+________________________________________________________________
+Author: Sam Robles
+"""
+__author__ = "Sam Robles"
+__helpurl__ = "https://github.com/SRobles512/pyVolve-Mechanical/wiki"
+__min_revit_ver__ = 2022
+__max_revit_ver__ = 2024
+
+# ___ __  __ ____   ___  ____ _____ ____  
+#|_ _|  \/  |  _ \ / _ \|  _ \_   _/ ___| 
+# | || |\/| | |_) | | | | |_) || | \___ \ 
+# | || |  | |  __/| |_| |  _ < | |  ___) |
+#|___|_|  |_|_|    \___/|_| \_\|_| |____/
+#=========================================
+# SYSTEM IMPORTS
+import os
+import clr
+
+# AUTODESK IMPORTS
+clr.AddReference("RevitAPI")
+clr.AddReference("RevitAPIUI")
+from Autodesk.Revit.DB import *
+from Autodesk.Revit.UI import *
+
+# PYREVIT IMPORTS
+from pyrevit import forms
+# .NET IMPORTS
+    #None
+# CUSTOM IMPORTS
+from Snippets._fabparts import MaterialNames, parse_size_to_inches
+from Snippets._cache import hangers_on
+from Snippets._spacing import (load_spacing_table, find_rule, build_runs, map_hangers_to_hosts,
+                               plan_stations, get_hanger_buttons, place_hangers)
+from Snippets._profiler import profiled
+from Snippets._telemetry import ToolRun
+
+#   ____ _     ___  ____    _    _      __     ___    ____  ___    _    ____  _     _____ ____  
+#  / ___| |   / _ \| __ )  / \  | |     \ \   / / \  |  _ \|_ _|  / \  | __ )| |   | ____/ ___| 
+# | |  _| |  | | | |  _ \ / _ \ | |      \ \ / / _ \ | |_) || |  / _ \ |  _ \| |   |  _| \___ \ 
+# | |_| | |__| |_| | |_) / ___ \| |___    \ V / ___ \|  _ < | | / ___ \| |_) | |___| |___ ___) |
+#  \____|_____\___/|____/_/   \_\_____|    \_/_/   \_\_| \_\___/_/   \_\____/|_____|_____|____/ 
+                                                                                              
+app = __revit__.Application
+uidoc = __revit__.ActiveUIDocument
+doc = uidoc.Document
+TELEMETRY = ToolRun(__title__, doc)
+selection = uidoc.Selection.GetElementIds()
+
+SPACING_CSV = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                           "Check Hanger Spacing.pushbutton", "HangerSpacing.csv")
+
+#  _____ _   _ _   _  ____ _____ ___ ___  _   _ ____  
+# |  ___| | | | \ | |/ ___|_   _|_ _/ _ \| \ | / ___| 
+# | |_  | | | |  \| | |     | |  | | | | |  \| \___ \ 
+# |  _| | |_| | |\  | |___  | |  | | |_| | |\  |___) |
+# |_|    \___/|_| \_|\____| |_| |___\___/|_| \_|____/                                                     
+# ====================================================
+def get_selected_pipes():
+    pipe_cat = ElementId(BuiltInCategory.OST_FabricationPipework)
+    elements = [doc.GetElement(element_id) for element_id in selection]
+    return [e for e in elements if isinstance(e, FabricationPart) and e.Category.Id == pipe_cat]
+
+
+def plan_all_stations(pipes):
+    """[(run, [Station])] for every run built from pipes, plus runs without a spacing rule."""
+    rules = load_spacing_table(SPACING_CSV)
+    material_names = MaterialNames(doc)
+    by_host = map_hangers_to_hosts(hangers_on(doc, [pipe.Id.IntegerValue for pipe in pipes]))
+
+    planned = []
+    unmatched = 0
+    for run in build_runs(pipes):
+        first = run.pipes[0]
+        rule = find_rule(rules, material_names.get(first), parse_size_to_inches(first.Size))
+        if rule is None:
+            unmatched += 1
+            continue
+        existing = [t for t, _ in run.stations(by_host)]
+        stations = plan_stations(run, existing, rule)
+        if stations:
+            planned.append((run, stations))
+    return planned, unmatched
+
+
+#  __  __    _    ___ _   _ 
+# |  \/  |  / \  |_ _| \ | |
+# | |\/| | / _ \  | ||  \| |
+# | |  | |/ ___ \ | || |\  |
+# |_|  |_/_/   \_\___|_| \_|
+#===========================
+@profiled(TELEMETRY)
+def main():
+    pipes = get_selected_pipes()
+
+    if not pipes:
+        forms.alert("Please select the fabrication pipes to hang.", title="Place Hangers")
+    else:
+        buttons = get_hanger_buttons(doc, pipes[0])
+        button_name = None
+        if not buttons:
+            forms.alert("The service of the selected pipes has no hanger buttons.", title="Place Hangers")
+        else:
+            button_name = forms.CommandSwitchWindow.show(sorted(buttons.keys()), message="Hanger to place:")
+
+        if button_name:
+            attach = forms.alert("Attach new hangers to structure?", title="Place Hangers", yes=True, no=True)
+            TELEMETRY.count("pipes", len(pipes))
+            TELEMETRY.phase("compute")
+            planned, unmatched = plan_all_stations(pipes)
+            total = sum(len(stations) for _, stations in planned)
+            TELEMETRY.count("hangers", total)
+            TELEMETRY.phase("selection")
+
+            if not total:
+                forms.alert("Hanger spacing is already within limits.", title="Place Hangers")
+            elif forms.alert("Place {0} hanger(s) on {1} run(s)?".format(total, len(planned)),
+                             title="Place Hangers", yes=True, no=True):
+                TELEMETRY.phase("transaction")
+                with forms.ProgressBar(title="Placing hangers ({value} of {max_value})", cancellable=True) as pb:
+                    def progress(done, count):
+                        pb.update_progress(done, count)
+                        return not pb.cancelled
+                    created, failures, cancelled = place_hangers(doc, planned, buttons[button_name],
+                                                                 attach, progress=progress)
+                TELEMETRY.phase("report")
+
+                for pipe, error in failures:
+                    print("Could not place hanger on {0}: {1}".format(pipe.Id, error))
+                message = "Placed {0} of {1} hanger(s).".format(created, total)
+                if cancelled:
+                    message += "\nCancelled - hangers placed so far were kept."
+                if unmatched:
+                    message += "\n{0} run(s) had no matching row in HangerSpacing.csv.".format(unmatched)
+                forms.alert(message, title="Place Hangers")
+
+
+if __name__ == '__main__':
+    with TELEMETRY:
+        main()
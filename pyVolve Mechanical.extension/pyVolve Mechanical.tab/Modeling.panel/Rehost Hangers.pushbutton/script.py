@@ -0,0 +1,125 @@
+#  ______   ____     _____  _ __     _______   __  __ _____ ____ _   _    _    _   _ ___ ____    _    _     
+# |  _ \ \ / /\ \   / / _ \| |\ \   / / ____| |  \/  | ____/ ___| | | |  / \  | \ | |_ _/ ___|  / \  | |    
+# | |_) \ V /  \ \ / / | | | | \ \ / /|  _|   | |\/| |  _|| |   | |_| | / _ \ |  \| || | |     / _ \ | |    
+# |  __/ | |    \ V /| |_| | |__\ V / | |___  | |  | | |__| |___|  _  |/ ___ \| |\  || | |___ / ___ \| |___ 
+# |_|    |_|     \_/  \___/|_____\_/  |_____| |_|  |_|_____\____|_| |_/_/   \_\_| \_|___\____/_/   \_\_____|
+                                                                                                           
+# -*- coding: utf-8 -*-
+__title__   = "Rehost Hangers"
+__doc__     = """Version = 1.4
+Date    = 10.19.2026
+________________________________________________________________
+Description:
+Re-attaches unhosted hangers (HostId = -1) to the structure directly above them.
+Structural framing and floors (including linked models) are indexed once,
+then every rod looks up the structure above its top end.
+Rods are attached to structure where possible, otherwise they are
+extended up to the underside of the structure found.
+All hangers are updated in one transaction.
+________________________________________________________________
+How-To:
+Select the hangers to fix and click Pushbutton
+or
+Click Pushbutton with nothing selected and choose Active View or Entire Model
+________________________________________________________________
+Last Updates:
+- [10.19.2026] - 1.0 - RELEASE
+- [10.19.2026] - 1.1 - Phase timings logged to the pyVolve telemetry log
+- [10.19.2026] - 1.2 - Shift-click runs it under the profiler (see Snippets._profiler)
+- [10.19.2026] - 1.3 - Collecting the hangers is timed as "read", not as "selection"
+- [10.19.2026] - 1.4 - Structure spanning a rod top (sloped decks, deep beams) is found; selected parts that are not hangers are skipped
+________________________________________________________________
+Author: Sam Robles
+"""
+__author__ = "Sam Robles"
+__helpurl__ = "https://github.com/SRobles512/pyVolve-Mechanical/wiki"
+__min_revit_ver__ = 2022
+__max_revit_ver__ = 2024
+
+# ___ __  __ ____   ___  ____ _____ ____  
+#|_ _|  \/  |  _ \ / _ \|  _ \_   _/ ___| 
+# | || |\/| | |_) | | | | |_) || | \___ \ 
+# | || |  | |  __/| |_| |  _ < | |  ___) |
+#|___|_|  |_|_|    \___/|_| \_\|_| |____/
+#=========================================
+# SYSTEM IMPORTS
+import clr
+
+# AUTODESK IMPORTS
+clr.AddReference("RevitAPI")
+clr.AddReference("RevitAPIUI")
+from Autodesk.Revit.DB import *
+from Autodesk.Revit.UI import *
+
+# PYREVIT IMPORTS
+from pyrevit import forms
+# .NET IMPORTS
+    #None
+# CUSTOM IMPORTS
+from Snippets._hangers import get_hangers, audit_hosts, build_structure_index, rehost_hangers
+from Snippets._profiler import profiled
+from Snippets._telemetry import ToolRun
+
+#   ____ _     ___  ____    _    _      __     ___    ____  ___    _    ____  _     _____ ____  
+#  / ___| |   / _ \| __ )  / \  | |     \ \   / / \  |  _ \|_ _|  / \  | __ )| |   | ____/ ___| 
+# | |  _| |  | | | |  _ \ / _ \ | |      \ \ / / _ \ | |_) || |  / _ \ |  _ \| |   |  _| \___ \ 
+# | |_| | |__| |_| | |_) / ___ \| |___    \ V / ___ \|  _ < | | / ___ \| |_) | |___| |___ ___) |
+#  \____|_____\___/|____/_/   \_\_____|    \_/_/   \_\_| \_\___/_/   \_\____/|_____|_____|____/ 
+                                                                                              
+app = __revit__.Application
+uidoc = __revit__.ActiveUIDocument
+doc = uidoc.Document
+TELEMETRY = ToolRun(__title__, doc)
+selection = uidoc.Selection.GetElementIds()
+
+#  _____ _   _ _   _  ____ _____ ___ ___  _   _ ____  
+# |  ___| | | | \ | |/ ___|_   _|_ _/ _ \| \ | / ___| 
+# | |_  | | | |  \| | |     | |  | | | | |  \| \___ \ 
+# |  _| | |_| | |\  | |___  | |  | | |_| | |\  |___) |
+# |_|    \___/|_| \_|\____| |_| |___\___/|_| \_|____/                                                     
+# ====================================================
+
+
+#  __  __    _    ___ _   _ 
+# |  \/  |  / \  |_ _| \ | |
+# | |\/| | / _ \  | ||  \| |
+# | |  | |/ ___ \ | || |\  |
+# |_|  |_/_/   \_\___|_| \_|
+#===========================
+@profiled(TELEMETRY)
+def main():
+    hangers, skipped = get_hangers(doc, selection, "No hangers selected. Rehost hangers in:", TELEMETRY)
+    if skipped:
+        print("Skipped {0} selected element(s) that are not hangers.".format(len(skipped)))
+
+    if hangers:
+        TELEMETRY.count("hangers", len(hangers))
+        unhosted = audit_hosts(doc, hangers).unhosted
+        TELEMETRY.count("unhosted", len(unhosted))
+        TELEMETRY.phase("selection")
+        if not unhosted:
+            forms.alert("All {0} hangers are hosted.".format(len(hangers)), title="Rehost Hangers")
+        elif forms.alert("{0} of {1} hangers are not hosted.\nRehost them to the structure above?"
+                         .format(len(unhosted), len(hangers)), title="Rehost Hangers", yes=True, no=True):
+            TELEMETRY.phase("read")
+            index, build_seconds = build_structure_index(doc)
+            TELEMETRY.phase("transaction")
+            report = rehost_hangers(doc, unhosted, index)
+            report.build_seconds = build_seconds
+            TELEMETRY.phase("report")
+
+            for hanger, error in report.failed:
+                print("Could not rehost hanger {0}: {1}".format(hanger.Id, error))
+
+            # Create and show a TaskDialog
+            dialog = TaskDialog("Rehost Hangers")
+            dialog.MainInstruction = "Rehost Results"
+            dialog.MainContent = report.summary()
+            dialog.Show()
+    elif hangers is not None:
+        forms.alert("No hangers found.", title="Rehost Hangers")
+
+
+if __name__ == '__main__':
+    with TELEMETRY:
+        main()
@@ -0,0 +1,125 @@
+#  ______   ____     _____  _ __     _______   __  __ _____ ____ _   _    _    _   _ ___ ____    _    _     
+# |  _ \ \ / /\ \   / / _ \| |\ \   / / ____| |  \/  | ____/ ___| | | |  / \  | \ | |_ _/ ___|  / \  | |    
+# | |_) \ V /  \ \ / / | | | | \ \ / /|  _|   | |\/| |  _|| |   | |_| | / _ \ |  \| || | |     / _ \ | |    
+# |  __/ | |    \ V /| |_| | |__\ V / | |___  | |  | | |__| |___|  _  |/ ___ \| |\  || | |___ / ___ \| |___ 
+# |_|    |_|     \_/  \___/|_____\_/  |_____| |_|  |_|_____\____|_| |_/_/   \_\_| \_|___\____/_/   \_\_____|
+                                                                                                           
+# -*- coding: utf-8 -*-
+__title__   = "Rod Takeoff"
+__doc__     = """Version = 1.4
+Date    = 10.19.2026
+________________________________________________________________
+Description:
+Read-only rod cut list and hanger takeoff.
+Reads every rod length once, groups rods by hanger type, rod diameter
+and cut length (rounded up to 1/8"), and saves the cut list to CSV.
+No transaction is opened.
+________________________________________________________________
+How-To:
+Select the hangers to take off and click Pushbutton
+or
+Click Pushbutton with nothing selected and choose Active View or Entire Model
+________________________________________________________________
+Last Updates:
+- [10.19.2026] - 1.0 - RELEASE
+- [10.19.2026] - 1.1 - Phase timings logged to the pyVolve telemetry log
+- [10.19.2026] - 1.2 - Shift-click runs it under the profiler (see Snippets._profiler)
+- [10.19.2026] - 1.3 - Collecting the hangers is timed as "read", not as "selection"
+- [10.19.2026] - 1.4 - Selected parts that are not hangers are skipped, not taken off
+________________________________________________________________
+Author: Sam Robles
+"""
+__author__ = "Sam Robles"
+__helpurl__ = "https://github.com/SRobles512/pyVolve-Mechanical/wiki"
+__min_revit_ver__ = 2022
+__max_revit_ver__ = 2024
+
+# ___ __  __ ____   ___  ____ _____ ____  
+#|_ _|  \/  |  _ \ / _ \|  _ \_   _/ ___| 
+# | || |\/| | |_) | | | | |_) || | \___ \ 
+# | || |  | |  __/| |_| |  _ < | |  ___) |
+#|___|_|  |_|_|    \___/|_| \_\|_| |____/
+#=========================================
+# SYSTEM IMPORTS
+from collections import Counter
+import clr
+
+# AUTODESK IMPORTS
+clr.AddReference("RevitAPI")
+clr.AddReference("RevitAPIUI")
+from Autodesk.Revit.DB import *
+from Autodesk.Revit.UI import *
+
+# PYREVIT IMPORTS
+from pyrevit import forms, script
+# .NET IMPORTS
+    #None
+# CUSTOM IMPORTS
+from Snippets._hangers import get_hangers
+from Snippets._rods import snapshot_rods, aggregate_cut_list, write_cut_list_csv, format_inches
+from Snippets._profiler import profiled
+from Snippets._telemetry import ToolRun
+
+#   ____ _     ___  ____    _    _      __     ___    ____  ___    _    ____  _     _____ ____  
+#  / ___| |   / _ \| __ )  / \  | |     \ \   / / \  |  _ \|_ _|  / \  | __ )| |   | ____/ ___| 
+# | |  _| |  | | | |  _ \ / _ \ | |      \ \ / / _ \ | |_) || |  / _ \ |  _ \| |   |  _| \___ \ 
+# | |_| | |__| |_| | |_) / ___ \| |___    \ V / ___ \|  _ < | | / ___ \| |_) | |___| |___ ___) |
+#  \____|_____\___/|____/_/   \_\_____|    \_/_/   \_\_| \_\___/_/   \_\____/|_____|_____|____/ 
+                                                                                              
+app = __revit__.Application
+uidoc = __revit__.ActiveUIDocument
+doc = uidoc.Document
+TELEMETRY = ToolRun(__title__, doc)
+selection = uidoc.Selection.GetElementIds()
+output = script.get_output()
+
+#  _____ _   _ _   _  ____ _____ ___ ___  _   _ ____  
+# |  ___| | | | \ | |/ ___|_   _|_ _/ _ \| \ | / ___| 
+# | |_  | | | |  \| | |     | |  | | | | |  \| \___ \ 
+# |  _| | |_| | |\  | |___  | |  | | |_| | |\  |___) |
+# |_|    \___/|_| \_|\____| |_| |___\___/|_| \_|____/                                                     
+# ====================================================
+def print_hanger_takeoff(hanger_counts):
+    rows = [[type_name, format_inches(diameter) if diameter else "-", count]
+            for (type_name, diameter), count in sorted(hanger_counts.items(), key=lambda i: (i[0][0], i[0][1] or 0.0))]
+    output.print_table(rows, columns=["Hanger Type", "Rod Diameter", "Hangers"], title="Hanger Takeoff")
+
+
+#  __  __    _    ___ _   _ 
+# |  \/  |  / \  |_ _| \ | |
+# | |\/| | / _ \  | ||  \| |
+# | |  | |/ ___ \ | || |\  |
+# |_|  |_/_/   \_\___|_| \_|
+#===========================
+@profiled(TELEMETRY)
+def main():
+    hangers, skipped = get_hangers(doc, selection, "No hangers selected. Take off hangers in:", TELEMETRY)
+    if skipped:
+        print("Skipped {0} selected element(s) that are not hangers.".format(len(skipped)))
+
+    if hangers:
+        TELEMETRY.count("hangers", len(hangers))
+        hanger_counts = Counter()
+        def counted(snapshots):
+            # Hanger totals are tallied on the way through, so rods are read once
+            for snap in snapshots:
+                hanger_counts[(snap.type_name, snap.rod_diameter)] += 1
+                yield snap
+
+        cut_list = aggregate_cut_list(counted(snapshot_rods(hangers)))
+        TELEMETRY.phase("report")
+        print_hanger_takeoff(hanger_counts)
+
+        file_path = forms.save_file(file_ext='csv', default_name='Rod Cut List')
+        if file_path:
+            row_count = write_cut_list_csv(file_path, cut_list)
+            forms.alert("{0} rods on {1} hangers.\n{2} cut list rows saved to:\n{3}"
+                        .format(sum(cut_list.values()), sum(hanger_counts.values()), row_count, file_path),
+                        title="Rod Takeoff")
+    elif hangers is not None:
+        forms.alert("No hangers found.", title="Rod Takeoff")
+
+
+if __name__ == '__main__':
+    with TELEMETRY:
+        main()
@@ -6,7 +6,7 @@
 # |_|    |_|     \_/  \___/|_____\_/  |_____| |_|  |_|_____\____|_| |_/_/   \_\_| \_|___\____/_/   \_\_____|
 
 __title__   = "Spread by Gap"
-__doc__     = """Version = 1.0
+__doc__     = """Version = 1.5
 Date    = 01.24.2025
 ________________________________________________________________
 Description:
@@ -19,6 +19,13 @@ How-To:
 3. Select pipes that will move.
 NOTE: IF THE TOOL IS NOT WORKING AS INTENDED, MAKE SURE YOU ARE NOT USING A SCOPE BOX AND ENSURE THE PIPES ARE PARALLEL TO THE X OR Y AXIS.
 ________________________________________________________________
+Last Updates:
+- [10.19.2026] - 1.1 - Insulated ODs are read once per size and insulation
+- [10.19.2026] - 1.2 - Spreading moved to Snippets._spread, shared with Align BOI + Adjust Spread
+- [10.19.2026] - 1.3 - Phase timings logged to the pyVolve telemetry log
+- [10.19.2026] - 1.4 - Shift-click runs it under the profiler (see Snippets._profiler)
+- [10.19.2026] - 1.5 - Gaps measured as before 1.2: to 5 decimals, between fabrication parts only
+________________________________________________________________
 Author: Sam Robles
 """
 __author__ = "Sam Robles"
@@ -48,6 +55,11 @@ clr.AddReference("System.Windows.Forms")
 import System.Windows.Forms as WinForms
 from System.Windows.Forms import MessageBox
 
+from Snippets._fabparts import HalfOdProvider
+from Snippets._spread import spread_by_gap
+from Snippets._profiler import profiled
+from Snippets._telemetry import ToolRun
+
 # __     ___    ____  ___    _    ____  _     _____ ____  
 # \ \   / / \  |  _ \|_ _|  / \  | __ )| |   | ____/ ___| 
 #  \ \ / / _ \ | |_) || |  / _ \ |  _ \| |   |  _| \___ \ 
@@ -58,6 +70,13 @@ from System.Windows.Forms import MessageBox
 app = __revit__.Application
 doc = __revit__.ActiveUIDocument.Document
 uidoc = __revit__.ActiveUIDocument
+TELEMETRY = ToolRun(__title__, doc)
+
+# Insulated half ODs, read from the model once per (material, size, insulation)
+HALF_ODS = HalfOdProvider()
+
+# Pipe start points and offsets are rounded to this many decimals (feet)
+DIGITS = 5
 
 #  _____ _   _ _   _  ____ _____ ___ ___  _   _ ____  
 # |  ___| | | | \ | |/ ___|_   _|_ _/ _ \| \ | / ___| 
@@ -114,16 +133,10 @@ def get_location_curve_data(element):
 def get_fabrication_parameters(element):
     try:
         if isinstance(element, FabricationPart):
-            insulation_thickness = format_number(element.InsulationThickness)
-            outside_diameter = element.LookupParameter("Outside Diameter")
-            outside_diameter_value = format_number(outside_diameter.AsDouble()) if outside_diameter else "0.00000"
             service_name = element.LookupParameter("Fabrication Service Name")
             service_name_value = service_name.AsString() if service_name else "N/A"
-            half_od_value = (float(outside_diameter_value)/2) + float(insulation_thickness)
-            half_od = format_number(half_od_value)
+            half_od = format_number(HALF_ODS.get(element))
             return {
-                'insulation_thickness': insulation_thickness,
-                'outside_diameter': outside_diameter_value,
                 'service_name': service_name_value,
                 'half_od': half_od
             }
@@ -272,73 +285,15 @@ def get_user_selected_pipes_to_move():
         return None
     return list(ordered_elements.values())
 
-def move_fabrication_part(part, translation_vector):
-    location = part.Location
-    if isinstance(location, LocationCurve):
-        location.Move(translation_vector)
-        return True
-    return False
-
-def calculate_gap_between(pipeA, pipeB):
-    paramsA = get_fabrication_parameters(pipeA)
-    curveA = get_location_curve_data(pipeA)
-    paramsB = get_fabrication_parameters(pipeB)
-    curveB = get_location_curve_data(pipeB)
-    if not (paramsA and curveA and paramsB and curveB):
-        return None, 0.0
-    start_diff = calculate_point_difference(curveA['start'], curveB['start'])
-    start_x = float(start_diff[0])
-    start_y = float(start_diff[1])
-    if abs(start_x) > 1e-6 and abs(start_y) > 1e-6:
-        c2c = math.sqrt((start_x**2) + (start_y**2))
-        axis = (start_x, start_y)
-    elif abs(start_x) > 1e-6:
-        c2c = abs(start_x)
-        axis = ("x", start_x)
-    else:
-        c2c = abs(start_y)
-        axis = ("y", start_y)
-    half_od_A = float(paramsA['half_od'])
-    half_od_B = float(paramsB['half_od'])
-    gap = c2c - (half_od_A + half_od_B)
-    return axis, gap
-
 def move_selected_pipes(reference_pipe, pipes_to_move, desired_gap_feet):
-    moved_info = []
+    TELEMETRY.phase("transaction")
     t = Transaction(doc, "Move Pipes")
     t.Start()
-    current_reference = reference_pipe
-    for p in pipes_to_move:
-        axis, actual_gap = calculate_gap_between(current_reference, p)
-        if axis is None:
-            continue
-        distance_to_move = desired_gap_feet - actual_gap
-        if isinstance(axis, tuple):
-            if isinstance(axis[0], str):
-                direction_str, axis_val = axis
-                if direction_str.lower() == 'x':
-                    translation_vec = XYZ(distance_to_move if axis_val >= 0 else -distance_to_move, 0, 0)
-                else:
-                    translation_vec = XYZ(0, distance_to_move if axis_val >= 0 else -distance_to_move, 0)
-            else:
-                start_x, start_y = axis
-                length_2d = math.sqrt(start_x**2 + start_y**2)
-                if length_2d > 1e-9:
-                    scale = distance_to_move / length_2d
-                    dx = start_x * scale
-                    dy = start_y * scale
-                    translation_vec = XYZ(dx, dy, 0)
-                else:
-                    translation_vec = XYZ(0, 0, 0)
-        else:
-            translation_vec = XYZ(0, 0, 0)
-        success = move_fabrication_part(p, translation_vec)
-        if success:
-            _, new_gap = calculate_gap_between(current_reference, p)
-            moved_info.append((p.Id, new_gap))
-        current_reference = p
+    moved = spread_by_gap(reference_pipe, pipes_to_move, desired_gap_feet, HALF_ODS.get,
+                          digits=DIGITS, fabrication_only=True)
+    TELEMETRY.phase("commit")
     t.Commit()
-    return moved_info
+    return moved
 
 #  __  __    _    ___ _   _ 
 # |  \/  |  / \  |_ _| \ | |
@@ -347,6 +302,7 @@ def move_selected_pipes(reference_pipe, pipes_to_move, desired_gap_feet):
 # |_|  |_/_/   \_\___|_| \_|
 #===========================
 
+@profiled(TELEMETRY)
 def main():
     form = SpacingForm()
     dialog_result = form.ShowDialog()
@@ -366,10 +322,13 @@ def main():
     if not pipes_to_move:
         MessageBox.Show("No pipes selected. Exiting.", "No Selection")
         return
-    moved_info = move_selected_pipes(reference_pipe, pipes_to_move, desired_gap_feet)
-    moved_count = len(moved_info)
-    msg = "Successfully moved {} pipes.".format(moved_count)
+    TELEMETRY.count("pipes", len(pipes_to_move))
+    moved = move_selected_pipes(reference_pipe, pipes_to_move, desired_gap_feet)
+    TELEMETRY.phase("report")
+    moved_count = len(moved)
+    msg = "Successfully moved {} pipes.\n{}".format(moved_count, HALF_ODS.summary())
     MessageBox.Show(msg, "Operation Complete")
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    with TELEMETRY:
+        main()
\ No newline at end of file
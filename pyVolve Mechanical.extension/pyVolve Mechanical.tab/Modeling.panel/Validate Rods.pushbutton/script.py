@@ -0,0 +1,169 @@
+#  ______   ____     _____  _ __     _______   __  __ _____ ____ _   _    _    _   _ ___ ____    _    _     
+# |  _ \ \ / /\ \   / / _ \| |\ \   / / ____| |  \/  | ____/ ___| | | |  / \  | \ | |_ _/ ___|  / \  | |    
+# | |_) \ V /  \ \ / / | | | | \ \ / /|  _|   | |\/| |  _|| |   | |_| | / _ \ |  \| || | |     / _ \ | |    
+# |  __/ | |    \ V /| |_| | |__\ V / | |___  | |  | | |__| |___|  _  |/ ___ \| |\  || | |___ / ___ \| |___ 
+# |_|    |_|     \_/  \___/|_____\_/  |_____| |_|  |_|_____\____|_| |_/_/   \_\_| \_|___\____/_/   \_\_____|
+                                                                                                           
+# -*- coding: utf-8 -*-
+__title__   = "Validate Rods"
+__doc__     = """Version = 1.4
+Date    = 10.19.2026
+________________________________________________________________
+Description:
+Read-only validation of hanger rods.
+Flags hangers with no rods, rods shorter or longer than the limits
+below, and trapezes whose rods differ too much in length.
+Rod data is read once per hanger; results open in a list where
+double-clicking a row selects and zooms to the hanger.
+________________________________________________________________
+How-To:
+Select the hangers to validate and click Pushbutton
+or
+Click Pushbutton with nothing selected and choose Active View or Entire Model
+Limits can be changed in the VARIABLES section of this script.
+________________________________________________________________
+Last Updates:
+- [10.19.2026] - 1.0 - RELEASE
+- [10.19.2026] - 1.1 - Phase timings logged to the pyVolve telemetry log
+- [10.19.2026] - 1.2 - Shift-click runs it under the profiler (see Snippets._profiler)
+- [10.19.2026] - 1.3 - Collecting the hangers is timed as "read", not as "selection"
+- [10.19.2026] - 1.4 - Selected parts that are not hangers are skipped, not validated
+________________________________________________________________
+Author: Sam Robles
+"""
+__author__ = "Sam Robles"
+__helpurl__ = "https://github.com/SRobles512/pyVolve-Mechanical/wiki"
+__min_revit_ver__ = 2022
+__max_revit_ver__ = 2024
+
+# ___ __  __ ____   ___  ____ _____ ____  
+#|_ _|  \/  |  _ \ / _ \|  _ \_   _/ ___| 
+# | || |\/| | |_) | | | | |_) || | \___ \ 
+# | || |  | |  __/| |_| |  _ < | |  ___) |
+#|___|_|  |_|_|    \___/|_| \_\|_| |____/
+#=========================================
+# SYSTEM IMPORTS
+import clr
+
+# AUTODESK IMPORTS
+clr.AddReference("RevitAPI")
+clr.AddReference("RevitAPIUI")
+from Autodesk.Revit.DB import *
+from Autodesk.Revit.UI import *
+
+# PYREVIT IMPORTS
+from pyrevit import forms
+# .NET IMPORTS
+clr.AddReference("System.Windows.Forms")
+clr.AddReference("System.Drawing")
+from System.Windows.Forms import (Form, DataGridView, DataGridViewTextBoxColumn, DockStyle,
+                                  DataGridViewAutoSizeColumnsMode, DataGridViewSelectionMode)
+from System.Drawing import Size
+from System.Collections.Generic import List
+# CUSTOM IMPORTS
+from Snippets._hangers import get_hangers
+from Snippets._rods import snapshot_rods, validate_rods
+from Snippets._profiler import profiled
+from Snippets._telemetry import ToolRun
+
+#   ____ _     ___  ____    _    _      __     ___    ____  ___    _    ____  _     _____ ____  
+#  / ___| |   / _ \| __ )  / \  | |     \ \   / / \  |  _ \|_ _|  / \  | __ )| |   | ____/ ___| 
+# | |  _| |  | | | |  _ \ / _ \ | |      \ \ / / _ \ | |_) || |  / _ \ |  _ \| |   |  _| \___ \ 
+# | |_| | |__| |_| | |_) / ___ \| |___    \ V / ___ \|  _ < | | / ___ \| |_) | |___| |___ ___) |
+#  \____|_____\___/|____/_/   \_\_____|    \_/_/   \_\_| \_\___/_/   \_\____/|_____|_____|____/ 
+                                                                                              
+app = __revit__.Application
+uidoc = __revit__.ActiveUIDocument
+doc = uidoc.Document
+TELEMETRY = ToolRun(__title__, doc)
+selection = uidoc.Selection.GetElementIds()
+
+# Limits in feet
+MIN_ROD_LENGTH         = 2.0 / 12.0     # 2"
+MAX_ROD_LENGTH         = 10.0           # 10'
+MAX_TRAPEZE_DIFFERENCE = 6.0 / 12.0     # 6"
+
+#  _____ _   _ _   _  ____ _____ ___ ___  _   _ ____  
+# |  ___| | | | \ | |/ ___|_   _|_ _/ _ \| \ | / ___| 
+# | |_  | | | |  \| | |     | |  | | | | |  \| \___ \ 
+# |  _| | |_| | |\  | |___  | |  | | |_| | |\  |___) |
+# |_|    \___/|_| \_|\____| |_| |___\___/|_| \_|____/                                                     
+# ====================================================
+
+
+#   ____ _        _    ____ ____  _____ ____  
+#  / ___| |      / \  / ___/ ___|| ____/ ___| 
+# | |   | |     / _ \ \___ \___ \|  _| \___ \ 
+# | |___| |___ / ___ \ ___) |__) | |___ ___) |
+#  \____|_____/_/   \_\____/____/|_____|____/                                             
+# ============================================
+class RodIssueForm(Form):
+    """Virtual-mode grid: rows are only materialized when they scroll into view,
+    so tens of thousands of issues open instantly. Double-click selects the hanger."""
+
+    COLUMNS = (("Hanger Id", "hanger_id"), ("Hanger Type", "type_name"),
+               ("Check", "check"), ("Detail", "detail"))
+
+    def __init__(self, issues):
+        Form.__init__(self)
+        self.issues = issues
+        self.Text = "Rod Validation - {0} issue(s)".format(len(issues))
+        self.Size = Size(900, 600)
+
+        self.grid = DataGridView()
+        self.grid.Dock = DockStyle.Fill
+        self.grid.VirtualMode = True
+        self.grid.ReadOnly = True
+        self.grid.AllowUserToAddRows = False
+        self.grid.AllowUserToDeleteRows = False
+        self.grid.SelectionMode = DataGridViewSelectionMode.FullRowSelect
+        self.grid.AutoSizeColumnsMode = DataGridViewAutoSizeColumnsMode.Fill
+        for header, _ in self.COLUMNS:
+            column = DataGridViewTextBoxColumn()
+            column.HeaderText = header
+            self.grid.Columns.Add(column)
+        self.grid.RowCount = len(issues)
+        self.grid.CellValueNeeded += self.on_cell_value_needed
+        self.grid.CellDoubleClick += self.on_double_click
+        self.Controls.Add(self.grid)
+
+    def on_cell_value_needed(self, sender, event):
+        issue = self.issues[event.RowIndex]
+        event.Value = str(getattr(issue, self.COLUMNS[event.ColumnIndex][1]))
+
+    def on_double_click(self, sender, event):
+        if event.RowIndex < 0:
+            return
+        element_id = ElementId(self.issues[event.RowIndex].hanger_id)
+        ids = List[ElementId]([element_id])
+        uidoc.Selection.SetElementIds(ids)
+        uidoc.ShowElements(ids)
+
+
+#  __  __    _    ___ _   _ 
+# |  \/  |  / \  |_ _| \ | |
+# | |\/| | / _ \  | ||  \| |
+# | |  | |/ ___ \ | || |\  |
+# |_|  |_/_/   \_\___|_| \_|
+#===========================
+@profiled(TELEMETRY)
+def main():
+    hangers, skipped = get_hangers(doc, selection, "No hangers selected. Validate hangers in:", TELEMETRY)
+    if skipped:
+        print("Skipped {0} selected element(s) that are not hangers.".format(len(skipped)))
+
+    if hangers:
+        TELEMETRY.count("hangers", len(hangers))
+        issues = validate_rods(snapshot_rods(hangers), MIN_ROD_LENGTH, MAX_ROD_LENGTH, MAX_TRAPEZE_DIFFERENCE)
+        TELEMETRY.phase("report")
+        if issues:
+            RodIssueForm(issues).ShowDialog()
+        else:
+            forms.alert("All rods on {0} hangers are within limits.".format(len(hangers)), title="Validate Rods")
+    elif hangers is not None:
+        forms.alert("No hangers found.", title="Validate Rods")
+
+
+if __name__ == '__main__':
+    with TELEMETRY:
+        main()